@@ -1,10 +1,25 @@
 import os
 import sys
+
 sys.path.append(os.path.dirname(__file__))
 
-from .enums import LedOptions, Brightness, PlayerID, PulseOptions, TriggerModes # noqa : F401
-from .event_system import Event # noqa : F401
-from .pydualsense import pydualsense, DSLight, DSState, DSTouchpad, DSTrigger, DSAudio # noqa : F401
+from .animation import LightAnimation, play_synchronized  # noqa : F401
+from .effects import CompiledEffect, EffectTimeline  # noqa : F401
+from .enums import (  # noqa : F401
+    BlendMode,
+    Brightness,
+    Button,
+    GyroSmoothing,
+    LedOptions,
+    PlayerID,
+    PulseOptions,
+    StateField,
+    TriggerModes,
+)
+from .event_system import Event  # noqa : F401
+from .pydualsense import DSAudio, DSLight, DSState, DSTouchpad, DSTrigger, pydualsense  # noqa : F401
+from .remap import RemapProfile  # noqa : F401
+from .trigger_effects import TriggerEffect  # noqa : F401
 
 __version__ = "0.7.5"
 
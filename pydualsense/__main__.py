@@ -0,0 +1,408 @@
+"""
+diagnostics for connected controllers: ``python -m pydualsense {monitor,record,replay,bench}``
+"""
+import argparse
+import math
+import struct
+import sys
+import time
+from typing import Any, BinaryIO, List, Optional, Sequence, Tuple
+
+import hidapi  # type: ignore[import]
+
+from .enums import ConnectionType
+from .group import ControllerGroup
+from .hotplug import DUALSENSE_PRODUCT_IDS, SONY_VENDOR_ID
+from .pydualsense import pydualsense
+from .simulator import SimulatedDualSense
+
+# recording file: header, then one record per input report
+RECORDING_MAGIC = b"DSREC"
+RECORDING_VERSION = 1
+RECORDING_HEADER = struct.Struct("<5sB")  # magic, version
+RECORD = struct.Struct("<dH")  # seconds since the start of the recording, report length
+
+
+class ReportMeter:
+    """
+    Report hook measuring the report rate, the jitter of the report interval and lost reports
+    (gaps in the report counter)
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+        self.lost = 0
+        self._last: Optional[float] = None
+        self._counter: Optional[int] = None
+        self._short_reports = 0
+
+    def reset(self) -> None:
+        """
+        start a new measurement interval, the lost reports are counted since the start
+        """
+        self.count = 0
+        self._sum = 0.0
+        self._squares = 0.0
+        self.started = time.monotonic()
+
+    def __call__(self, ds: pydualsense) -> None:
+        now = time.monotonic()
+        if self._last is not None:
+            interval = now - self._last
+            self.count += 1
+            self._sum += interval
+            self._squares += interval * interval
+        self._last = now
+        states = ds.states
+        if states is None:
+            return
+        # the short bluetooth report has no counter, start over with the next full report
+        if ds.stats.short_reports != self._short_reports:
+            self._short_reports = ds.stats.short_reports
+            self._counter = None
+            return
+        # byte 7 counts the input reports
+        counter = states[7]
+        if self._counter is not None:
+            self.lost += (counter - self._counter - 1) & 0xFF
+        self._counter = counter
+
+    @property
+    def rate(self) -> float:
+        """reports per second in the current interval"""
+        elapsed = time.monotonic() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """standard deviation of the report interval in seconds"""
+        if self.count < 2:
+            return 0.0
+        mean = self._sum / self.count
+        return math.sqrt(max(0.0, self._squares / self.count - mean * mean))
+
+
+class RecordingDevice:
+    """
+    Wraps an opened device and writes every input report into a recording
+    """
+
+    def __init__(self, device: hidapi.Device, file: BinaryIO) -> None:
+        self.device = device
+        self.file = file
+        self.reports = 0
+        self._start = time.monotonic()
+        file.write(RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION))
+
+    def read(self, length: int, timeout_ms: int = 0, blocking: bool = False) -> Optional[bytes]:
+        report = self.device.read(length, timeout_ms)
+        if report:
+            self.file.write(RECORD.pack(time.monotonic() - self._start, len(report)))
+            self.file.write(bytes(report))
+            self.reports += 1
+        return report  # type: ignore[no-any-return]
+
+    def __getattr__(self, name: str) -> object:
+        # write, feature reports and close go to the device
+        return getattr(self.device, name)
+
+
+def read_recording(file: BinaryIO) -> List[Tuple[float, bytes]]:
+    """
+    read a recording written by ``record``
+
+    Args:
+        file (BinaryIO): opened recording
+
+    Raises:
+        Exception: not a recording or an unsupported version
+
+    Returns:
+        list: (seconds since the start, raw input report) of every report
+    """
+    magic, version = RECORDING_HEADER.unpack(file.read(RECORDING_HEADER.size))
+    if magic != RECORDING_MAGIC:
+        raise Exception("not a pydualsense recording")
+    if version != RECORDING_VERSION:
+        raise Exception(f"unsupported recording version {version}")
+    reports: List[Tuple[float, bytes]] = []
+    while True:
+        header = file.read(RECORD.size)
+        if len(header) < RECORD.size:
+            return reports
+        at, length = RECORD.unpack(header)
+        reports.append((at, file.read(length)))
+
+
+class ReplayDevice:
+    """
+    Device with the interface of ``hidapi.Device`` that plays back recorded input reports, output reports are discarded
+    """
+
+    def __init__(self, reports: Sequence[Tuple[float, bytes]], speed: float = 1.0, loop: bool = False) -> None:
+        if not reports:
+            raise Exception("recording has no reports")
+        self.reports = reports
+        self.speed = speed
+        self.loop = loop
+        self.finished = False
+        self._index = 0
+        self._offset = 0.0  # recording time of the current pass
+        self._start = time.monotonic()
+
+    def read(self, length: int, timeout_ms: int = 0, blocking: bool = False) -> Optional[bytes]:
+        if self._index >= len(self.reports):
+            if not self.loop:
+                self.finished = True
+                time.sleep(timeout_ms / 1000 if timeout_ms else 0.01)
+                return None
+            self._offset += self.reports[-1][0]
+            self._index = 0
+        at, report = self.reports[self._index]
+        if self.speed > 0:
+            wait = self._start + (self._offset + at) / self.speed - time.monotonic()
+            if timeout_ms and wait > timeout_ms / 1000:
+                time.sleep(timeout_ms / 1000)
+                return None
+            if wait > 0:
+                time.sleep(wait)
+        self._index += 1
+        return report[:length]
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+    def get_feature_report(self, report_id: int, length: int) -> bytes:
+        return bytes(length - 1)
+
+    def send_feature_report(self, data: bytes, report_id: int = 0) -> int:
+        return len(data)
+
+    def get_serial_number_string(self) -> str:
+        return "replay"
+
+    def close(self) -> None:
+        pass
+
+
+def find_controllers(serial: Optional[str] = None) -> List[Any]:
+    """
+    enumerate the connected controllers
+
+    Args:
+        serial (str, optional): only the controller with this serial number. Defaults to None.
+
+    Raises:
+        Exception: No device detected
+
+    Returns:
+        list: hidapi device infos
+    """
+    found = [
+        info
+        for info in hidapi.enumerate(vendor_id=SONY_VENDOR_ID)
+        if info.product_id in DUALSENSE_PRODUCT_IDS and not (serial and info.serial_number != serial)
+    ]
+    if not found:
+        raise Exception("No device detected")
+    return found
+
+
+def _open(info: Any) -> hidapi.Device:
+    return hidapi.Device(vendor_id=info.vendor_id, product_id=info.product_id, serial_number=info.serial_number or None)
+
+
+def open_controllers(serial: Optional[str] = None, out_of_process: bool = False) -> List[pydualsense]:
+    """
+    initialize every connected controller. They are opened by :func:`init() <pydualsense.pydualsense.init>`
+    with their serial number, a controller without one is opened as any controller.
+
+    Args:
+        serial (str, optional): only the controller with this serial number. Defaults to None.
+        out_of_process (bool, optional): read and write the controllers in child processes. Defaults to False.
+
+    Returns:
+        list: the initialized controllers
+    """
+    controllers = []
+    for info in find_controllers(serial):
+        ds = pydualsense(out_of_process=out_of_process)
+        ds.init(serial=info.serial_number or None)
+        controllers.append(ds)
+    return controllers
+
+
+def _status(ds: pydualsense, meter: ReportMeter) -> str:
+    connection = ds.conType.name if ds.connected else "lost"
+    return (
+        f"{ds.serial or '-':17}  {connection:4}  {meter.rate:7.1f} Hz  jitter {meter.jitter * 1000:6.3f} ms  "
+        f"lost {meter.lost:6}  crc {ds.stats.crc_errors:5}  battery {ds.battery.Level:3}% {ds.battery.State.name}"
+    )
+
+
+def _watch(controllers: List[pydualsense], interval: float, duration: Optional[float], done: object = None) -> None:
+    """
+    print the status of the controllers every interval until the duration is over or Ctrl+C
+    """
+    meters = []
+    for ds in controllers:
+        meter = ReportMeter()
+        ds.addReportHook(meter)
+        meters.append(meter)
+    end = time.monotonic() + duration if duration else math.inf
+    try:
+        while time.monotonic() < end and not getattr(done, "finished", False):
+            time.sleep(max(0.0, min(interval, end - time.monotonic())))
+            for ds, meter in zip(controllers, meters):
+                print(_status(ds, meter), flush=True)
+                meter.reset()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for ds, meter in zip(controllers, meters):
+            ds.removeReportHook(meter)
+
+
+def monitor(args: argparse.Namespace) -> None:
+    controllers = open_controllers(args.serial, args.out_of_process)
+    try:
+        _watch(controllers, args.interval, args.duration)
+    finally:
+        for ds in controllers:
+            ds.close()
+
+
+def record(args: argparse.Namespace) -> None:
+    info = find_controllers(args.serial)[0]
+    with open(args.file, "wb") as file:
+        recorder = RecordingDevice(_open(info), file)
+        ds = pydualsense()
+        ds.init(recorder, is_edge=info.product_id == 0x0DF2)
+        try:
+            _watch([ds], args.interval, args.duration)
+        finally:
+            ds.close()
+    print(f"recorded {recorder.reports} reports to {args.file}")
+
+
+def replay(args: argparse.Namespace) -> None:
+    with open(args.file, "rb") as file:
+        reports = read_recording(file)
+    device = ReplayDevice(reports, args.speed, args.loop)
+    ds = pydualsense()
+    ds.init(device)
+    try:
+        _watch([ds], args.interval, None, device)
+    finally:
+        ds.close()
+
+
+def bench(args: argparse.Namespace) -> None:
+    connection = ConnectionType.BT if args.connection == "bt" else ConnectionType.USB
+    source = SimulatedDualSense(connection, realtime=False, seed=1)
+    length = 78 if connection == ConnectionType.BT else 64
+    reports = [source.read(length) for _ in range(args.reports)]
+
+    ds = pydualsense()
+    ds.init(SimulatedDualSense(connection, realtime=False, seed=2))
+    # stop the report thread, the hot paths are called directly
+    ds.close()
+
+    start = time.perf_counter()
+    for report in reports:
+        ds.readInput(report)  # type: ignore[arg-type]
+    decode = (time.perf_counter() - start) / len(reports)
+
+    start = time.perf_counter()
+    for _ in range(args.reports):
+        ds.prepareReport()
+    encode = (time.perf_counter() - start) / args.reports
+
+    print(f"{connection.name} decode  {decode * 1e6:8.2f} us/report  {1 / decode:10.0f} reports/s")
+    print(f"{connection.name} encode  {encode * 1e6:8.2f} us/report  {1 / encode:10.0f} reports/s")
+
+    if args.group:
+        bench_group(args.group, args.rounds)
+
+
+def bench_group(count: int, rounds: int) -> None:
+    """
+    changing the light of many controllers one by one compared to a ControllerGroup, half USB and half bluetooth
+    """
+    controllers = []
+    for index in range(count):
+        connection = ConnectionType.BT if index % 2 else ConnectionType.USB
+        ds = pydualsense(max_output_rate=0)
+        # slow input reports, the output is written by the benchmark
+        ds.init(SimulatedDualSense(connection, rate=20, seed=index))
+        controllers.append(ds)
+    try:
+        start = time.perf_counter()
+        for step in range(rounds):
+            now = time.monotonic()
+            for ds in controllers:
+                ds.light.setColorI(step & 0xFF, 0, 255)
+                report = ds.prepareReport()
+                if ds.output_scheduler.submit(report, now):
+                    ds.writeReport(report)
+        single = (time.perf_counter() - start) / rounds
+
+        group = ControllerGroup(controllers, rate=0)
+        # every fourth controller shows its own player LED
+        for index, ds in enumerate(controllers[::4]):
+            group.setOverride(ds, playerNumber=1 << (index % 5))
+        start = time.perf_counter()
+        for step in range(rounds):
+            group.light.setColorI(step & 0xFF, 0, 255)
+            group.flush()
+        grouped = (time.perf_counter() - start) / rounds
+        group.close()
+    finally:
+        for ds in controllers:
+            ds.close()
+
+    print(f"{count} controllers one by one  {single * 1e6:8.1f} us/pass")
+    print(f"{count} controllers as a group  {grouped * 1e6:8.1f} us/pass  ({single / grouped:.1f}x)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m pydualsense", description="DualSense diagnostics")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("monitor", help="report rate, jitter, lost reports and battery of every controller")
+    command.add_argument("--serial", help="only the controller with this serial number")
+    command.add_argument("--interval", type=float, default=1.0, help="seconds between two status lines")
+    command.add_argument("--duration", type=float, help="stop after this many seconds")
+    command.add_argument("--out-of-process", action="store_true", help="read the controllers in child processes")
+    command.set_defaults(run=monitor)
+
+    command = commands.add_parser("record", help="record the raw input reports of a controller")
+    command.add_argument("file")
+    command.add_argument("--serial", help="record the controller with this serial number")
+    command.add_argument("--interval", type=float, default=1.0, help="seconds between two status lines")
+    command.add_argument("--duration", type=float, help="stop after this many seconds")
+    command.set_defaults(run=record)
+
+    command = commands.add_parser("replay", help="decode a recording at the recorded pace")
+    command.add_argument("file")
+    command.add_argument("--speed", type=float, default=1.0, help="playback speed, 0 is as fast as possible")
+    command.add_argument("--loop", action="store_true", help="restart at the end of the recording")
+    command.add_argument("--interval", type=float, default=1.0, help="seconds between two status lines")
+    command.set_defaults(run=replay)
+
+    command = commands.add_parser("bench", help="decode and encode benchmarks against a simulated controller")
+    command.add_argument("--reports", type=int, default=100000, help="number of reports")
+    command.add_argument("--connection", choices=("usb", "bt"), default="usb")
+    command.add_argument("--group", type=int, default=0, help="also compare a ControllerGroup of this many controllers")
+    command.add_argument("--rounds", type=int, default=2000, help="output passes of the group benchmark")
+    command.set_defaults(run=bench)
+
+    args = parser.parse_args(argv)
+    try:
+        args.run(args)
+    except Exception as error:
+        sys.exit(f"error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import math
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .effects import Clip, Playback
+from .enums import BlendMode, Brightness, PlayerID
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+# positions inside the USB output report, the BT report is shifted by one byte
+BRIGHTNESS_OFFSET = 43
+PLAYER_OFFSET = 44
+COLOR_OFFSET = 45
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: t * (2 - t),
+    "ease_in_out": lambda t: (1 - math.cos(math.pi * t)) / 2,
+    "step": lambda t: 0.0 if t < 1 else 1.0,
+}
+
+# clamp table for additive blending, index is the sum of both channels
+_CLAMP = bytes(min(i, 255) for i in range(511))
+
+Color = Tuple[int, int, int]
+
+
+class LightAnimation(Clip):
+    """
+    Precomputed lightbar animation. Colors, player LEDs and brightness are stored as compact byte tables
+    with one entry per report tick, so playback only copies or blends a few bytes per frame.
+
+    Animations are immutable and can be played on any number of controllers at the same time.
+    """
+
+    def __init__(
+        self,
+        frame_rate: float,
+        colors: Optional[bytes] = None,
+        player_numbers: Optional[bytes] = None,
+        brightness: Optional[bytes] = None,
+        blend: BlendMode = BlendMode.Replace,
+    ) -> None:
+        """
+        Args:
+            frame_rate (float): frames per second
+            colors (bytes, optional): 3 bytes (r, g, b) per frame. Defaults to None (lightbar untouched).
+            player_numbers (bytes, optional): :class:`PlayerID <pydualsense.enums.PlayerID>` value per frame. Defaults to None.
+            brightness (bytes, optional): :class:`Brightness <pydualsense.enums.Brightness>` value per frame. Defaults to None.
+            blend (BlendMode, optional): how the colors are combined with the lightbar color. Defaults to BlendMode.Replace.
+        """
+        if not isinstance(blend, BlendMode):
+            raise TypeError("Need BlendMode type")
+        if frame_rate <= 0:
+            raise Exception("frame_rate needs to be positive")
+
+        counts = set()
+        if colors is not None:
+            if len(colors) % 3:
+                raise Exception("colors need 3 bytes per frame")
+            counts.add(len(colors) // 3)
+        if player_numbers is not None:
+            counts.add(len(player_numbers))
+        if brightness is not None:
+            counts.add(len(brightness))
+        if len(counts) != 1:
+            raise Exception("all channels need the same number of frames")
+
+        self.frame_rate = frame_rate
+        self.frame_count = counts.pop()
+        self.colors = colors
+        self.player_numbers = player_numbers
+        self.brightness = brightness
+        self.blend = blend
+
+    @classmethod
+    def gradient(
+        cls,
+        stops: Sequence[Color],
+        duration: float,
+        easing: Union[str, Callable[[float], float]] = "linear",
+        frame_rate: float = 250.0,
+        blend: BlendMode = BlendMode.Replace,
+    ) -> "LightAnimation":
+        """
+        fade through the given colors, the stops are evenly distributed over the duration
+
+        Args:
+            stops (list): colors as (r, g, b) tuples, at least 2
+            duration (float): length of the animation in seconds
+            easing (str or function, optional): easing of each segment, name from :data:`EASINGS` or a function mapping 0..1 to 0..1. Defaults to "linear".
+            frame_rate (float, optional): frames per second. Defaults to 250.0.
+            blend (BlendMode, optional): blend mode. Defaults to BlendMode.Replace.
+
+        Returns:
+            LightAnimation: the animation
+        """
+        if len(stops) < 2:
+            raise Exception("a gradient needs at least 2 colors")
+        for color in stops:
+            _check_color(color)
+        ease = EASINGS[easing] if isinstance(easing, str) else easing
+
+        frame_count = max(int(duration * frame_rate), 1)
+        segments = len(stops) - 1
+        colors = bytearray(frame_count * 3)
+        for frame in range(frame_count):
+            position = frame / frame_count * segments
+            segment = min(int(position), segments - 1)
+            t = ease(position - segment)
+            start, end = stops[segment], stops[segment + 1]
+            colors[frame * 3:frame * 3 + 3] = bytes(
+                min(max(round(a + (b - a) * t), 0), 255) for a, b in zip(start, end)
+            )
+        return cls(frame_rate, colors=bytes(colors), blend=blend)
+
+    @classmethod
+    def cycle(
+        cls,
+        colors: Sequence[Color],
+        period: float,
+        easing: Union[str, Callable[[float], float]] = "linear",
+        frame_rate: float = 250.0,
+        blend: BlendMode = BlendMode.Replace,
+    ) -> "LightAnimation":
+        """
+        fade through the colors and back to the first one. Play it with ``loop=True`` for a seamless cycle
+
+        Args:
+            colors (list): colors as (r, g, b) tuples
+            period (float): time for one cycle in seconds
+            easing (str or function, optional): easing of each segment. Defaults to "linear".
+            frame_rate (float, optional): frames per second. Defaults to 250.0.
+            blend (BlendMode, optional): blend mode. Defaults to BlendMode.Replace.
+
+        Returns:
+            LightAnimation: the animation
+        """
+        return cls.gradient([*colors, colors[0]], period, easing, frame_rate, blend)
+
+    @classmethod
+    def pulse(
+        cls, color: Color, period: float, frame_rate: float = 250.0, blend: BlendMode = BlendMode.Replace
+    ) -> "LightAnimation":
+        """
+        fade the color in and out again
+
+        Args:
+            color (tuple): color as (r, g, b) tuple
+            period (float): time for one pulse in seconds
+            frame_rate (float, optional): frames per second. Defaults to 250.0.
+            blend (BlendMode, optional): blend mode. Defaults to BlendMode.Replace.
+
+        Returns:
+            LightAnimation: the animation
+        """
+        return cls.gradient([(0, 0, 0), color, (0, 0, 0)], period, "ease_in_out", frame_rate, blend)
+
+    @classmethod
+    def sequence(
+        cls,
+        step_duration: float,
+        colors: Optional[Sequence[Color]] = None,
+        player_numbers: Optional[Sequence[PlayerID]] = None,
+        brightness: Optional[Sequence[Brightness]] = None,
+        frame_rate: float = 250.0,
+        blend: BlendMode = BlendMode.Replace,
+    ) -> "LightAnimation":
+        """
+        step through colors, player LEDs and brightness levels without fading. All given sequences need the same length
+
+        Args:
+            step_duration (float): time of each step in seconds
+            colors (list, optional): colors as (r, g, b) tuples. Defaults to None.
+            player_numbers (list, optional): player LED states. Defaults to None.
+            brightness (list, optional): player LED brightness levels. Defaults to None.
+            frame_rate (float, optional): frames per second. Defaults to 250.0.
+            blend (BlendMode, optional): blend mode. Defaults to BlendMode.Replace.
+
+        Returns:
+            LightAnimation: the animation
+        """
+        repeat = max(int(step_duration * frame_rate), 1)
+
+        color_table = None
+        if colors is not None:
+            for color in colors:
+                _check_color(color)
+            color_table = b"".join(bytes(color) * repeat for color in colors)
+
+        player_table = None
+        if player_numbers is not None:
+            if not all(isinstance(player, PlayerID) for player in player_numbers):
+                raise TypeError("Need PlayerID type")
+            player_table = b"".join(bytes((player.value,)) * repeat for player in player_numbers)
+
+        brightness_table = None
+        if brightness is not None:
+            if not all(isinstance(level, Brightness) for level in brightness):
+                raise TypeError("Need Brightness type")
+            brightness_table = b"".join(bytes((level.value,)) * repeat for level in brightness)
+
+        return cls(frame_rate, color_table, player_table, brightness_table, blend)
+
+    def apply(self, report: List[int], offset: int, frame: int) -> None:
+        if self.brightness is not None:
+            report[BRIGHTNESS_OFFSET + offset] = self.brightness[frame]
+        if self.player_numbers is not None:
+            report[PLAYER_OFFSET + offset] = self.player_numbers[frame]
+
+        colors = self.colors
+        if colors is None:
+            return
+        base = frame * 3
+        position = COLOR_OFFSET + offset
+        blend = self.blend
+        if blend is BlendMode.Replace:
+            report[position:position + 3] = colors[base:base + 3]
+            return
+        for i in range(3):
+            a, b = report[position + i], colors[base + i]
+            if blend is BlendMode.Add:
+                report[position + i] = _CLAMP[a + b]
+            elif blend is BlendMode.Multiply:
+                report[position + i] = (a * b + 127) // 255
+            else:
+                report[position + i] = a if a > b else b
+
+
+def _check_color(color: Color) -> None:
+    if not isinstance(color, tuple) or len(color) != 3:
+        raise TypeError("Color type is tuple")
+    r, g, b = color
+    if (r > 255 or g > 255 or b > 255) or (r < 0 or g < 0 or b < 0):
+        raise Exception("colors have values from 0 to 255 only")
+
+
+def play_synchronized(
+    controllers: Iterable["pydualsense"], clip: Clip, loop: bool = False, layer: int = 0, delay: float = 0.0
+) -> List[Playback]:
+    """
+    play the same clip on several controllers with a shared start time. The clip and its tables are shared, not copied
+
+    Args:
+        controllers (list): pydualsense instances
+        clip (Clip): animation or effect to play
+        loop (bool, optional): restart the clip when it ends. Defaults to False.
+        layer (int, optional): higher layers overwrite lower layers. Defaults to 0.
+        delay (float, optional): seconds until the common start. Defaults to 0.0.
+
+    Returns:
+        list: playback handle for every controller
+    """
+    start = time.monotonic() + delay
+    return [ds.effects.play(clip, loop, layer, start) for ds in controllers]
@@ -1,5 +1,6 @@
 import array
-from typing import List
+import zlib
+from typing import List, Sequence
 
 # from South-River
 # fmt: off
@@ -40,10 +41,45 @@ hashTable = array.array('I', [
 # fmt:on
 
 
+# the reports are checksummed with a standard crc32 over a prefix byte and the report.
+# zlib continues from the crc of the prefix byte, which is the start value of the table based version
+OUTPUT_SEED = zlib.crc32(bytes([0xA2]))
+INPUT_SEED = zlib.crc32(bytes([0xA1]))
+
+
 def compute(buffer: List[int]) -> int:
+    """
+    crc32 of the first 74 bytes of a bluetooth output report
+
+    Args:
+        buffer (list): output report
+
+    Returns:
+        int: checksum to place into bytes 74..77
+    """
+    return zlib.crc32(bytes(buffer[:74]), OUTPUT_SEED)
+
+
+def compute_table(buffer: List[int]) -> int:
+    """
+    table based version of :func:`compute`, kept as reference implementation
+    """
     result: int = 0xEADA2D49
 
     for i in range(74):
         result = hashTable[(result & 0xFF) ^ (buffer[i] & 0xFF)] ^ (result >> 8)
 
     return result
+
+
+def check_input(report: Sequence[int]) -> bool:
+    """
+    validate the checksum of a bluetooth input report
+
+    Args:
+        report (bytes): 78 byte input report including the report id
+
+    Returns:
+        bool: True if the checksum in bytes 74..77 matches
+    """
+    return zlib.crc32(bytes(report[:74]), INPUT_SEED) == int.from_bytes(bytes(report[74:78]), byteorder="little")
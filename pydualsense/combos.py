@@ -0,0 +1,226 @@
+from collections import deque
+from typing import Deque, Dict, List, Sequence, Tuple, Union
+
+from .enums import Button
+from .event_system import Event
+
+DPAD_MASK = int(Button.DpadUp | Button.DpadRight | Button.DpadDown | Button.DpadLeft)
+
+# symbol of inputs that are not part of any combo, always leads back to the root state
+_OTHER = 0
+
+# step of a combo: (is chord, Button mask)
+_Step = Tuple[bool, int]
+
+
+class _Automaton:
+    """
+    compiled combos and the position of the input in them, replaced as a whole when the combos change
+    """
+
+    def __init__(self, combos: Dict[str, Tuple[Tuple[_Step, ...], Tuple[float, ...]]], event: Event) -> None:
+        self.event = event
+        self.directions: Dict[int, int] = {}
+        self.chords: Dict[int, int] = {}
+        self.relevant = 0
+
+        sequences: List[Tuple[str, List[int], Tuple[float, ...]]] = []
+        symbols = 1
+        for name, (steps, windows) in combos.items():
+            sequence = []
+            for is_chord, mask in steps:
+                table = self.chords if is_chord else self.directions
+                if mask not in table:
+                    table[mask] = symbols
+                    symbols += 1
+                if is_chord:
+                    self.relevant |= mask
+                sequence.append(table[mask])
+            sequences.append((name, sequence, windows))
+
+        # trie of all combos, node 0 is the root
+        children: List[Dict[int, int]] = [{}]
+        edge_window: List[float] = [0.0]  # window of the step leading to the node
+        outputs: List[Tuple[Tuple[str, Tuple[float, ...]], ...]] = [()]
+        for name, sequence, windows in sequences:
+            node = 0
+            for position, symbol in enumerate(sequence):
+                if symbol not in children[node]:
+                    children[node][symbol] = len(children)
+                    children.append({})
+                    edge_window.append(0.0)
+                    outputs.append(())
+                node = children[node][symbol]
+                edge_window[node] = max(edge_window[node], windows[position])
+            outputs[node] += ((name, windows),)
+
+        # fail links and the complete transition table, breadth first so suffix states are finished first
+        fail = [0] * len(children)
+        self.delta = [[0] * symbols for _ in children]
+        # longest time a state waits for its next symbol, including the states of its suffixes
+        self.window = [0.0] * len(children)
+        self.window[0] = float("inf")
+        queue: Deque[int] = deque()
+        for symbol, child in children[0].items():
+            self.delta[0][symbol] = child
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            suffix = fail[node]
+            outputs[node] += outputs[suffix]
+            self.delta[node] = list(self.delta[suffix])
+            self.delta[node][_OTHER] = 0
+            for symbol, child in children[node].items():
+                fail[child] = self.delta[suffix][symbol] if node else 0
+                self.delta[node][symbol] = child
+                queue.append(child)
+            longest = max((edge_window[child] for child in children[node].values()), default=0.0)
+            self.window[node] = max(longest, self.window[suffix]) if suffix else longest
+        self.outputs = outputs
+
+        # a released dpad is skipped by every state that does not continue with a neutral step
+        self.neutral = self.directions.get(0, -1)
+        if self.neutral > 0:
+            for node, row in enumerate(self.delta):
+                row[self.neutral] = children[node].get(self.neutral, node)
+
+        self.history = max((len(sequence) for _, sequence, _ in sequences), default=1)
+        self.times = [0.0] * self.history
+        self.count = 0
+        self.state = 0
+        self.last_time = float("-inf")
+        self.dpad = 0
+
+    def update(self, buttons: int, pressed: int, now: float) -> None:
+        dpad = buttons & DPAD_MASK
+        if dpad != self.dpad:
+            self.dpad = dpad
+            symbol = self.directions.get(dpad)
+            if symbol is not None:
+                self.feed(symbol, now)
+            elif dpad:
+                self.feed(_OTHER, now)
+        if pressed & self.relevant:
+            self.feed(self.chords.get(buttons & self.relevant, _OTHER), now)
+
+    def feed(self, symbol: int, now: float) -> None:
+        state = self.state
+        if now - self.last_time > self.window[state]:
+            state = 0
+        following = self.delta[state][symbol]
+        if following == state and symbol == self.neutral:
+            return
+        state = self.state = following
+        self.last_time = now
+        self.count += 1
+        self.times[self.count % self.history] = now
+
+        for name, windows in self.outputs[state]:
+            if self.inWindows(windows, now):
+                self.event(name)
+
+    def inWindows(self, windows: Tuple[float, ...], now: float) -> bool:
+        """
+        check the time between the steps of a combo that just completed
+        """
+        times, history, count = self.times, self.history, self.count
+        later = now
+        for step in range(len(windows) - 1, 0, -1):
+            count -= 1
+            earlier = times[count % history]
+            if later - earlier > windows[step]:
+                return False
+            later = earlier
+        return True
+
+
+class ComboDetector:
+    """
+    Detects button sequences and chords, e.g. fighting game motions like down, down-right, right + square.
+
+    The inputs of every report are turned into symbols: one for every change of the dpad direction and one
+    for the held buttons whenever a button used in a chord is pressed, so chords may be pressed over several
+    reports. All registered combos are compiled into one automaton (Aho-Corasick) that advances once per
+    symbol, the cost does not depend on the number of combos.
+    """
+
+    def __init__(self) -> None:
+        """
+        initialise the detector without combos
+        """
+        # combo detected (name)
+        self.combo_detected = Event()
+
+        self._combos: Dict[str, Tuple[Tuple[_Step, ...], Tuple[float, ...]]] = {}
+        self._automaton = _Automaton(self._combos, self.combo_detected)
+
+    @property
+    def active(self) -> bool:
+        """True if at least one combo is registered"""
+        return bool(self._combos)
+
+    def add(self, name: str, steps: Sequence[int], window: Union[float, Sequence[float]] = 0.2) -> None:
+        """
+        register a combo, a combo with the same name is replaced
+
+        Args:
+            name (str): name passed to :attr:`combo_detected`
+            steps (list): Button masks of the steps. The dpad bits of a step are a dpad direction (0 is neutral),
+                the other bits a chord of buttons held together. A step with both is the direction followed by the chord.
+            window (float or list, optional): maximum seconds between a step and the previous step, one value
+                for all steps or one per step (the first one is ignored). Defaults to 0.2.
+
+        Raises:
+            Exception: no steps or wrong number of windows
+        """
+        if not steps:
+            raise Exception("a combo needs at least one step")
+        windows = [float(window)] * len(steps) if isinstance(window, (int, float)) else list(window)
+        if len(windows) != len(steps):
+            raise Exception("a combo needs one window per step")
+
+        combo: List[_Step] = []
+        combo_windows: List[float] = []
+        for step, step_window in zip(steps, windows):
+            direction, chord = int(step) & DPAD_MASK, int(step) & ~DPAD_MASK
+            if direction or not chord:
+                combo.append((False, direction))
+                combo_windows.append(step_window)
+            if chord:
+                combo.append((True, chord))
+                combo_windows.append(step_window)
+
+        combos = dict(self._combos)
+        combos[name] = (tuple(combo), tuple(combo_windows))
+        self._combos = combos
+        self._automaton = _Automaton(combos, self.combo_detected)
+
+    def remove(self, name: str) -> None:
+        """
+        unregister a combo
+
+        Args:
+            name (str): name of the combo
+        """
+        if name in self._combos:
+            combos = dict(self._combos)
+            del combos[name]
+            self._combos = combos
+            self._automaton = _Automaton(combos, self.combo_detected)
+
+    def reset(self) -> None:
+        """
+        forget the partially entered combos
+        """
+        self._automaton = _Automaton(self._combos, self.combo_detected)
+
+    def update(self, buttons: int, pressed: int, now: float) -> None:
+        """
+        feed the buttons of one report
+
+        Args:
+            buttons (int): held Button bits
+            pressed (int): Button bits pressed with this report
+            now (float): time of the report in seconds
+        """
+        self._automaton.update(buttons, pressed, now)
@@ -0,0 +1,8 @@
+# scales of the raw motion values in the input report
+
+# raw gyro units per degree/s (+-2000 degree/s range)
+GYRO_RES_PER_DEG_S = 16
+# raw accelerometer units per g
+ACCEL_RES_PER_G = 8192
+# sensor timestamp ticks per second
+TIMESTAMP_RES = 3000000
@@ -0,0 +1,310 @@
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .constants import ACCEL_RES_PER_G, GYRO_RES_PER_DEG_S
+from .enums import BatteryState, ConnectionType
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+logger = logging.getLogger(__name__)
+
+DSU_PORT = 26760
+PROTOCOL_VERSION = 1001
+MAX_SLOTS = 4
+# clients have to repeat their pad data request, otherwise they are dropped
+CLIENT_TIMEOUT = 5.0
+
+MSG_VERSION = 0x100000
+MSG_PORTS = 0x100001
+MSG_PAD_DATA = 0x100002
+
+# header: magic, protocol version, length without header, crc32, server id
+HEADER = struct.Struct("<4sHHII")
+# message type and the shared controller information of every response
+# slot, slot state, device model, connection type, mac address, battery
+CONTROLLER_INFO = struct.Struct("<IBBBB6sB")
+# pad data after the controller information
+PAD_DATA = struct.Struct(
+    "<BI"  # connected, packet number
+    "BBBB"  # buttons 1, buttons 2, home, touch button
+    "BBBB"  # LX, LY, RX, RY
+    "BBBB"  # analog dpad left, down, right, up
+    "BBBB"  # analog triangle, circle, cross, square
+    "BBBB"  # analog R1, L1, R2, L2
+    "BBHH"  # first touch: active, id, x, y
+    "BBHH"  # second touch
+    "Q"  # motion timestamp in microseconds
+    "fff"  # accelerometer in g
+    "fff"  # gyroscope in degree/s (pitch, yaw, roll)
+)
+PAD_PACKET_SIZE = HEADER.size + CONTROLLER_INFO.size + PAD_DATA.size
+
+SLOT_CONNECTED = 2
+MODEL_FULL_GYRO = 2
+CONNECTION_USB = 1
+CONNECTION_BT = 2
+
+_BATTERY_CHARGING = 0xEE
+_BATTERY_CHARGED = 0xEF
+
+
+class _Slot:
+    """
+    preallocated packet and counters of one controller slot
+    """
+
+    def __init__(self, ds: "pydualsense", slot: int, hook: "object") -> None:
+        self.ds = ds
+        self.slot = slot
+        self.hook = hook
+        self.packet = bytearray(PAD_PACKET_SIZE)
+        self.packet_number = 0
+        self.mac = bytes([0, 0, 0, 0, 0, slot + 1])
+        self.last_timestamp: Optional[int] = None
+        self.timestamp_us = 0.0
+
+
+class DSUServer:
+    """
+    DSU (cemuhook) UDP server. Controllers added to the server stream every decoded report to all subscribed
+    clients, the packets are packed into one preallocated buffer per slot.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DSU_PORT) -> None:
+        """
+        open the UDP socket and start answering client requests
+
+        Args:
+            host (str, optional): address to bind to. Defaults to "127.0.0.1".
+            port (int, optional): port to bind to, 0 picks a free port. Defaults to 26760.
+        """
+        self.server_id = random.getrandbits(32)
+        self.packets_sent = 0
+
+        self._slots: List[Optional[_Slot]] = [None] * MAX_SLOTS
+        # client address -> slot -> time the subscription expires
+        self._clients: Dict[Tuple[str, int], Dict[int, float]] = {}
+        self._lock = threading.Lock()
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.settimeout(0.5)
+        self.address = self.socket.getsockname()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def addController(self, ds: "pydualsense", slot: Optional[int] = None) -> int:
+        """
+        stream the reports of a controller
+
+        Args:
+            ds (pydualsense): initialized controller
+            slot (int, optional): slot 0..3. Defaults to None (first free slot).
+
+        Raises:
+            Exception: no free slot
+
+        Returns:
+            int: slot of the controller
+        """
+        if slot is None:
+            free = [index for index, entry in enumerate(self._slots) if entry is None]
+            if not free:
+                raise Exception("no free DSU slot")
+            slot = free[0]
+        if slot < 0 or slot >= MAX_SLOTS or self._slots[slot] is not None:
+            raise Exception(f"DSU slot {slot} is not available")
+
+        def hook(ds: "pydualsense") -> None:
+            self._sendPadData(entry)
+
+        entry = _Slot(ds, slot, hook)
+        self._slots[slot] = entry
+        ds.addReportHook(hook)
+        return slot
+
+    def removeController(self, ds: "pydualsense") -> None:
+        """
+        stop streaming a controller
+
+        Args:
+            ds (pydualsense): previously added controller
+        """
+        for index, entry in enumerate(self._slots):
+            if entry is not None and entry.ds is ds:
+                ds.removeReportHook(entry.hook)  # type: ignore[arg-type]
+                self._slots[index] = None
+
+    def close(self) -> None:
+        """
+        stop streaming and close the socket
+        """
+        for entry in self._slots:
+            if entry is not None:
+                self.removeController(entry.ds)
+        self._running = False
+        self._thread.join()
+        self.socket.close()
+
+    def _serve(self) -> None:
+        """
+        answer client requests until the server is closed
+        """
+        while self._running:
+            try:
+                data, address = self.socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                self._handleRequest(data, address)
+            except struct.error:
+                logger.debug("malformed DSU request from %s", address)
+
+    def _handleRequest(self, data: bytes, address: Tuple[str, int]) -> None:
+        magic, _, _, crc, _ = HEADER.unpack_from(data)
+        if magic != b"DSUC" or len(data) < HEADER.size + 4:
+            return
+        check = bytearray(data)
+        check[8:12] = bytes(4)
+        if zlib.crc32(check) != crc:
+            return
+
+        (message,) = struct.unpack_from("<I", data, HEADER.size)
+        payload = HEADER.size + 4
+        if message == MSG_VERSION:
+            self._send(struct.pack("<IH", MSG_VERSION, PROTOCOL_VERSION), address)
+        elif message == MSG_PORTS:
+            (count,) = struct.unpack_from("<i", data, payload)
+            for slot in data[payload + 4:payload + 4 + min(count, MAX_SLOTS)]:
+                self._send(self._controllerInfo(MSG_PORTS, slot) + b"\x00", address)
+        elif message == MSG_PAD_DATA:
+            flags, slot, mac = struct.unpack_from("<BB6s", data, payload)
+            expires = time.monotonic() + CLIENT_TIMEOUT
+            with self._lock:
+                subscriptions = self._clients.setdefault(address, {})
+                for entry in self._slots:
+                    if entry is None:
+                        continue
+                    if flags == 0 or (flags & 0x01 and entry.slot == slot) or (flags & 0x02 and entry.mac == mac):
+                        subscriptions[entry.slot] = expires
+
+    def _controllerInfo(self, message: int, slot: int) -> bytes:
+        entry = self._slots[slot] if 0 <= slot < MAX_SLOTS else None
+        if entry is None:
+            return CONTROLLER_INFO.pack(message, slot, 0, 0, 0, bytes(6), 0)
+        return CONTROLLER_INFO.pack(
+            message, slot, SLOT_CONNECTED, MODEL_FULL_GYRO, self._connection(entry.ds), entry.mac, self._battery(entry.ds)
+        )
+
+    def _send(self, message: bytes, address: Tuple[str, int]) -> None:
+        packet = bytearray(HEADER.size + len(message))
+        packet[HEADER.size:] = message
+        HEADER.pack_into(packet, 0, b"DSUS", PROTOCOL_VERSION, len(message), 0, self.server_id)
+        HEADER.pack_into(packet, 0, b"DSUS", PROTOCOL_VERSION, len(message), zlib.crc32(packet), self.server_id)
+        self.socket.sendto(packet, address)
+
+    @staticmethod
+    def _connection(ds: "pydualsense") -> int:
+        return CONNECTION_USB if ds.conType == ConnectionType.USB else CONNECTION_BT
+
+    @staticmethod
+    def _battery(ds: "pydualsense") -> int:
+        battery = ds.battery
+        if battery.State == BatteryState.POWER_SUPPLY_STATUS_CHARGING:
+            return _BATTERY_CHARGING
+        if battery.State == BatteryState.POWER_SUPPLY_STATUS_FULL:
+            return _BATTERY_CHARGED
+        # 1 dying .. 5 full
+        return min(battery.Level // 20 + 1, 5)
+
+    def _sendPadData(self, entry: _Slot) -> None:
+        """
+        report hook of a controller, packs the current state and sends it to all subscribed clients
+        """
+        now = time.monotonic()
+        clients = [address for address, slots in tuple(self._clients.items()) if slots.get(entry.slot, 0.0) > now]
+        if not clients:
+            if self._clients:
+                self._expireClients(now)
+            return
+
+        ds = entry.ds
+        state = ds.state
+
+        # sensor timestamp has 1/3 microsecond resolution and wraps around
+        if entry.last_timestamp is not None:
+            entry.timestamp_us += ((state.sensorTimestamp - entry.last_timestamp) & 0xFFFFFFFF) / 3
+        entry.last_timestamp = state.sensorTimestamp
+        entry.packet_number = (entry.packet_number + 1) & 0xFFFFFFFF
+
+        buttons1 = (
+            state.share
+            | state.L3 << 1
+            | state.R3 << 2
+            | state.options << 3
+            | state.DpadUp << 4
+            | state.DpadRight << 5
+            | state.DpadDown << 6
+            | state.DpadLeft << 7
+        )
+        buttons2 = (
+            state.L2Btn
+            | state.R2Btn << 1
+            | state.L1 << 2
+            | state.R1 << 3
+            | state.triangle << 4
+            | state.circle << 5
+            | state.cross << 6
+            | state.square << 7
+        )
+        touch0, touch1 = state.trackPadTouch0, state.trackPadTouch1
+        gyro, accel = state.gyro, state.accelerometer
+
+        packet = entry.packet
+        CONTROLLER_INFO.pack_into(
+            packet, HEADER.size, MSG_PAD_DATA, entry.slot, SLOT_CONNECTED, MODEL_FULL_GYRO,
+            self._connection(ds), entry.mac, self._battery(ds),
+        )
+        PAD_DATA.pack_into(
+            packet, HEADER.size + CONTROLLER_INFO.size,
+            1, entry.packet_number,
+            buttons1, buttons2, state.ps, state.touchBtn,
+            state.LX + 128, 127 - state.LY, state.RX + 128, 127 - state.RY,  # DSU Y axes point up
+            state.DpadLeft * 255, state.DpadDown * 255, state.DpadRight * 255, state.DpadUp * 255,
+            state.triangle * 255, state.circle * 255, state.cross * 255, state.square * 255,
+            state.R1 * 255, state.L1 * 255, state.R2_value, state.L2_value,
+            touch0.isActive, touch0.ID, touch0.X, touch0.Y,
+            touch1.isActive, touch1.ID, touch1.X, touch1.Y,
+            int(entry.timestamp_us),
+            accel.X / ACCEL_RES_PER_G, accel.Y / ACCEL_RES_PER_G, accel.Z / ACCEL_RES_PER_G,
+            gyro.Pitch / GYRO_RES_PER_DEG_S, gyro.Yaw / GYRO_RES_PER_DEG_S, gyro.Roll / GYRO_RES_PER_DEG_S,
+        )
+        HEADER.pack_into(packet, 0, b"DSUS", PROTOCOL_VERSION, PAD_PACKET_SIZE - HEADER.size, 0, self.server_id)
+        struct.pack_into("<I", packet, 8, zlib.crc32(packet))
+
+        for address in clients:
+            try:
+                self.socket.sendto(packet, address)
+                self.packets_sent += 1
+            except OSError:
+                logger.debug("failed to send DSU packet to %s", address)
+
+    def _expireClients(self, now: float) -> None:
+        with self._lock:
+            for address in list(self._clients):
+                slots = {slot: expires for slot, expires in self._clients[address].items() if expires > now}
+                if slots:
+                    self._clients[address] = slots
+                else:
+                    del self._clients[address]
@@ -0,0 +1,322 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .enums import TriggerModes
+
+# positions of the effect channels inside the USB output report.
+# the bluetooth report has the same layout shifted by one byte
+CHANNEL_OFFSETS: Dict[str, Tuple[int, ...]] = {
+    "rightMotor": (3,),
+    "leftMotor": (4,),
+    "triggerR": (11, 12, 13, 14, 15, 16, 17, 20),
+    "triggerL": (22, 23, 24, 25, 26, 27, 28, 31),
+    "light": (45, 46, 47),
+}
+
+
+class Clip(ABC):
+    """
+    Base class for everything the :class:`EffectPlayer` can play. A clip has a fixed number of frames
+    and writes one of them into every output report
+    """
+
+    frame_rate: float
+    frame_count: int
+
+    @property
+    def duration(self) -> float:
+        """length of the clip in seconds"""
+        return self.frame_count / self.frame_rate
+
+    @abstractmethod
+    def apply(self, report: List[int], offset: int, frame: int) -> None:
+        """
+        write a frame into an output report
+
+        Args:
+            report (list): output report
+            offset (int): shift of the report layout, 0 for USB and 1 for BT
+            frame (int): frame to write
+        """
+
+
+class CompiledEffect(Clip):
+    """
+    Precompiled effect. Holds one byte frame per report tick and the report positions they are written to
+    """
+
+    def __init__(self, indices: Sequence[int], frames: bytes, frame_rate: float) -> None:
+        """
+        Args:
+            indices (list): USB output report positions written by every frame
+            frames (bytes): concatenated frames, each ``len(indices)`` bytes long
+            frame_rate (float): frames per second
+        """
+        self.indices = tuple(indices)
+        self.frames = frames
+        self.frame_rate = frame_rate
+        self.frame_size = len(self.indices)
+        self.frame_count = len(frames) // self.frame_size if self.frame_size else 0
+
+        # group the positions into contiguous runs so a frame is applied with a few slice assignments
+        self._runs: List[Tuple[int, int, int]] = []
+        start = 0
+        for i in range(1, self.frame_size + 1):
+            if i == self.frame_size or self.indices[i] != self.indices[i - 1] + 1:
+                self._runs.append((self.indices[start], start, i - start))
+                start = i
+
+    def apply(self, report: List[int], offset: int, frame: int) -> None:
+        base = frame * self.frame_size
+        frames = self.frames
+        for position, start, length in self._runs:
+            position += offset
+            report[position:position + length] = frames[base + start:base + start + length]
+
+
+class EffectTimeline:
+    """
+    Keyframed sequence of rumble, trigger and light values that is compiled into a :class:`CompiledEffect`
+    """
+
+    def __init__(self) -> None:
+        self._keyframes: Dict[str, List[Tuple[float, Tuple[int, ...], bool]]] = {}
+
+    def _add(self, channel: str, time: float, values: Tuple[int, ...], interpolate: bool) -> "EffectTimeline":
+        if not isinstance(time, (int, float)):
+            raise TypeError("time needs to be a number")
+        if time < 0:
+            raise Exception("time can't be negative")
+        for value in values:
+            if not isinstance(value, int):
+                raise TypeError("values need to be int")
+            if value > 255 or value < 0:
+                raise Exception("values have to be in range 0..255")
+
+        keyframes = self._keyframes.setdefault(channel, [])
+        times = [keyframe[0] for keyframe in keyframes]
+        index = bisect.bisect_right(times, time)
+        if index and times[index - 1] == time:
+            keyframes[index - 1] = (time, values, interpolate)
+        else:
+            keyframes.insert(index, (time, values, interpolate))
+        return self
+
+    def rumble(
+        self, time: float, left: Optional[int] = None, right: Optional[int] = None, interpolate: bool = True
+    ) -> "EffectTimeline":
+        """
+        add a rumble keyframe
+
+        Args:
+            time (float): time of the keyframe in seconds
+            left (int, optional): left motor intensity 0..255. Defaults to None (unchanged).
+            right (int, optional): right motor intensity 0..255. Defaults to None (unchanged).
+            interpolate (bool, optional): fade from the previous keyframe. Defaults to True.
+
+        Returns:
+            EffectTimeline: the timeline itself to allow chaining
+        """
+        if left is not None:
+            self._add("leftMotor", time, (left,), interpolate)
+        if right is not None:
+            self._add("rightMotor", time, (right,), interpolate)
+        return self
+
+    def trigger(
+        self, time: float, side: str, mode: TriggerModes, forces: Sequence[int] = (0,) * 7
+    ) -> "EffectTimeline":
+        """
+        add a trigger keyframe. Trigger keyframes are never interpolated
+
+        Args:
+            time (float): time of the keyframe in seconds
+            side (str): ``"L"`` or ``"R"``
+            mode (TriggerModes): trigger mode
+            forces (list, optional): the 7 force parameters, see :class:`DSTrigger <pydualsense.pydualsense.DSTrigger>`
+
+        Returns:
+            EffectTimeline: the timeline itself to allow chaining
+        """
+        if side not in ("L", "R"):
+            raise Exception("side needs to be 'L' or 'R'")
+        if not isinstance(mode, TriggerModes):
+            raise TypeError("Trigger mode parameter needs to be of type `TriggerModes`")
+        if len(forces) != 7:
+            raise Exception("only 7 parameters available")
+        return self._add("trigger" + side, time, (int(mode), *forces), False)
+
+    def light(self, time: float, color: Tuple[int, int, int], interpolate: bool = True) -> "EffectTimeline":
+        """
+        add a lightbar color keyframe
+
+        Args:
+            time (float): time of the keyframe in seconds
+            color (tuple): color as (r, g, b) tuple
+            interpolate (bool, optional): fade from the previous keyframe. Defaults to True.
+
+        Returns:
+            EffectTimeline: the timeline itself to allow chaining
+        """
+        if not isinstance(color, tuple) or len(color) != 3:
+            raise TypeError("Color type is tuple")
+        return self._add("light", time, color, interpolate)
+
+    @property
+    def duration(self) -> float:
+        """time of the last keyframe in seconds"""
+        return max((keyframes[-1][0] for keyframes in self._keyframes.values()), default=0.0)
+
+    def compile(self, frame_rate: float = 250.0) -> CompiledEffect:
+        """
+        sample all channels once per report tick into byte frames
+
+        Args:
+            frame_rate (float, optional): frames per second, should match the output rate. Defaults to 250.0.
+
+        Returns:
+            CompiledEffect: the compiled effect
+        """
+        if frame_rate <= 0:
+            raise Exception("frame_rate needs to be positive")
+
+        channels = [channel for channel in CHANNEL_OFFSETS if channel in self._keyframes]
+        indices = [index for channel in channels for index in CHANNEL_OFFSETS[channel]]
+        frame_count = int(self.duration * frame_rate) + 1
+
+        frames = bytearray()
+        for frame in range(frame_count):
+            time = frame / frame_rate
+            for channel in channels:
+                frames.extend(_sample(self._keyframes[channel], time))
+        return CompiledEffect(indices, bytes(frames), frame_rate)
+
+
+def _sample(keyframes: List[Tuple[float, Tuple[int, ...], bool]], time: float) -> Tuple[int, ...]:
+    """
+    value of a channel at the given time. Holds the first and last keyframe outside of the keyframe range
+    """
+    index = bisect.bisect_right([keyframe[0] for keyframe in keyframes], time)
+    if index == 0:
+        return keyframes[0][1]
+    if index == len(keyframes):
+        return keyframes[-1][1]
+
+    start_time, start, _ = keyframes[index - 1]
+    end_time, end, interpolate = keyframes[index]
+    if not interpolate:
+        return start
+    t = (time - start_time) / (end_time - start_time)
+    return tuple(round(a + (b - a) * t) for a, b in zip(start, end))
+
+
+class Playback:
+    """
+    A running effect of the :class:`EffectPlayer`
+    """
+
+    def __init__(
+        self, player: "EffectPlayer", clip: Clip, loop: bool, layer: int, start: Optional[float] = None
+    ) -> None:
+        self.player = player
+        self.clip = clip
+        self.loop = loop
+        self.layer = layer
+        self.start = start  # set on the first report tick if not given
+        self.active = True
+
+    def cancel(self) -> None:
+        """
+        stop the playback. The controller returns to the values set through the normal API
+        """
+        self.player.cancel(self)
+
+
+class EffectPlayer:
+    """
+    Plays compiled effects from the output loop. Every output report writes the current frame of each
+    running effect, effects on higher layers overwrite lower layers
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._playbacks: List[Playback] = []
+
+    def play(self, clip: Clip, loop: bool = False, layer: int = 0, start: Optional[float] = None) -> Playback:
+        """
+        start playing an effect with the next output report
+
+        Args:
+            clip (Clip): effect or animation to play
+            loop (bool, optional): restart the effect when it ends. Defaults to False.
+            layer (int, optional): higher layers overwrite lower layers. Defaults to 0.
+            start (float, optional): monotonic start time, used to keep several controllers in sync.
+                Defaults to None (start with the next output report).
+
+        Returns:
+            Playback: handle of the running effect
+        """
+        if clip.frame_count == 0:
+            raise Exception("effect has no frames")
+        playback = Playback(self, clip, loop, layer, start)
+        with self._lock:
+            # keep the list sorted by layer, new playbacks go on top of their layer
+            self._playbacks = sorted([*self._playbacks, playback], key=lambda pb: pb.layer)
+        return playback
+
+    def cancel(self, playback: Playback) -> None:
+        """
+        stop a running effect
+
+        Args:
+            playback (Playback): handle returned by :func:`play`
+        """
+        with self._lock:
+            playback.active = False
+            self._playbacks = [pb for pb in self._playbacks if pb is not playback]
+
+    def cancelAll(self) -> None:
+        """
+        stop all running effects
+        """
+        with self._lock:
+            for playback in self._playbacks:
+                playback.active = False
+            self._playbacks = []
+
+    @property
+    def playing(self) -> bool:
+        """True if any effect is running"""
+        return bool(self._playbacks)
+
+    def render(self, report: List[int], offset: int, now: float) -> None:
+        """
+        write the current frame of all running effects into the output report
+
+        Args:
+            report (list): output report
+            offset (int): shift of the report layout, 0 for USB and 1 for BT
+            now (float): current monotonic time in seconds
+        """
+        finished = False
+        for playback in self._playbacks:
+            if playback.start is None:
+                playback.start = now
+            clip = playback.clip
+            frame = int((now - playback.start) * clip.frame_rate)
+            if frame < 0:
+                # synchronized start lies in the future
+                continue
+            if frame >= clip.frame_count:
+                if not playback.loop:
+                    playback.active = False
+                    finished = True
+                    continue
+                frame %= clip.frame_count
+            clip.apply(report, offset, frame)
+
+        if finished:
+            with self._lock:
+                self._playbacks = [pb for pb in self._playbacks if pb.active]
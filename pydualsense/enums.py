@@ -1,4 +1,4 @@
-from enum import IntFlag
+from enum import IntEnum, IntFlag
 
 
 class ConnectionType(IntFlag):
@@ -26,6 +26,13 @@ class Brightness(IntFlag):
     low = 0x2
 
 
+class BlendMode(IntEnum):
+    Replace = 0x0  # animation color replaces the lightbar color
+    Add = 0x1  # channels are added and clamped to 255
+    Multiply = 0x2  # channels are multiplied, 255 keeps the lightbar color
+    Max = 0x3  # brighter channel wins
+
+
 class PlayerID(IntFlag):
     PLAYER_1 = 4
     PLAYER_2 = 10
@@ -47,6 +54,61 @@ class TriggerModes(IntFlag):
     Calibration = 0xFC
 
 
+class Direction(IntFlag):
+    Up = 0x1
+    Down = 0x2
+    Left = 0x4
+    Right = 0x8
+
+
+class GyroSmoothing(IntFlag):
+    Off = 0x0
+    OneEuro = 0x1
+    Tiered = 0x2
+
+
+class Button(IntFlag):
+    DpadUp = 1 << 0
+    DpadRight = 1 << 1
+    DpadDown = 1 << 2
+    DpadLeft = 1 << 3
+    Square = 1 << 4
+    Cross = 1 << 5
+    Circle = 1 << 6
+    Triangle = 1 << 7
+    L1 = 1 << 8
+    R1 = 1 << 9
+    L2 = 1 << 10  # digital L2 button
+    R2 = 1 << 11  # digital R2 button
+    Share = 1 << 12
+    Options = 1 << 13
+    L3 = 1 << 14
+    R3 = 1 << 15
+    PS = 1 << 16
+    Touchpad = 1 << 17
+    Mic = 1 << 18
+    # DualSense Edge back buttons
+    L4 = 1 << 20
+    R4 = 1 << 21
+    L5 = 1 << 22
+    R5 = 1 << 23
+
+
+class StateField(IntFlag):
+    LX = 1 << 0
+    LY = 1 << 1
+    RX = 1 << 2
+    RY = 1 << 3
+    L2_value = 1 << 4
+    R2_value = 1 << 5
+    Buttons = 1 << 6
+    Touch0 = 1 << 7
+    Touch1 = 1 << 8
+    Gyro = 1 << 9
+    Accelerometer = 1 << 10
+    Battery = 1 << 11
+
+
 class BatteryState(IntFlag):
     POWER_SUPPLY_STATUS_DISCHARGING = 0x0
     POWER_SUPPLY_STATUS_CHARGING = 0x1
@@ -1,32 +1,239 @@
-from typing import Any, Callable, List
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, ClassVar, Coroutine, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# coroutine calls collected on the current thread between begin_batch() and flush_batch()
+_batch = threading.local()
+
+# subscribed ``async def`` function
+_CoroutineFunction = Callable[..., Coroutine[Any, Any, None]]
+
+
+class _AsyncHandler:
+    """
+    coroutine function subscribed to an event, compares equal to the function so it can be unsubscribed
+    """
+
+    def __init__(
+        self, fn: _CoroutineFunction, dispatcher: "AsyncDispatcher", concurrent: bool, max_age: Optional[float]
+    ) -> None:
+        self.fn = fn
+        self.dispatcher = dispatcher
+        self.concurrent = concurrent
+        self.max_age = max_age
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _AsyncHandler):
+            return self.fn == other.fn and self.dispatcher is other.dispatcher
+        return bool(self.fn == other)
+
+    def __hash__(self) -> int:
+        return hash(self.fn)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        calls = getattr(_batch, "calls", None)
+        if calls is None:
+            self.dispatcher.submit([(self, args, kwargs)], time.monotonic())
+        else:
+            calls.append((self, args, kwargs))
+
+
+_Call = Tuple[_AsyncHandler, Tuple[Any, ...], Dict[str, Any]]
+
+
+def begin_batch() -> None:
+    """
+    collect the coroutine calls of the events fired on this thread until :func:`flush_batch`
+    """
+    _batch.calls = []
+
+
+def flush_batch() -> None:
+    """
+    hand the collected coroutine calls to their loops, one ``call_soon_threadsafe`` per loop
+    """
+    calls: Optional[List[_Call]] = getattr(_batch, "calls", None)
+    _batch.calls = None
+    if not calls:
+        return
+    stamp = time.monotonic()
+    first = calls[0][0].dispatcher
+    if all(handler.dispatcher is first for handler, _, _ in calls):
+        first.submit(calls, stamp)
+        return
+    by_loop: Dict[AsyncDispatcher, List[_Call]] = {}
+    for call in calls:
+        by_loop.setdefault(call[0].dispatcher, []).append(call)
+    for dispatcher, loop_calls in by_loop.items():
+        dispatcher.submit(loop_calls, stamp)
+
+
+class AsyncDispatcher:
+    """
+    Runs the coroutine event handlers of one asyncio loop.
+
+    The calls of one report arrive together with a single ``call_soon_threadsafe``. Sequential handlers are
+    awaited one after another in the order they were fired, concurrent handlers are started as tasks right away.
+    Calls older than the ``max_age`` of their subscription when the loop gets to them are dropped.
+    The loop is only referenced weakly, a closed loop and its dispatcher are freed once nothing else uses them.
+    """
+
+    _dispatchers: ClassVar["weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncDispatcher]"] = (
+        weakref.WeakKeyDictionary()
+    )
+    _lock = threading.Lock()
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = weakref.ref(loop)
+        self.dispatched = 0  # handler calls started
+        self.dropped = 0  # stale calls and calls to a closed loop
+        self._queue: Deque[Tuple[_AsyncHandler, Tuple[Any, ...], Dict[str, Any], float]] = deque()
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """the loop, None once it was garbage collected"""
+        return self._loop()
+
+    @classmethod
+    def forLoop(cls, loop: asyncio.AbstractEventLoop) -> "AsyncDispatcher":
+        """
+        the dispatcher of a loop, created on first use
+
+        Args:
+            loop (asyncio.AbstractEventLoop): the loop
+
+        Returns:
+            AsyncDispatcher: dispatcher of the loop
+        """
+        with cls._lock:
+            dispatcher = cls._dispatchers.get(loop)
+            if dispatcher is None:
+                dispatcher = cls._dispatchers[loop] = cls(loop)
+            return dispatcher
+
+    def submit(self, calls: List[_Call], stamp: float) -> None:
+        """
+        hand calls to the loop, thread safe
+
+        Args:
+            calls (list): (handler, args, kwargs) of the calls
+            stamp (float): time the calls were fired (time.monotonic())
+        """
+        loop = self._loop()
+        if loop is None:
+            self.dropped += len(calls)
+            return
+        try:
+            loop.call_soon_threadsafe(self._run, calls, stamp)
+        except RuntimeError:
+            # the loop is closed
+            self.dropped += len(calls)
+
+    def _run(self, calls: List[_Call], stamp: float) -> None:
+        age = time.monotonic() - stamp
+        for handler, args, kwargs in calls:
+            if handler.max_age is not None and age > handler.max_age:
+                self.dropped += 1
+            elif handler.concurrent:
+                self.dispatched += 1
+                self._start(handler.fn(*args, **kwargs))
+            else:
+                self._queue.append((handler, args, kwargs, stamp))
+        if self._queue and (self._worker is None or self._worker.done()):
+            self._worker = self._start(self._work())
+
+    def _start(self, coroutine: Coroutine[Any, Any, None]) -> "asyncio.Task[None]":
+        # runs on the loop, from _run or _work
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        # a finished task still references its loop
+        if task is self._worker:
+            self._worker = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("coroutine event handler failed", exc_info=task.exception())
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while queue:
+            handler, args, kwargs, stamp = queue.popleft()
+            if handler.max_age is not None and time.monotonic() - stamp > handler.max_age:
+                self.dropped += 1
+                continue
+            self.dispatched += 1
+            try:
+                await handler.fn(*args, **kwargs)
+            except Exception:
+                logger.exception("coroutine event handler failed")
 
 
-# mypy: disable_error_code="type-arg"
 class Event:
     """
     Base class for the event driven system
     """
 
-    def __init__(self, available=True) -> None:
+    def __init__(self, available: bool = True) -> None:
         """
         initialise event system
         """
-        self._event_handler: List[Callable] = []
+        self._event_handler: List[Callable[..., Any]] = []
         self.available = available
 
-    def subscribe(self, fn: Callable) -> Any:
+    @property
+    def subscribed(self) -> bool:
+        """
+        True if the event has at least one subscription
         """
-        add a event subscription
+        return bool(self._event_handler)
+
+    def subscribe(
+        self,
+        fn: Callable[..., Any],
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        concurrent: bool = False,
+        max_age: Optional[float] = None,
+    ) -> Any:
+        """
+        add a event subscription. ``async def`` functions run on an asyncio loop, the calls of one input report
+        are handed to the loop together
 
         Args:
             fn (function): _description_
+            loop (asyncio.AbstractEventLoop, optional): loop of a coroutine function. Defaults to None (the running loop).
+            concurrent (bool, optional): start every call of a coroutine function as a task instead of awaiting
+                the calls one after another. Defaults to False.
+            max_age (float, optional): drop calls of a coroutine function that are older than this many seconds
+                when the loop gets to them. Defaults to None (never drop).
+
+        Raises:
+            ValueError: Event unavailable
+            Exception: coroutine function without a loop
         """
         if not self.available:
             raise ValueError("Event unavailable")
+        if asyncio.iscoroutinefunction(fn):
+            if loop is None:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    raise Exception("coroutine handlers need a loop, pass one or subscribe from the running loop")
+            fn = _AsyncHandler(fn, AsyncDispatcher.forLoop(loop), concurrent, max_age)
         self._event_handler.append(fn)
         return self
 
-    def unsubscribe(self, fn: Callable) -> Any:
+    def unsubscribe(self, fn: Callable[..., Any]) -> Any:
         """
         delete event subscription fn
 
@@ -38,19 +245,16 @@ class Event:
         self._event_handler.remove(fn)
         return self
 
-    def __iadd__(self, fn: Callable) -> Any:
+    def __iadd__(self, fn: Callable[..., Any]) -> Any:
         """
-        add event subscription fn
+        add event subscription fn, coroutine functions run on the running loop
 
         Args:
             fn (function): _description_
         """
-        if not self.available:
-            raise ValueError("Event unavailable")
-        self._event_handler.append(fn)
-        return self
+        return self.subscribe(fn)
 
-    def __isub__(self, fn: Callable) -> Any:
+    def __isub__(self, fn: Callable[..., Any]) -> Any:
         """
         delete event subscription fn
 
@@ -62,7 +266,7 @@ class Event:
         self._event_handler.remove(fn)
         return self
 
-    def __call__(self, *args, **kwargs) -> None: # type: ignore[arg-type]
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
         """
         calls all event subscription functions
         """
@@ -0,0 +1,205 @@
+import math
+from typing import TYPE_CHECKING
+
+from .enums import Direction
+from .event_system import Event
+
+if TYPE_CHECKING:
+    from .pydualsense import DSTouchpad
+
+# resolution of the touchpad
+TOUCHPAD_WIDTH = 1920
+TOUCHPAD_HEIGHT = 1080
+
+# recognizer modes
+_IDLE = 0
+_ONE_FINGER = 1
+_TWO_FINGERS = 2
+_PINCH = 3
+_SCROLL = 4
+
+
+class TouchGestureRecognizer:
+    """
+    Incremental gesture recognizer for the two touch slots of the touchpad.
+
+    It is fed once per input report and only keeps a fixed set of numbers, events are only fired when a
+    gesture is recognized or changes a step, never for every frame.
+    """
+
+    def __init__(
+        self,
+        tap_time: float = 0.25,
+        tap_distance: int = 40,
+        double_tap_time: float = 0.35,
+        swipe_time: float = 0.6,
+        swipe_distance: int = 300,
+        edge_size: int = 120,
+        pinch_threshold: float = 0.15,
+        pinch_step: float = 0.1,
+        scroll_distance: int = 60,
+        scroll_step: int = 40,
+    ) -> None:
+        """
+        initialise the recognizer, distances are in touchpad units (1920 x 1080)
+
+        Args:
+            tap_time (float, optional): maximum duration of a tap in seconds. Defaults to 0.25.
+            tap_distance (int, optional): maximum movement of a tap. Defaults to 40.
+            double_tap_time (float, optional): maximum time between two taps of a double tap. Defaults to 0.35.
+            swipe_time (float, optional): maximum duration of a swipe in seconds. Defaults to 0.6.
+            swipe_distance (int, optional): minimum movement of a swipe. Defaults to 300.
+            edge_size (int, optional): width of the border where edge swipes start. Defaults to 120.
+            pinch_threshold (float, optional): relative finger distance change that starts a pinch. Defaults to 0.15.
+            pinch_step (float, optional): relative scale change between two pinch events. Defaults to 0.1.
+            scroll_distance (int, optional): movement of both fingers that starts scrolling. Defaults to 60.
+            scroll_step (int, optional): movement between two scroll events. Defaults to 40.
+        """
+        self.tap_time = tap_time
+        self.tap_distance = tap_distance
+        self.double_tap_time = double_tap_time
+        self.swipe_time = swipe_time
+        self.swipe_distance = swipe_distance
+        self.edge_size = edge_size
+        self.pinch_threshold = pinch_threshold
+        self.pinch_step = pinch_step
+        self.scroll_distance = scroll_distance
+        self.scroll_step = scroll_step
+
+        # tap (x, y)
+        self.tap = Event()
+        # double tap (x, y)
+        self.double_tap = Event()
+        # swipe (Direction, dx, dy)
+        self.swipe = Event()
+        # swipe starting at a border (Direction of the border, Direction of the swipe)
+        self.edge_swipe = Event()
+        # pinch (scale since the fingers touched down)
+        self.pinch = Event()
+        # two finger scroll (dx, dy since the last scroll event)
+        self.scroll = Event()
+
+        self._mode = _IDLE
+        self._start_time = 0.0
+        self._start_x = self._start_y = 0
+        self._x = self._y = 0
+        self._moved = False
+        self._start_distance = 0.0
+        self._mid_x = self._mid_y = 0.0
+        self._pinch_level = 0
+        self._last_tap_time = -math.inf
+        self._last_tap_x = self._last_tap_y = 0
+
+    def update(self, touch0: "DSTouchpad", touch1: "DSTouchpad", now: float) -> None:
+        """
+        feed the touch slots of one input report
+
+        Args:
+            touch0 (DSTouchpad): first touch slot
+            touch1 (DSTouchpad): second touch slot
+            now (float): time of the report in seconds
+        """
+        active0, active1 = touch0.isActive, touch1.isActive
+        mode = self._mode
+
+        if active0 and active1:
+            if mode in (_IDLE, _ONE_FINGER):
+                self._beginTwoFingers(touch0, touch1, now)
+            else:
+                self._updateTwoFingers(touch0, touch1)
+        elif active0 or active1:
+            touch = touch0 if active0 else touch1
+            if mode == _IDLE:
+                self._mode = _ONE_FINGER
+                self._start_time = now
+                self._start_x = self._x = touch.X
+                self._start_y = self._y = touch.Y
+                self._moved = False
+            elif mode == _ONE_FINGER:
+                self._x, self._y = touch.X, touch.Y
+                if not self._moved and (
+                    abs(self._x - self._start_x) > self.tap_distance or abs(self._y - self._start_y) > self.tap_distance
+                ):
+                    self._moved = True
+            # lifting one of two fingers keeps the two finger gesture until all fingers are released
+        elif mode != _IDLE:
+            if mode == _ONE_FINGER:
+                self._endOneFinger(now)
+            self._mode = _IDLE
+
+    def _beginTwoFingers(self, touch0: "DSTouchpad", touch1: "DSTouchpad", now: float) -> None:
+        self._mode = _TWO_FINGERS
+        self._start_time = now
+        self._start_distance = max(math.hypot(touch1.X - touch0.X, touch1.Y - touch0.Y), 1.0)
+        self._mid_x = (touch0.X + touch1.X) / 2
+        self._mid_y = (touch0.Y + touch1.Y) / 2
+        self._pinch_level = 0
+
+    def _updateTwoFingers(self, touch0: "DSTouchpad", touch1: "DSTouchpad") -> None:
+        mid_x = (touch0.X + touch1.X) / 2
+        mid_y = (touch0.Y + touch1.Y) / 2
+        dx, dy = mid_x - self._mid_x, mid_y - self._mid_y
+
+        if self._mode == _SCROLL:
+            if abs(dx) >= self.scroll_step or abs(dy) >= self.scroll_step:
+                self._mid_x, self._mid_y = mid_x, mid_y
+                self.scroll(dx, dy)
+            return
+
+        scale = math.hypot(touch1.X - touch0.X, touch1.Y - touch0.Y) / self._start_distance
+        if self._mode == _PINCH:
+            level = int(math.log(scale) / math.log(1 + self.pinch_step)) if scale > 0 else self._pinch_level
+            if level != self._pinch_level:
+                self._pinch_level = level
+                self.pinch(scale)
+        elif abs(scale - 1) > self.pinch_threshold:
+            self._mode = _PINCH
+            self.pinch(scale)
+        elif abs(dx) > self.scroll_distance or abs(dy) > self.scroll_distance:
+            self._mode = _SCROLL
+            self._mid_x, self._mid_y = mid_x, mid_y
+            self.scroll(dx, dy)
+
+    def _endOneFinger(self, now: float) -> None:
+        duration = now - self._start_time
+        x, y = self._x, self._y
+
+        if not self._moved:
+            if duration > self.tap_time:
+                return
+            if (
+                now - self._last_tap_time <= self.double_tap_time
+                and abs(x - self._last_tap_x) <= self.tap_distance
+                and abs(y - self._last_tap_y) <= self.tap_distance
+            ):
+                self._last_tap_time = -math.inf
+                self.double_tap(x, y)
+            else:
+                self._last_tap_time = now
+                self._last_tap_x, self._last_tap_y = x, y
+                self.tap(x, y)
+            return
+
+        dx, dy = x - self._start_x, y - self._start_y
+        if duration > self.swipe_time or max(abs(dx), abs(dy)) < self.swipe_distance:
+            return
+
+        if abs(dx) >= abs(dy):
+            direction = Direction.Right if dx > 0 else Direction.Left
+        else:
+            direction = Direction.Down if dy > 0 else Direction.Up
+
+        edge = None
+        if direction is Direction.Right and self._start_x < self.edge_size:
+            edge = Direction.Left
+        elif direction is Direction.Left and self._start_x > TOUCHPAD_WIDTH - self.edge_size:
+            edge = Direction.Right
+        elif direction is Direction.Down and self._start_y < self.edge_size:
+            edge = Direction.Up
+        elif direction is Direction.Up and self._start_y > TOUCHPAD_HEIGHT - self.edge_size:
+            edge = Direction.Down
+
+        if edge is not None:
+            self.edge_swipe(edge, direction)
+        else:
+            self.swipe(direction, dx, dy)
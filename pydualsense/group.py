@@ -0,0 +1,279 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .checksum import compute
+from .effects import EffectPlayer
+from .enums import ConnectionType
+from .pydualsense import DSAudio, DSLight, DSTrigger, pydualsense
+
+# output report offsets (USB layout) of the settings that can be overridden per member
+OVERRIDE_FIELDS = {
+    "rightMotor": (3,),
+    "leftMotor": (4,),
+    "microphone_led": (9,),
+    "ledOption": (39,),
+    "pulseOptions": (42,),
+    "brightness": (43,),
+    "playerNumber": (44,),
+    "color": (45, 46, 47),
+}
+
+_REPORT_LENGTHS = {ConnectionType.USB: 64, ConnectionType.BT: 78}
+
+
+class _Encoder:
+    """
+    the output settings of a group in the shape :func:`pydualsense.prepareReport` reads them, for one connection type
+    """
+
+    OUTPUT_REPORT_USB = pydualsense.OUTPUT_REPORT_USB
+    OUTPUT_REPORT_BT = pydualsense.OUTPUT_REPORT_BT
+
+    def __init__(self, group: "ControllerGroup", con_type: ConnectionType) -> None:
+        self.group = group
+        self.conType = con_type
+        self.output_report_length = _REPORT_LENGTHS[con_type]
+        self.verbose = False
+        self.light = group.light
+        self.audio = group.audio
+        self.triggerL = group.triggerL
+        self.triggerR = group.triggerR
+        self.effects = group.effects
+
+    @property
+    def leftMotor(self) -> int:
+        return self.group.leftMotor
+
+    @property
+    def rightMotor(self) -> int:
+        return self.group.rightMotor
+
+
+class ControllerGroup:
+    """
+    Sends the same light, trigger, audio and rumble settings to many controllers.
+
+    The output report is built once per connection type and pass, members with overrides get a copy with their
+    bytes patched (and a new checksum on bluetooth). Each member keeps its own output scheduler, so unchanged
+    reports are only repeated for the keepalive. While a controller is a member its own output settings are
+    not sent, removing it from the group sends them again.
+    """
+
+    def __init__(self, controllers: Iterable[pydualsense] = (), rate: float = 250.0) -> None:
+        """
+        create the group and start sending
+
+        Args:
+            controllers (list, optional): initialized controllers. Defaults to ().
+            rate (float, optional): output passes per second, 0 starts no thread and :meth:`flush` has to be
+                called after changes. Defaults to 250.0.
+        """
+        self.light = DSLight()
+        self.audio = DSAudio()
+        self.triggerL = DSTrigger()
+        self.triggerR = DSTrigger()
+        self.leftMotor = 0
+        self.rightMotor = 0
+        self.effects = EffectPlayer()
+
+        self.passes = 0  # output passes
+        self.encodes = 0  # shared reports built
+        self.writes = 0  # reports written to members
+
+        self._members: Tuple[pydualsense, ...] = ()
+        # member -> (usb offset, value) patches
+        self._overrides: Dict[pydualsense, Tuple[Tuple[int, int], ...]] = {}
+        self._encoders = {con_type: _Encoder(self, con_type) for con_type in _REPORT_LENGTHS}
+        self._lock = threading.Lock()
+
+        for ds in controllers:
+            self.add(ds)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if rate > 0:
+            self._interval = 1.0 / rate
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    @property
+    def members(self) -> Tuple[pydualsense, ...]:
+        """controllers in the group"""
+        return self._members
+
+    def add(self, ds: pydualsense) -> None:
+        """
+        add a controller, its output is sent by the group from the next pass on
+
+        Args:
+            ds (pydualsense): initialized controller
+
+        Raises:
+            Exception: the controller is already in a group
+        """
+        if ds.output_group is not None:
+            raise Exception("controller is already in a group")
+        with self._lock:
+            ds.output_group = self
+            ds.output_scheduler.reset()
+            self._members = (*self._members, ds)
+
+    def remove(self, ds: pydualsense) -> None:
+        """
+        remove a controller, its own output settings are sent again
+
+        Args:
+            ds (pydualsense): member of the group
+        """
+        with self._lock:
+            if ds not in self._members:
+                return
+            self._members = tuple(member for member in self._members if member is not ds)
+            self._overrides.pop(ds, None)
+            ds.output_scheduler.reset()
+            ds.output_group = None
+
+    def setOverride(self, ds: pydualsense, **fields: object) -> None:
+        """
+        send different values to one member, e.g. ``setOverride(ds, color=(255, 0, 0), playerNumber=PlayerID.PLAYER_1)``.
+        Overrides replace the previous overrides of the member.
+
+        Args:
+            ds (pydualsense): member of the group
+            **fields: values by name, see :data:`OVERRIDE_FIELDS`. ``color`` is an (r, g, b) tuple, the others ints or enums.
+
+        Raises:
+            Exception: not a member, unknown field or value out of bounds
+        """
+        if ds not in self._members:
+            raise Exception("controller is not in the group")
+        patches: List[Tuple[int, int]] = []
+        for name, value in fields.items():
+            offsets = OVERRIDE_FIELDS.get(name)
+            if offsets is None:
+                raise Exception(f"unknown override {name}")
+            values = tuple(value) if isinstance(value, (tuple, list)) else (value,)
+            if len(values) != len(offsets) or not all(0 <= int(part) <= 255 for part in values):
+                raise Exception(f"override {name} needs {len(offsets)} value(s) in the range 0..255")
+            patches.extend((offset, int(part)) for offset, part in zip(offsets, values))
+        with self._lock:
+            self._overrides[ds] = tuple(patches)
+
+    def clearOverride(self, ds: pydualsense) -> None:
+        """
+        send the shared values to a member again
+
+        Args:
+            ds (pydualsense): member of the group
+        """
+        with self._lock:
+            self._overrides.pop(ds, None)
+
+    def setLeftMotor(self, intensity: int) -> None:
+        """
+        set left motor rumble of all members
+
+        Args:
+            intensity (int): rumble intensity 0..255
+
+        Raises:
+            TypeError: intensity false type
+            Exception: intensity out of bounds 0..255
+        """
+        if not isinstance(intensity, int):
+            raise TypeError("left motor intensity needs to be an int")
+        if intensity > 255 or intensity < 0:
+            raise Exception("maximum intensity is 255")
+        self.leftMotor = intensity
+
+    def setRightMotor(self, intensity: int) -> None:
+        """
+        set right motor rumble of all members
+
+        Args:
+            intensity (int): rumble intensity 0..255
+
+        Raises:
+            TypeError: intensity false type
+            Exception: intensity out of bounds 0..255
+        """
+        if not isinstance(intensity, int):
+            raise TypeError("right motor intensity needs to be an int")
+        if intensity > 255 or intensity < 0:
+            raise Exception("maximum intensity is 255")
+        self.rightMotor = intensity
+
+    @staticmethod
+    def _patch(report: List[int], con_type: ConnectionType, patches: Tuple[Tuple[int, int], ...]) -> List[int]:
+        report = list(report)
+        shift = 1 if con_type == ConnectionType.BT else 0
+        for offset, value in patches:
+            report[offset + shift] = value
+        if shift:
+            report[74:78] = compute(report).to_bytes(4, "little")
+        return report
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """
+        one output pass: build the shared reports and write them to the members that are due
+
+        Args:
+            now (float, optional): monotonic time. Defaults to None (now).
+
+        Returns:
+            int: number of written reports
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            members, overrides = self._members, dict(self._overrides)
+        # report and payload per connection type, and per connection type and overrides
+        shared: Dict[ConnectionType, Tuple[List[int], bytes]] = {}
+        patched: Dict[Tuple[ConnectionType, Tuple[Tuple[int, int], ...]], Tuple[List[int], bytes]] = {}
+        written = 0
+        for ds in members:
+            if not ds.connected:
+                continue
+            conType = ds.conType
+            encoded = shared.get(conType)
+            if encoded is None:
+                report = pydualsense.prepareReport(self._encoders[conType])  # type: ignore[arg-type]
+                encoded = shared[conType] = (report, bytes(report))
+                self.encodes += 1
+            patches = overrides.get(ds)
+            if patches:
+                # members with the same overrides share the patched report as well
+                key = (conType, patches)
+                base = encoded
+                encoded = patched.get(key)
+                if encoded is None:
+                    report = self._patch(base[0], conType, patches)
+                    encoded = patched[key] = (report, bytes(report))
+            if ds.output_scheduler.submit(encoded[0], now):
+                try:
+                    ds.device.write(encoded[1])
+                except OSError:
+                    # the report thread of the member notices the lost connection
+                    continue
+                written += 1
+        self.passes += 1
+        self.writes += written
+        return written
+
+    def _run(self) -> None:
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            self.flush()
+            deadline = max(deadline + self._interval, time.monotonic())
+            self._stop.wait(deadline - time.monotonic())
+
+    def close(self) -> None:
+        """
+        stop sending and remove all members, they send their own output settings again
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for ds in tuple(self._members):
+            self.remove(ds)
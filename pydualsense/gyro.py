@@ -0,0 +1,304 @@
+import math
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .constants import ACCEL_RES_PER_G, GYRO_RES_PER_DEG_S, TIMESTAMP_RES
+from .enums import GyroSmoothing
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+# larger gaps between two samples (reconnects, short reports without motion data) restart the filters
+MAX_DT = 0.1
+
+
+def _alpha(dt: float, cutoff: float) -> float:
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One Euro filter, a low pass filter whose cutoff frequency rises with the speed of the signal.
+    Slow movements are smoothed strongly while fast movements keep a low latency.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0) -> None:
+        """
+        initialise the filter
+
+        Args:
+            min_cutoff (float, optional): cutoff frequency in Hz at rest. Defaults to 1.0.
+            beta (float, optional): increase of the cutoff frequency with the speed. Defaults to 0.0.
+            d_cutoff (float, optional): cutoff frequency of the speed estimation in Hz. Defaults to 1.0.
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        forget the filtered signal, the next sample passes unfiltered
+        """
+        self._first = True
+        self._value = 0.0
+        self._derivative = 0.0
+
+    def __call__(self, value: float, dt: float) -> float:
+        """
+        filter one sample
+
+        Args:
+            value (float): new sample
+            dt (float): time since the last sample in seconds
+
+        Returns:
+            float: filtered value
+        """
+        if self._first:
+            self._first = False
+            self._value = value
+            return value
+
+        self._derivative += _alpha(dt, self.d_cutoff) * ((value - self._value) / dt - self._derivative)
+        cutoff = self.min_cutoff + self.beta * abs(self._derivative)
+        self._value += _alpha(dt, cutoff) * (value - self._value)
+        return self._value
+
+
+class TieredSmoother:
+    """
+    Soft tiered smoothing: samples below ``lower`` are averaged over the last ``window`` samples, samples
+    above ``upper`` pass directly and samples in between are blended. Small jitter is removed without
+    adding latency to fast movements.
+    """
+
+    def __init__(self, lower: float = 2.0, upper: float = 6.0, window: int = 8) -> None:
+        """
+        initialise the smoother
+
+        Args:
+            lower (float, optional): speed in degree/s up to which samples are fully smoothed. Defaults to 2.0.
+            upper (float, optional): speed in degree/s from which samples are not smoothed. Defaults to 6.0.
+            window (int, optional): number of averaged samples. Defaults to 8.
+
+        Raises:
+            Exception: invalid thresholds or window
+        """
+        if not 0 <= lower < upper:
+            raise Exception("thresholds need to satisfy 0 <= lower < upper")
+        if window < 1:
+            raise Exception("window needs to be at least 1")
+        self.lower = lower
+        self.upper = upper
+        self._buffer = [0.0] * window
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        clear the averaged samples
+        """
+        for index in range(len(self._buffer)):
+            self._buffer[index] = 0.0
+        self._index = 0
+        self._sum = 0.0
+
+    def __call__(self, value: float, speed: float) -> float:
+        """
+        smooth one sample
+
+        Args:
+            value (float): new sample
+            speed (float): speed deciding the amount of smoothing, e.g. the magnitude of the movement
+
+        Returns:
+            float: smoothed value
+        """
+        direct = min(max((speed - self.lower) / (self.upper - self.lower), 0.0), 1.0)
+        smoothed = value * (1.0 - direct)
+
+        buffer = self._buffer
+        index = self._index
+        self._sum += smoothed - buffer[index]
+        buffer[index] = smoothed
+        self._index = (index + 1) % len(buffer)
+        return value * direct + self._sum / len(buffer)
+
+
+class GyroPointer:
+    """
+    Turns the gyro of a controller into pointer movement.
+
+    Every report is filtered incrementally: the gyro bias is tracked while the controller lies still, the
+    speed is smoothed with a One Euro filter or tiered smoothing and scaled by a sensitivity curve. The time
+    between two samples is taken from the sensor timestamp of the controller.
+    """
+
+    def __init__(
+        self,
+        ds: "pydualsense",
+        sensitivity: float = 10.0,
+        max_sensitivity: Optional[float] = None,
+        acceleration_start: float = 0.0,
+        acceleration_end: float = 100.0,
+        smoothing: GyroSmoothing = GyroSmoothing.OneEuro,
+        min_cutoff: float = 1.0,
+        beta: float = 0.05,
+        tier_lower: float = 2.0,
+        tier_upper: float = 6.0,
+        tier_window: int = 8,
+        still_threshold: float = 3.0,
+        still_time: float = 0.5,
+        bias_time: float = 2.0,
+        invert_x: bool = False,
+        invert_y: bool = False,
+    ) -> None:
+        """
+        initialise the filter stage and start processing the reports of the controller
+
+        Args:
+            ds (pydualsense): initialized controller
+            sensitivity (float, optional): pointer units per degree at low speed. Defaults to 10.0.
+            max_sensitivity (float, optional): pointer units per degree from ``acceleration_end`` on. Defaults to None (no acceleration).
+            acceleration_start (float, optional): speed in degree/s where the acceleration starts. Defaults to 0.0.
+            acceleration_end (float, optional): speed in degree/s where ``max_sensitivity`` is reached. Defaults to 100.0.
+            smoothing (GyroSmoothing, optional): smoothing of the speed. Defaults to GyroSmoothing.OneEuro.
+            min_cutoff (float, optional): One Euro cutoff frequency at rest. Defaults to 1.0.
+            beta (float, optional): One Euro speed coefficient. Defaults to 0.05.
+            tier_lower (float, optional): tiered smoothing lower threshold in degree/s. Defaults to 2.0.
+            tier_upper (float, optional): tiered smoothing upper threshold in degree/s. Defaults to 6.0.
+            tier_window (int, optional): tiered smoothing window in samples. Defaults to 8.
+            still_threshold (float, optional): speed in degree/s below which the controller counts as still. Defaults to 3.0.
+            still_time (float, optional): seconds the controller has to be still before the bias is tracked. Defaults to 0.5.
+            bias_time (float, optional): time constant of the bias tracking in seconds. Defaults to 2.0.
+            invert_x (bool, optional): invert the horizontal movement. Defaults to False.
+            invert_y (bool, optional): invert the vertical movement. Defaults to False.
+
+        Raises:
+            TypeError: smoothing false type
+        """
+        if not isinstance(smoothing, GyroSmoothing):
+            raise TypeError("smoothing needs to be of type GyroSmoothing")
+
+        self.ds = ds
+        self.sensitivity = sensitivity
+        self.max_sensitivity = sensitivity if max_sensitivity is None else max_sensitivity
+        self.acceleration_start = acceleration_start
+        self.acceleration_end = acceleration_end
+        self.smoothing = smoothing
+        self.still_threshold = still_threshold
+        self.still_time = still_time
+        self.bias_time = bias_time
+        self.invert_x = invert_x
+        self.invert_y = invert_y
+
+        self._euro_x = OneEuroFilter(min_cutoff, beta)
+        self._euro_y = OneEuroFilter(min_cutoff, beta)
+        self._tier_x = TieredSmoother(tier_lower, tier_upper, tier_window)
+        self._tier_y = TieredSmoother(tier_lower, tier_upper, tier_window)
+
+        # gyro bias in degree/s (pitch, yaw, roll)
+        self.bias_pitch = self.bias_yaw = self.bias_roll = 0.0
+        # filtered speed in degree/s
+        self.speed_x = self.speed_y = 0.0
+        # pointer movement of the last report
+        self.dx = self.dy = 0.0
+        self.samples = 0
+
+        self._last_timestamp = -1
+        self._still = 0.0
+        self._accel = (0, 0, 0)
+        self._pending_x = self._pending_y = 0.0
+
+        ds.addReportHook(self.update)
+
+    def reset(self) -> None:
+        """
+        restart the filters and forget the pending movement, the bias is kept
+        """
+        self._euro_x.reset()
+        self._euro_y.reset()
+        self._tier_x.reset()
+        self._tier_y.reset()
+        self._last_timestamp = -1
+        self._still = 0.0
+        self._pending_x = self._pending_y = 0.0
+        self.speed_x = self.speed_y = self.dx = self.dy = 0.0
+
+    def update(self, ds: "pydualsense") -> None:
+        """
+        report hook, filters the gyro sample of the current report
+
+        Args:
+            ds (pydualsense): controller that received the report
+        """
+        state = ds.state
+        timestamp = state.sensorTimestamp
+        last = self._last_timestamp
+        self._last_timestamp = timestamp
+        if last < 0 or timestamp == last:
+            return
+        dt = ((timestamp - last) & 0xFFFFFFFF) / TIMESTAMP_RES
+        if dt > MAX_DT:
+            self.reset()
+            self._last_timestamp = timestamp
+            return
+
+        gyro = state.gyro
+        pitch = gyro.Pitch / GYRO_RES_PER_DEG_S - self.bias_pitch
+        yaw = gyro.Yaw / GYRO_RES_PER_DEG_S - self.bias_yaw
+        roll = gyro.Roll / GYRO_RES_PER_DEG_S - self.bias_roll
+
+        # bias tracking while neither the rotation nor the acceleration changes
+        accel = state.accelerometer
+        last_x, last_y, last_z = self._accel
+        self._accel = (accel.X, accel.Y, accel.Z)
+        shaken = abs(accel.X - last_x) + abs(accel.Y - last_y) + abs(accel.Z - last_z) > ACCEL_RES_PER_G // 20
+        if shaken or abs(pitch) + abs(yaw) + abs(roll) > self.still_threshold:
+            self._still = 0.0
+        else:
+            self._still += dt
+            if self._still >= self.still_time:
+                rate = min(dt / self.bias_time, 1.0)
+                self.bias_pitch += pitch * rate
+                self.bias_yaw += yaw * rate
+                self.bias_roll += roll * rate
+
+        # yaw turns the pointer horizontally, pitch vertically
+        x = -yaw if self.invert_x else yaw
+        y = pitch if self.invert_y else -pitch
+        speed = math.hypot(x, y)
+        if self.smoothing == GyroSmoothing.OneEuro:
+            x, y = self._euro_x(x, dt), self._euro_y(y, dt)
+        elif self.smoothing == GyroSmoothing.Tiered:
+            x, y = self._tier_x(x, speed), self._tier_y(y, speed)
+        self.speed_x, self.speed_y = x, y
+
+        sensitivity = self.sensitivity
+        if self.max_sensitivity != sensitivity and self.acceleration_end > self.acceleration_start:
+            ratio = (speed - self.acceleration_start) / (self.acceleration_end - self.acceleration_start)
+            sensitivity += (self.max_sensitivity - sensitivity) * min(max(ratio, 0.0), 1.0)
+
+        self.dx = x * dt * sensitivity
+        self.dy = y * dt * sensitivity
+        self._pending_x += self.dx
+        self._pending_y += self.dy
+        self.samples += 1
+
+    def consume(self) -> Tuple[int, int]:
+        """
+        whole pointer units moved since the last call, the fractional rest is kept for the next call
+
+        Returns:
+            tuple: movement (dx, dy)
+        """
+        dx, dy = int(self._pending_x), int(self._pending_y)
+        self._pending_x -= dx
+        self._pending_y -= dy
+        return dx, dy
+
+    def close(self) -> None:
+        """
+        stop processing reports
+        """
+        self.ds.removeReportHook(self.update)
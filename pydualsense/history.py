@@ -0,0 +1,222 @@
+import math
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, cast
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+# column name -> array typecode
+COLUMNS = (
+    ("time", "d"),  # host time of the report, time.monotonic()
+    ("timestamp", "I"),  # sensor timestamp in 1/3 microseconds
+    ("buttons", "I"),  # Button bits
+    ("LX", "b"),
+    ("LY", "b"),
+    ("RX", "b"),
+    ("RY", "b"),
+    ("L2", "B"),
+    ("R2", "B"),
+    ("pitch", "h"),
+    ("yaw", "h"),
+    ("roll", "h"),
+    ("accel_x", "h"),
+    ("accel_y", "h"),
+    ("accel_z", "h"),
+    ("touch0_active", "B"),
+    ("touch0_x", "H"),
+    ("touch0_y", "H"),
+    ("touch1_active", "B"),
+    ("touch1_x", "H"),
+    ("touch1_y", "H"),
+    ("battery", "B"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+
+def _numpy() -> Any:
+    """
+    numpy module if it is installed, otherwise None
+    """
+    try:
+        # optional, pydualsense[numpy]. The ignore is unused where numpy is installed
+        import numpy  # type: ignore[import-not-found, unused-ignore]
+    except ImportError:
+        return None
+    return numpy
+
+
+class InputHistory:
+    """
+    Circular buffer of the decoded reports of a controller, stored column by column in preallocated arrays.
+
+    The memory is fixed by ``retention * max_rate`` reports, older reports are overwritten. Queries return
+    NumPy arrays when NumPy is installed (views into the buffer unless the range wraps around), otherwise
+    ``array.array`` copies of the range. Views keep following the buffer, copy them if the reports have to
+    survive longer than the retention.
+    """
+
+    def __init__(self, retention: float = 10.0, max_rate: float = 1000.0) -> None:
+        """
+        allocate the columns
+
+        Args:
+            retention (float, optional): seconds of reports to keep. Defaults to 10.0.
+            max_rate (float, optional): highest expected report rate in Hz, sizes the buffer. Defaults to 1000.0.
+
+        Raises:
+            Exception: retention or max_rate not positive
+        """
+        if retention <= 0 or max_rate <= 0:
+            raise Exception("retention and max_rate need to be positive")
+        self.retention = retention
+        self.capacity = math.ceil(retention * max_rate)
+        # one spare slot, the report being written is never part of a query from another thread
+        self._size = self.capacity + 1
+        self.columns: Dict[str, array[Any]] = {
+            name: array(typecode, bytes(array(typecode).itemsize * self._size)) for name, typecode in COLUMNS
+        }
+        self._next = 0  # slot of the next report
+        self._count = 0
+        self.total = 0  # reports recorded since the last clear
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """
+        drop all reports
+        """
+        self._next = 0
+        self._count = 0
+        self.total = 0
+
+    def record(self, ds: "pydualsense") -> None:
+        """
+        report hook, appends the current report
+
+        Args:
+            ds (pydualsense): controller that received the report
+        """
+        state = ds.state
+        columns = self.columns
+        index = self._next
+        columns["time"][index] = time.monotonic()
+        columns["timestamp"][index] = state.sensorTimestamp
+        columns["buttons"][index] = state.buttons
+        columns["LX"][index] = state.LX
+        columns["LY"][index] = state.LY
+        columns["RX"][index] = state.RX
+        columns["RY"][index] = state.RY
+        columns["L2"][index] = state.L2_value
+        columns["R2"][index] = state.R2_value
+        gyro, accel = state.gyro, state.accelerometer
+        columns["pitch"][index] = gyro.Pitch
+        columns["yaw"][index] = gyro.Yaw
+        columns["roll"][index] = gyro.Roll
+        columns["accel_x"][index] = accel.X
+        columns["accel_y"][index] = accel.Y
+        columns["accel_z"][index] = accel.Z
+        touch0, touch1 = state.trackPadTouch0, state.trackPadTouch1
+        columns["touch0_active"][index] = touch0.isActive
+        columns["touch0_x"][index] = touch0.X
+        columns["touch0_y"][index] = touch0.Y
+        columns["touch1_active"][index] = touch1.isActive
+        columns["touch1_x"][index] = touch1.X
+        columns["touch1_y"][index] = touch1.Y
+        columns["battery"][index] = ds.battery.Level
+
+        self._next = index + 1 if index + 1 < self._size else 0
+        if self._count < self.capacity:
+            self._count += 1
+        self.total += 1
+
+    def _slot(self, position: int) -> int:
+        """
+        slot of the n-th oldest report
+        """
+        return (self._next - self._count + position) % self._size
+
+    def _bisect(self, when: float) -> int:
+        """
+        position of the first report at or after a time
+        """
+        times = self.columns["time"]
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if times[self._slot(middle)] < when:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def span(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[int, int]:
+        """
+        positions of the reports in a time range, position 0 is the oldest stored report
+
+        Args:
+            start (float, optional): first time (time.monotonic()), inclusive. Defaults to None (oldest report).
+            end (float, optional): last time, exclusive. Defaults to None (newest report).
+
+        Returns:
+            tuple: first and last position, exclusive
+        """
+        first = 0 if start is None else self._bisect(start)
+        last = self._count if end is None else self._bisect(end)
+        return first, max(first, last)
+
+    def column(self, name: str, first: int = 0, last: Optional[int] = None) -> Sequence[Any]:
+        """
+        values of one column between two positions
+
+        Args:
+            name (str): column name, see :data:`COLUMN_NAMES`
+            first (int, optional): first position. Defaults to 0.
+            last (int, optional): last position, exclusive. Defaults to None (newest report).
+
+        Raises:
+            Exception: unknown column
+
+        Returns:
+            numpy.ndarray or array.array: the values, oldest first
+        """
+        if name not in self.columns:
+            raise Exception(f"unknown history column {name}")
+        if last is None:
+            last = self._count
+        data = self.columns[name]
+        begin = self._slot(first)
+        length = last - first
+        numpy = _numpy()
+
+        if length <= 0:
+            return numpy.frombuffer(data, dtype=data.typecode, count=0) if numpy is not None else array(data.typecode)
+        if begin + length <= self._size:
+            if numpy is not None:
+                view = numpy.frombuffer(data, dtype=data.typecode, count=length, offset=begin * data.itemsize)
+                return cast("Sequence[Any]", view)
+            return data[begin:begin + length]
+        # the range wraps around the end of the buffer
+        split = self._size - begin
+        if numpy is not None:
+            values = numpy.frombuffer(data, dtype=data.typecode)
+            return cast("Sequence[Any]", numpy.concatenate((values[begin:], values[:length - split])))
+        return data[begin:] + data[:length - split]
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Dict[str, Sequence[Any]]:
+        """
+        all columns of the last seconds
+
+        Args:
+            seconds (float): length of the window
+            now (float, optional): end of the window (time.monotonic()). Defaults to None (now).
+
+        Returns:
+            dict: column name -> values, see :meth:`column`
+        """
+        if now is None:
+            first, last = self.span(time.monotonic() - seconds)
+        else:
+            first, last = self.span(now - seconds, now)
+        return {name: self.column(name, first, last) for name in COLUMN_NAMES}
@@ -0,0 +1,194 @@
+import logging
+import select
+import socket
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Union
+
+import hidapi  # type: ignore[import]
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+logger = logging.getLogger(__name__)
+
+SONY_VENDOR_ID = 0x054C
+DUALSENSE_PRODUCT_IDS = (0x0CE6, 0x0DF2)
+
+NETLINK_KOBJECT_UEVENT = 15
+# multicast group of the kernel uevents (udev uses group 2)
+UEVENT_KERNEL_GROUP = 1
+
+
+class PollingSource:
+    """
+    Hot-plug event source that enumerates the HID devices, works on every platform
+    """
+
+    def __init__(self, interval: float = 1.0) -> None:
+        """
+        Args:
+            interval (float, optional): seconds between two enumerations. Defaults to 1.0.
+        """
+        self.interval = interval
+
+    def wait(self, timeout: float) -> bool:
+        """
+        wait until a DualSense is connected
+
+        Args:
+            timeout (float): longest wait in seconds
+
+        Returns:
+            bool: True if a DualSense is connected, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            devices = hidapi.enumerate(vendor_id=SONY_VENDOR_ID)
+            if any(device.product_id in DUALSENSE_PRODUCT_IDS for device in devices):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class UEventSource:
+    """
+    Hot-plug event source listening to the kernel uevents of new hidraw devices over netlink (Linux only)
+    """
+
+    def __init__(self) -> None:
+        """
+        open the netlink socket
+
+        Raises:
+            OSError: netlink is not available
+        """
+        self.socket = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT
+        )
+        self.socket.bind((0, UEVENT_KERNEL_GROUP))
+
+    def wait(self, timeout: float) -> bool:
+        """
+        wait until a hidraw device is added
+
+        Args:
+            timeout (float): longest wait in seconds
+
+        Returns:
+            bool: True if a hidraw device was added, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        added = False
+        while not added:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.socket], [], [], remaining)[0]:
+                return False
+            try:
+                # messages look like "add@/devices/...\0ACTION=add\0SUBSYSTEM=hidraw\0..."
+                fields = self.socket.recv(8192).split(b"\0")
+            except OSError:
+                # receive buffer overrun, events were lost
+                return True
+            added = fields[0].startswith(b"add@") and b"SUBSYSTEM=hidraw" in fields
+        return True
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+def default_source() -> Union[PollingSource, UEventSource]:
+    """
+    netlink uevents on Linux, enumeration polling everywhere else or if netlink is not available
+
+    Returns:
+        UEventSource or PollingSource: the event source
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return UEventSource()
+        except OSError as error:
+            logger.debug("netlink uevents not available, polling instead: %s", error)
+    return PollingSource()
+
+
+class HotplugWatcher:
+    """
+    Reconnects a controller after its connection was lost, e.g. when a bluetooth controller went to sleep
+    or the cable was unplugged. The same :class:`pydualsense` instance is reopened, so all event subscriptions
+    and output settings are kept.
+
+    The event source only needs a ``wait(timeout) -> bool`` method returning True when a device may have
+    been connected and a ``close()`` method, so it can be replaced for tests without hardware.
+    """
+
+    def __init__(
+        self, ds: "pydualsense", source: Optional[object] = None, retry_interval: float = 0.5, attempts: int = 5
+    ) -> None:
+        """
+        start watching the controller
+
+        Args:
+            ds (pydualsense): initialized controller
+            source (object, optional): hot-plug event source. Defaults to None (:func:`default_source`).
+            retry_interval (float, optional): seconds between two reconnect attempts after an event. Defaults to 0.5.
+            attempts (int, optional): reconnect attempts after an event, the device node may not be
+                accessible right away. Defaults to 5.
+        """
+        self.ds = ds
+        self.source = default_source() if source is None else source
+        self.retry_interval = retry_interval
+        self.attempts = attempts
+
+        self._lost = threading.Event()
+        self._stop = threading.Event()
+        ds.connection_changed += self._connectionChanged
+        if not ds.connected:
+            self._lost.set()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _connectionChanged(self, connected: bool) -> None:
+        if not connected:
+            self._lost.set()
+
+    def _run(self) -> None:
+        # the connection may only have dropped for a moment, try once before waiting for an event
+        pending = self.attempts
+        while not self._stop.is_set():
+            if not self._lost.wait(0.25):
+                continue
+            if not pending:
+                if self.source.wait(self.retry_interval):  # type: ignore[attr-defined]
+                    pending = self.attempts
+                continue
+
+            # cleared first, the new connection may be lost again right away
+            self._lost.clear()
+            try:
+                self.ds.reconnect()
+            except Exception as error:
+                logger.debug("reconnect failed: %s", error)
+                self._lost.set()
+                pending -= 1
+                if pending:
+                    self._stop.wait(self.retry_interval)
+            else:
+                logger.info("controller reconnected after %.2f s", self.ds.stats.reconnect_latency)
+                pending = self.attempts
+
+    def close(self) -> None:
+        """
+        stop watching and close the event source
+        """
+        self.ds.connection_changed -= self._connectionChanged
+        self._stop.set()
+        self._thread.join()
+        self.source.close()  # type: ignore[attr-defined]
@@ -0,0 +1,174 @@
+import json
+import os
+import struct
+import threading
+from typing import Any, Dict, Optional
+
+FEATURE_REPORT_CALIBRATION = 0x05
+FEATURE_REPORT_PAIRING_INFO = 0x09
+FEATURE_REPORT_FIRMWARE_INFO = 0x20
+
+# length of the feature reports including the report id
+FEATURE_REPORT_LENGTHS = {
+    FEATURE_REPORT_CALIBRATION: 41,
+    FEATURE_REPORT_PAIRING_INFO: 20,
+    FEATURE_REPORT_FIRMWARE_INFO: 64,
+}
+
+# names of the int16 values of the calibration report
+CALIBRATION_FIELDS = (
+    "gyro_pitch_bias", "gyro_yaw_bias", "gyro_roll_bias",
+    "gyro_pitch_plus", "gyro_pitch_minus", "gyro_yaw_plus", "gyro_yaw_minus", "gyro_roll_plus", "gyro_roll_minus",
+    "gyro_speed_plus", "gyro_speed_minus",
+    "acc_x_plus", "acc_x_minus", "acc_y_plus", "acc_y_minus", "acc_z_plus", "acc_z_minus",
+)
+_CALIBRATION = struct.Struct("<17h")
+
+# feature reports of every controller read in this process, by serial number or path
+_cache: Dict[str, Dict[int, bytes]] = {}
+_cache_lock = threading.Lock()
+
+
+class DSInfo:
+    """
+    Identity and version information of a controller.
+
+    The feature reports are read from the controller on first access and cached in memory for the
+    process, a reconnect or a second instance for the same controller does not read them again.
+    With ``cache_file`` the reports are also kept in a JSON file between runs.
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        serial: Optional[str] = None,
+        path: Optional[str] = None,
+        is_edge: bool = False,
+        cache_file: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            device (hidapi.Device): opened controller
+            serial (str, optional): serial number (MAC address) from the enumeration. Defaults to None.
+            path (str, optional): device path. Defaults to None.
+            is_edge (bool, optional): controller is a DualSense Edge. Defaults to False.
+            cache_file (str, optional): JSON file to keep the feature reports in. Defaults to None.
+        """
+        self.device = device
+        self.serial = serial
+        self.path = path
+        self.is_edge = is_edge
+        self.cache_file = cache_file
+        self.reads = 0  # feature reports read from the controller
+        self._key = serial or path
+
+    @property
+    def model(self) -> str:
+        """model name"""
+        return "DualSense Edge" if self.is_edge else "DualSense"
+
+    def store(self, report_id: int, data: bytes) -> None:
+        """
+        cache a feature report read elsewhere
+
+        Args:
+            report_id (int): report id
+            data (bytes): report data without the report id
+        """
+        if self._key is None:
+            return
+        with _cache_lock:
+            # the other reports of the cache file must not be hidden by the first stored report
+            if self.cache_file is not None and self._key not in _cache:
+                self._load()
+            _cache.setdefault(self._key, {})[report_id] = bytes(data)
+        if self.cache_file is not None:
+            self._save()
+
+    def featureReport(self, report_id: int) -> bytes:
+        """
+        feature report from the cache, read from the controller if it was not read before
+
+        Args:
+            report_id (int): report id
+
+        Returns:
+            bytes: report data without the report id
+        """
+        if self._key is not None:
+            with _cache_lock:
+                if self.cache_file is not None and self._key not in _cache:
+                    self._load()
+                data = _cache.get(self._key, {}).get(report_id)
+            if data is not None:
+                return data
+
+        data = bytes(self.device.get_feature_report(report_id, FEATURE_REPORT_LENGTHS.get(report_id, 64)))
+        self.reads += 1
+        self.store(report_id, data)
+        return data
+
+    def _load(self) -> None:
+        """
+        add the reports of this controller from the cache file, called with the lock held
+        """
+        try:
+            with open(self.cache_file, encoding="utf-8") as file:  # type: ignore[arg-type]
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return
+        reports = entries.get(self._key, {})
+        _cache[self._key] = {int(report_id, 16): bytes.fromhex(data) for report_id, data in reports.items()}  # type: ignore[index]
+
+    def _save(self) -> None:
+        """
+        write the reports of this controller into the cache file, other controllers are kept
+        """
+        with _cache_lock:
+            try:
+                with open(self.cache_file, encoding="utf-8") as file:  # type: ignore[arg-type]
+                    entries = json.load(file)
+            except (OSError, ValueError):
+                entries = {}
+            reports = _cache.get(self._key, {})  # type: ignore[arg-type]
+            entries[self._key] = {f"{report_id:02x}": data.hex() for report_id, data in reports.items()}
+            temporary = f"{self.cache_file}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.replace(temporary, self.cache_file)  # type: ignore[arg-type]
+
+    @property
+    def mac(self) -> str:
+        """bluetooth MAC address of the controller, from the pairing info"""
+        data = self.featureReport(FEATURE_REPORT_PAIRING_INFO)
+        return ":".join(f"{byte:02x}" for byte in reversed(data[0:6]))
+
+    @property
+    def firmware(self) -> Dict[str, Any]:
+        """
+        firmware info: build_date, build_time, hardware_version, firmware_version and update_version
+        """
+        data = self.featureReport(FEATURE_REPORT_FIRMWARE_INFO)
+        return {
+            "build_date": data[0:11].decode("ascii", "replace").strip("\0"),
+            "build_time": data[11:19].decode("ascii", "replace").strip("\0"),
+            "hardware_version": int.from_bytes(data[23:27], "little"),
+            "firmware_version": int.from_bytes(data[27:31], "little"),
+            "update_version": int.from_bytes(data[43:45], "little"),
+        }
+
+    @property
+    def hardware_version(self) -> int:
+        """hardware version from the firmware info"""
+        return self.firmware["hardware_version"]  # type: ignore[no-any-return]
+
+    @property
+    def firmware_version(self) -> int:
+        """firmware version from the firmware info"""
+        return self.firmware["firmware_version"]  # type: ignore[no-any-return]
+
+    @property
+    def calibration(self) -> Dict[str, int]:
+        """motion sensor calibration, see :data:`CALIBRATION_FIELDS`"""
+        data = self.featureReport(FEATURE_REPORT_CALIBRATION)
+        return dict(zip(CALIBRATION_FIELDS, _CALIBRATION.unpack_from(data)))
@@ -0,0 +1,196 @@
+import math
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .pydualsense import DSState
+
+# axes with a lookup table, index of the raw byte in the input report
+AXES = ("LX", "LY", "RX", "RY", "L2", "R2")
+STICKS = ("left", "right")
+
+STICK_MAX = 127
+TRIGGER_MAX = 255
+
+_IDENTITY_STICK = [value - 128 for value in range(256)]
+_IDENTITY_TRIGGER = list(range(256))
+
+
+def response(
+    magnitude: float, deadzone: float = 0.0, anti_deadzone: float = 0.0, exponent: float = 1.0, outer: float = 1.0
+) -> float:
+    """
+    response curve for a normalized magnitude
+
+    Args:
+        magnitude (float): input from 0.0 to 1.0
+        deadzone (float, optional): inputs up to this value return 0. Defaults to 0.0.
+        anti_deadzone (float, optional): smallest output outside the deadzone. Defaults to 0.0.
+        exponent (float, optional): exponent of the curve, > 1 is finer around the center. Defaults to 1.0.
+        outer (float, optional): inputs from this value on return 1. Defaults to 1.0.
+
+    Returns:
+        float: output from 0.0 to 1.0
+    """
+    if magnitude <= deadzone:
+        return 0.0
+    scaled = min((magnitude - deadzone) / (outer - deadzone), 1.0)
+    return anti_deadzone + (1.0 - anti_deadzone) * float(scaled**exponent)
+
+
+def _checkCurve(deadzone: float, anti_deadzone: float, exponent: float, outer: float) -> None:
+    if not 0 <= deadzone < outer <= 1:
+        raise Exception("deadzone and outer need to satisfy 0 <= deadzone < outer <= 1")
+    if not 0 <= anti_deadzone < 1:
+        raise Exception("anti_deadzone needs to be in the range 0 <= anti_deadzone < 1")
+    if exponent <= 0:
+        raise Exception("exponent needs to be positive")
+
+
+class InputShaper:
+    """
+    Input shaping stage of the decoder.
+
+    Every axis has a 256 entry lookup table from the raw report byte to the shaped value, the radial
+    deadzone of a stick is computed once for every position the stick reports and kept in a cache. Without
+    any configuration the shaped values are the raw values.
+    """
+
+    def __init__(self) -> None:
+        """
+        initialise the shaper with identity curves
+        """
+        self._tables: Dict[str, List[int]] = {}
+        self._radial: Dict[str, Optional[Tuple[float, float, float, float]]] = {}
+        # shaped position of a stick, indexed by the two table outputs, filled on first use
+        self._radial_cache: Dict[str, List[Optional[Tuple[int, int]]]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        reset all axes to the identity
+        """
+        for axis in AXES:
+            self._tables[axis] = _IDENTITY_TRIGGER if axis in ("L2", "R2") else _IDENTITY_STICK
+        for stick in STICKS:
+            self._radial[stick] = None
+            self._radial_cache[stick] = []
+
+    def setAxisCurve(
+        self,
+        axis: str,
+        deadzone: float = 0.0,
+        anti_deadzone: float = 0.0,
+        exponent: float = 1.0,
+        outer: float = 1.0,
+        invert: bool = False,
+    ) -> None:
+        """
+        Sets the response curve of a single axis, stick axes are shaped symmetrically around the center
+
+        Args:
+            axis (str): one of "LX", "LY", "RX", "RY", "L2", "R2"
+            deadzone (float, optional): normalized axial deadzone. Defaults to 0.0.
+            anti_deadzone (float, optional): smallest normalized output outside the deadzone. Defaults to 0.0.
+            exponent (float, optional): exponent of the curve. Defaults to 1.0.
+            outer (float, optional): normalized input that already reaches the maximum. Defaults to 1.0.
+            invert (bool, optional): invert the axis. Defaults to False.
+
+        Raises:
+            Exception: unknown axis or curve parameters out of range
+        """
+        if axis not in AXES:
+            raise Exception(f"unknown axis {axis}, needs to be one of {', '.join(AXES)}")
+        _checkCurve(deadzone, anti_deadzone, exponent, outer)
+
+        table = []
+        if axis in ("L2", "R2"):
+            for raw in range(256):
+                value = round(response(raw / TRIGGER_MAX, deadzone, anti_deadzone, exponent, outer) * TRIGGER_MAX)
+                table.append(TRIGGER_MAX - value if invert else value)
+        else:
+            for raw in range(256):
+                value = raw - 128
+                shaped = round(
+                    math.copysign(response(min(abs(value) / STICK_MAX, 1.0), deadzone, anti_deadzone, exponent, outer), value)
+                    * STICK_MAX
+                )
+                table.append(max(-128, min(STICK_MAX, -shaped if invert else shaped)))
+        self._tables[axis] = table
+        # radial positions depend on the axis tables
+        for stick in STICKS:
+            self._radial_cache[stick] = [None] * 65536 if self._radial[stick] is not None else []
+
+    def setRadialDeadzone(
+        self,
+        stick: str,
+        deadzone: float = 0.0,
+        anti_deadzone: float = 0.0,
+        exponent: float = 1.0,
+        outer: float = 1.0,
+    ) -> None:
+        """
+        Sets the radial deadzone and response curve of a stick, applied to the distance from the center
+        after the axis curves. A deadzone of 0 with the default curve disables the radial stage.
+
+        Args:
+            stick (str): "left" or "right"
+            deadzone (float, optional): normalized radial deadzone. Defaults to 0.0.
+            anti_deadzone (float, optional): smallest normalized distance outside the deadzone. Defaults to 0.0.
+            exponent (float, optional): exponent of the curve. Defaults to 1.0.
+            outer (float, optional): normalized distance that already reaches the maximum. Defaults to 1.0.
+
+        Raises:
+            Exception: unknown stick or curve parameters out of range
+        """
+        if stick not in STICKS:
+            raise Exception(f"unknown stick {stick}, needs to be left or right")
+        _checkCurve(deadzone, anti_deadzone, exponent, outer)
+
+        if (deadzone, anti_deadzone, exponent, outer) == (0.0, 0.0, 1.0, 1.0):
+            self._radial[stick] = None
+            self._radial_cache[stick] = []
+        else:
+            self._radial[stick] = (deadzone, anti_deadzone, exponent, outer)
+            self._radial_cache[stick] = [None] * 65536
+
+    def _radialPosition(self, stick: str, x: int, y: int) -> Tuple[int, int]:
+        """
+        shape one stick position and store it in the cache
+        """
+        distance = math.hypot(x, y) / STICK_MAX
+        if distance == 0:
+            position = (0, 0)
+        else:
+            scale = response(min(distance, 1.0), *self._radial[stick]) / distance  # type: ignore[misc]
+            position = (
+                max(-128, min(STICK_MAX, round(x * scale))),
+                max(-128, min(STICK_MAX, round(y * scale))),
+            )
+        self._radial_cache[stick][((x + 128) << 8) | (y + 128)] = position
+        return position
+
+    def apply(self, states: List[int], state: "DSState") -> None:
+        """
+        set the shaped values of a decoded report
+
+        Args:
+            states (list): normalized input report
+            state (DSState): state receiving the shaped values
+        """
+        tables = self._tables
+        lx, ly = tables["LX"][states[1]], tables["LY"][states[2]]
+        rx, ry = tables["RX"][states[3]], tables["RY"][states[4]]
+
+        cache = self._radial_cache["left"]
+        if cache:
+            position = cache[((lx + 128) << 8) | (ly + 128)]
+            lx, ly = position if position is not None else self._radialPosition("left", lx, ly)
+        cache = self._radial_cache["right"]
+        if cache:
+            position = cache[((rx + 128) << 8) | (ry + 128)]
+            rx, ry = position if position is not None else self._radialPosition("right", rx, ry)
+
+        state.LX_shaped, state.LY_shaped = lx, ly
+        state.RX_shaped, state.RY_shaped = rx, ry
+        state.L2_shaped = tables["L2"][states[5]]
+        state.R2_shaped = tables["R2"][states[6]]
@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+
+class OutputScheduler:
+    """
+    Decides when an output report is written to the controller.
+
+    Reports are written as soon as they differ from the last written report, but never
+    faster than ``max_rate``. Unchanged reports are only repeated every ``keepalive`` seconds.
+    """
+
+    def __init__(self, max_rate: float = 250.0, keepalive: float = 1.0) -> None:
+        """
+        initialise the output scheduler
+
+        Args:
+            max_rate (float, optional): maximum writes per second, 0 disables the cap. Defaults to 250.0.
+            keepalive (float, optional): seconds after which an unchanged report is repeated, 0 disables it. Defaults to 1.0.
+        """
+        self.setMaxRate(max_rate)
+        self.setKeepalive(keepalive)
+
+        self.writes_sent = 0
+        self.writes_suppressed = 0
+
+        self._last_report: Optional[List[int]] = None
+        self._last_write = float("-inf")
+
+    def setMaxRate(self, max_rate: float) -> None:
+        """
+        Sets the maximum rate of output reports
+
+        Args:
+            max_rate (float): maximum writes per second, 0 disables the cap
+
+        Raises:
+            TypeError: max_rate false type
+            Exception: max_rate is negative
+        """
+        if not isinstance(max_rate, (int, float)):
+            raise TypeError("max_rate needs to be a number")
+        if max_rate < 0:
+            raise Exception("max_rate can't be negative")
+        self.max_rate = max_rate
+        self._min_interval = 1.0 / max_rate if max_rate else 0.0
+
+    def setKeepalive(self, keepalive: float) -> None:
+        """
+        Sets the interval in which an unchanged report is written again
+
+        Args:
+            keepalive (float): interval in seconds, 0 disables the keepalive
+
+        Raises:
+            TypeError: keepalive false type
+            Exception: keepalive is negative
+        """
+        if not isinstance(keepalive, (int, float)):
+            raise TypeError("keepalive needs to be a number")
+        if keepalive < 0:
+            raise Exception("keepalive can't be negative")
+        self.keepalive = keepalive
+
+    def submit(self, report: List[int], now: float) -> bool:
+        """
+        Offer a prepared output report to the scheduler
+
+        Args:
+            report (list): prepared output report
+            now (float): current monotonic time in seconds
+
+        Returns:
+            bool: True if the report should be written to the device
+        """
+        elapsed = now - self._last_write
+        if report != self._last_report:
+            due = elapsed >= self._min_interval
+        else:
+            due = self.keepalive > 0 and elapsed >= self.keepalive
+
+        if not due:
+            self.writes_suppressed += 1
+            return False
+
+        self._last_report = report
+        self._last_write = now
+        self.writes_sent += 1
+        return True
+
+    def reset(self) -> None:
+        """
+        Forget the last written report so the next submitted report is written immediately
+        """
+        self._last_report = None
+        self._last_write = float("-inf")
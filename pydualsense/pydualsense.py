@@ -7,23 +7,99 @@ if platform.startswith("win32") and sys.version_info >= (3, 8):
     os.environ["PATH"] += os.pathsep + os.path.dirname(__file__)
 
 
+import contextlib
+import functools
 import threading
+import time
 from copy import deepcopy
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
 
 import hidapi  # type: ignore[import]
 
-from .checksum import compute
+from .checksum import check_input, compute
+from .combos import ComboDetector
+from .effects import EffectPlayer
 from .enums import (
     BatteryState,
     Brightness,
+    Button,
     ConnectionType,
     LedOptions,
     PlayerID,
     PulseOptions,
+    StateField,
     TriggerModes,
 )
-from .event_system import Event
+from .event_system import Event, begin_batch, flush_batch
+from .gestures import TouchGestureRecognizer
+from .history import InputHistory
+from .info import DSInfo
+from .input_shaping import InputShaper
+from .output_scheduler import OutputScheduler
+from .remap import RemapProfile
+from .trigger_effects import OFF as TRIGGER_OFF
+from .trigger_effects import TriggerEffect
+from .worker import HIDWorker
+
+# Button bits of the dpad hat values 0..7, 8 is released
+DPAD_BUTTONS = (
+    Button.DpadUp,
+    Button.DpadUp | Button.DpadRight,
+    Button.DpadRight,
+    Button.DpadDown | Button.DpadRight,
+    Button.DpadDown,
+    Button.DpadDown | Button.DpadLeft,
+    Button.DpadLeft,
+    Button.DpadUp | Button.DpadLeft,
+) + (Button(0),) * 8
+DPAD_BITS = tuple(int(bits) for bits in DPAD_BUTTONS)
+
+# positions of the StateField values in the normalized input report
+STATE_FIELD_SLICES = tuple(
+    (start, end, int(field))
+    for start, end, field in (
+        (1, 2, StateField.LX),
+        (2, 3, StateField.LY),
+        (3, 4, StateField.RX),
+        (4, 5, StateField.RY),
+        (5, 6, StateField.L2_value),
+        (6, 7, StateField.R2_value),
+        (33, 37, StateField.Touch0),
+        (37, 41, StateField.Touch1),
+        (16, 22, StateField.Gyro),
+        (22, 28, StateField.Accelerometer),
+        (53, 54, StateField.Battery),
+    )
+)
+BUTTONS_FIELD = int(StateField.Buttons)
+
+# button events fired by readInput for the toggled Button bits
+BUTTON_EVENTS = tuple(
+    (int(button), event)
+    for button, event in (
+        (Button.Circle, "circle_pressed"),
+        (Button.Cross, "cross_pressed"),
+        (Button.Triangle, "triangle_pressed"),
+        (Button.Square, "square_pressed"),
+        (Button.DpadDown, "dpad_down"),
+        (Button.DpadLeft, "dpad_left"),
+        (Button.DpadRight, "dpad_right"),
+        (Button.DpadUp, "dpad_up"),
+        (Button.R1, "r1_changed"),
+        (Button.L1, "l1_changed"),
+        (Button.R3, "r3_changed"),
+        (Button.L3, "l3_changed"),
+        (Button.R4, "r4_changed"),
+        (Button.R5, "r5_changed"),
+        (Button.L4, "l4_changed"),
+        (Button.L5, "l5_changed"),
+        (Button.PS, "ps_pressed"),
+        (Button.Touchpad, "touch_pressed"),
+        (Button.Mic, "microphone_pressed"),
+        (Button.Share, "share_pressed"),
+        (Button.Options, "option_pressed"),
+    )
+)
 
 logger = logging.getLogger()
 FORMAT = "%(asctime)s %(message)s"
@@ -34,16 +110,37 @@ logger.setLevel(logging.INFO)
 class pydualsense:  # noqa: N801
     OUTPUT_REPORT_USB = 0x02
     OUTPUT_REPORT_BT = 0x31
-
-    def __init__(self, verbose: bool = False) -> None:
+    INPUT_REPORT_BT = 0x31
+    INPUT_REPORT_BT_SHORT_LENGTH = 10
+    FEATURE_REPORT_CALIBRATION = 0x05
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        max_output_rate: float = 250.0,
+        keepalive: float = 1.0,
+        read_timeout: float = 0.05,
+        info_cache: Optional[str] = None,
+        out_of_process: bool = False,
+    ) -> None:
         """
         initialise the library but dont connect to the controller. call :func:`init() <pydualsense.pydualsense.init>` to connect to the controller
 
         Args:
             verbose (bool, optional): display verbose out (debug prints of input and output). Defaults to False.
+            max_output_rate (float, optional): maximum output reports per second, 0 disables the cap. Defaults to 250.0.
+            keepalive (float, optional): seconds after which an unchanged output report is sent again. Defaults to 1.0.
+            read_timeout (float, optional): longest wait for an input report in seconds, bounds the time
+                :func:`close() <pydualsense.pydualsense.close>` waits for the report thread. Defaults to 0.05.
+            info_cache (str, optional): JSON file keeping the feature reports of :attr:`info` between runs. Defaults to None.
+            out_of_process (bool, optional): read and write the controller in a child process, see
+                :class:`HIDWorker <pydualsense.worker.HIDWorker>`. Defaults to False.
         """
 
         self.verbose = verbose
+        self.read_timeout = read_timeout
+        self.info_cache = info_cache
+        self.out_of_process = out_of_process
 
         if self.verbose:
             logger.setLevel(logging.DEBUG)
@@ -51,7 +148,31 @@ class pydualsense:  # noqa: N801
         self.leftMotor = 0
         self.rightMotor = 0
 
-        self.last_states: DSState = None # type: ignore[assignment]
+        self.last_states: Optional[DSState] = None
+
+        # counters of the report loop
+        self.stats = DSStats()
+
+        # functions called with this instance after every decoded input report
+        self.report_hooks: List[Callable[[pydualsense], None]] = []
+
+        # output reports are only written on change, rate capped and with a keepalive
+        self.output_scheduler = OutputScheduler(max_output_rate, keepalive)
+
+        # plays precompiled rumble, trigger and light effects from the output loop
+        self.effects = EffectPlayer()
+
+        # ControllerGroup sending the output reports instead of this instance, see pydualsense.group
+        self.output_group: Optional[object] = None
+
+        # button and axis remapping applied before decoding, see setRemapProfile
+        self.remap: Optional[RemapProfile] = None
+
+        # deadzones and response curves of the sticks and triggers, applied to every report
+        self.input_shaping = InputShaper()
+
+        # optional buffer of the last reports, see enableHistory
+        self.history: Optional[InputHistory] = None
 
         self.register_available_events()
 
@@ -106,6 +227,19 @@ class pydualsense:  # noqa: N801
         # handles 1 or 2 fingers
         # self.trackpad_frame_reported = Event()
 
+        # trackpad gestures
+        self.gestures = TouchGestureRecognizer()
+        self.touchpad_tap = self.gestures.tap
+        self.touchpad_double_tap = self.gestures.double_tap
+        self.touchpad_swipe = self.gestures.swipe
+        self.touchpad_edge_swipe = self.gestures.edge_swipe
+        self.touchpad_pinch = self.gestures.pinch
+        self.touchpad_scroll = self.gestures.scroll
+
+        # button sequences and chords, see ComboDetector.add
+        self.combos = ComboDetector()
+        self.combo_detected = self.combos.combo_detected
+
         # gyrometer events
         self.gyro_changed = Event()
 
@@ -115,11 +249,34 @@ class pydualsense:  # noqa: N801
         self.l2_value_changed = Event()
         self.r2_value_changed = Event()
 
-    def init(self) -> None:
+        # fired at most once per report with (state, changed StateField mask, pressed Button mask, released Button mask)
+        self.state_changed = Event()
+
+        # connection lost (False) or restored by reconnect (True)
+        self.connection_changed = Event()
+
+    def init(self, device: Optional[hidapi.Device] = None, is_edge: bool = False, serial: Optional[str] = None) -> None:
         """
         initialize module and device states. Starts the sendReport background thread at the end
+
+        Args:
+            device (hidapi.Device, optional): already opened device to use instead of searching for a controller,
+                e.g. a :class:`SimulatedDualSense <pydualsense.simulator.SimulatedDualSense>`. Defaults to None.
+            is_edge (bool, optional): the given device is a DualSense Edge. Defaults to False.
+            serial (str, optional): without a device, open the controller with this serial number. Defaults to None (any controller).
         """
-        self.device, self.is_edge = self.__find_device() # type: Tuple[hidapi.Device, bool]
+        self._closed = False
+        self._lost_at = time.monotonic()
+        self._injected = device is not None
+        self.serial: Optional[str] = None
+        path: Optional[str] = None
+        if device is None:
+            self.device, self.is_edge, self.serial, path = self.__find_device(serial)
+        else:
+            self.device, self.is_edge = device, is_edge
+            self.serial = device.get_serial_number_string() or None
+        # feature reports (MAC address, firmware, calibration) read once and cached
+        self.info = DSInfo(self.device, self.serial, path, self.is_edge, self.info_cache)
         self.light = DSLight()  # control led light of ds
         self.audio = DSAudio()  # ds audio setting
         self.triggerL = DSTrigger()  # left trigger
@@ -131,14 +288,56 @@ class pydualsense:  # noqa: N801
             (self.l4_changed.available, self.l5_changed.available,
              self.r4_changed.available, self.r5_changed.available) = True, True, True, True
         self.battery = DSBattery()
+        # previous report, kept like last_states over a reconnect so held buttons are not pressed again
+        self._prev_states: Optional[List[int]] = None
+        self._prev_buttons = 0
+        self._start()
+
+    def _start(self) -> None:
+        """
+        detect the connection type of the opened device and start the report thread
+        """
+        self.states: Optional[List[int]] = None
+        self._extended_requested = False
         self.conType = self.determineConnectionType()  # determine USB or BT connection
         if self.conType is ConnectionType.ERROR:
             raise Exception("Couldn't determine connection type")
+        self.output_scheduler.reset()
         self.ds_thread = True
         self.connected = True
         self.report_thread = threading.Thread(target=self.sendReport)
         self.report_thread.start()
-        self.states = None
+
+    def reconnect(self) -> None:
+        """
+        reopen the controller after the connection was lost, by the serial number of the last connection.
+        The connection type is detected again, events, report hooks and the light, trigger and audio
+        settings are kept and sent with the first output report.
+
+        Raises:
+            Exception: the controller is still connected, was closed or was passed to init()
+            Exception: No device detected
+        """
+        if self._closed:
+            raise Exception("controller was closed")
+        if self.report_thread.is_alive():
+            # the report thread fires connection_changed(False) on its way out, wait for it unless called from it
+            if self.connected or threading.current_thread() is self.report_thread:
+                raise Exception("controller is still connected")
+            self.report_thread.join(1.0)
+            if self.report_thread.is_alive():
+                raise Exception("controller is still connected")
+        if self._injected:
+            raise Exception("a device passed to init() can't be reopened")
+        with contextlib.suppress(OSError):
+            self.device.close()
+
+        self.device, self.is_edge, _, self.info.path = self.__find_device(self.serial)
+        self.info.device = self.device
+        self._start()
+        self.stats.reconnects += 1
+        self.stats.reconnect_latency = time.monotonic() - self._lost_at
+        self.connection_changed(True)
 
     def determineConnectionType(self) -> ConnectionType:
         """
@@ -165,23 +364,62 @@ class pydualsense:  # noqa: N801
             self.input_report_length = 78
             self.output_report_length = 78
             return ConnectionType.BT
+        elif input_report_length == self.INPUT_REPORT_BT_SHORT_LENGTH:
+            # bluetooth in simple report mode, switch to the extended reports
+            self.input_report_length = 78
+            self.output_report_length = 78
+            self.requestExtendedReports()
+            return ConnectionType.BT
 
         return ConnectionType.ERROR
 
-    def close(self) -> None:
+    def requestExtendedReports(self) -> None:
         """
-        Stops the report thread and closes the HID device
+        Switch a bluetooth connected controller from the short simple input report to the full input report.
+        Reading the calibration feature report makes the controller send the extended report.
         """
-        # TODO: reset trigger effect to default
+        data = self.device.get_feature_report(self.FEATURE_REPORT_CALIBRATION, 41)
+        self.info.store(self.FEATURE_REPORT_CALIBRATION, data)
+        self._extended_requested = True
 
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        Stops the report thread, turns off the trigger effects and rumble with a final output report and
+        closes the HID device. The time it took is stored in ``stats.time_to_stop``
+
+        Args:
+            timeout (float, optional): longest wait for the report thread in seconds. Defaults to 1.0.
+        """
+        start = time.monotonic()
+        self._closed = True
         self.ds_thread = False
-        self.report_thread.join()
+        self.report_thread.join(timeout)
+        if self.report_thread.is_alive():
+            # the thread still uses the device, closing it now could crash hidapi
+            logger.warning("report thread did not stop within %.2f s, device left open", timeout)
+            self.stats.time_to_stop = time.monotonic() - start
+            return
+
+        if self.connected:
+            self.effects.cancelAll()
+            self.triggerL.setEffect(TRIGGER_OFF)
+            self.triggerR.setEffect(TRIGGER_OFF)
+            self.setLeftMotor(0)
+            self.setRightMotor(0)
+            try:
+                self.writeReport(self.prepareReport())
+            except OSError:
+                logger.debug("final output report could not be written")
         self.device.close()
+        self.stats.time_to_stop = time.monotonic() - start
 
-    def __find_device(self) -> Tuple[hidapi.Device, bool]:
+    def __find_device(self, serial: Optional[str] = None) -> Tuple[hidapi.Device, bool, Optional[str], Optional[str]]:
         """
         find HID dualsense device and open it
 
+        Args:
+            serial (str, optional): only open the controller with this serial number. Defaults to None (any controller).
+
         Raises:
             Exception: HIDGuardian detected
             Exception: No device detected
@@ -189,6 +427,8 @@ class pydualsense:  # noqa: N801
         Returns:
             hid.Device: returns opened controller device
             bool: returns true if the device is a DualSense Edge.
+            str: serial number of the device
+            str: device path
         """
         # TODO: detect connection mode, bluetooth has a bigger write buffer
         # TODO: implement multiple controllers working
@@ -203,15 +443,83 @@ class pydualsense:  # noqa: N801
         devices = hidapi.enumerate(vendor_id=0x054C)
         for device in devices:
             if device.vendor_id == 0x054C and device.product_id in (0x0CE6, 0x0DF2):
+                if serial and device.serial_number != serial:
+                    continue
                 detected_device = device
 
         if detected_device is None:
             raise Exception("No device detected")
 
-        dual_sense = hidapi.Device(
-            vendor_id=detected_device.vendor_id, product_id=detected_device.product_id
+        open_device = functools.partial(
+            hidapi.Device,
+            vendor_id=detected_device.vendor_id,
+            product_id=detected_device.product_id,
+            serial_number=detected_device.serial_number or None,
         )
-        return dual_sense, detected_device.product_id == 0x0DF2
+        dual_sense = HIDWorker(open_device) if self.out_of_process else open_device()
+        path = detected_device.path
+        if isinstance(path, bytes):
+            path = path.decode(errors="replace")
+        return dual_sense, detected_device.product_id == 0x0DF2, detected_device.serial_number or None, path
+
+    def setRemapProfile(self, profile: Optional[RemapProfile]) -> None:
+        """
+        remap buttons and axes with a :class:`RemapProfile <pydualsense.remap.RemapProfile>`, used from the next report on
+
+        Args:
+            profile (RemapProfile): the profile, None restores the controller layout
+
+        Raises:
+            TypeError: profile is not a RemapProfile
+        """
+        if profile is not None and not isinstance(profile, RemapProfile):
+            raise TypeError("profile needs to be a RemapProfile or None")
+        self.remap = profile
+
+    def enableHistory(self, retention: float = 10.0, max_rate: float = 1000.0) -> InputHistory:
+        """
+        record the decoded reports into a fixed size :class:`InputHistory <pydualsense.history.InputHistory>`,
+        an already enabled history is replaced
+
+        Args:
+            retention (float, optional): seconds of reports to keep. Defaults to 10.0.
+            max_rate (float, optional): highest expected report rate in Hz. Defaults to 1000.0.
+
+        Returns:
+            InputHistory: the history, also available as :attr:`history`
+        """
+        history = InputHistory(retention, max_rate)
+        self.disableHistory()
+        self.history = history
+        self.addReportHook(history.record)
+        return history
+
+    def disableHistory(self) -> None:
+        """
+        stop recording and drop the history
+        """
+        if self.history is not None:
+            self.removeReportHook(self.history.record)
+            self.history = None
+
+    def addReportHook(self, hook: Callable[["pydualsense"], None]) -> None:
+        """
+        add a function that is called with this instance after every decoded input report.
+        Hooks run on the report thread and should return quickly
+
+        Args:
+            hook (function): function taking the pydualsense instance
+        """
+        self.report_hooks = [*self.report_hooks, hook]
+
+    def removeReportHook(self, hook: Callable[["pydualsense"], None]) -> None:
+        """
+        remove a report hook
+
+        Args:
+            hook (function): previously added function
+        """
+        self.report_hooks = [fn for fn in self.report_hooks if fn != hook]
 
     def setLeftMotor(self, intensity: int) -> None:
         """
@@ -253,22 +561,38 @@ class pydualsense:  # noqa: N801
         """background thread handling the reading of the device and updating its states"""
         while self.ds_thread:
             try:
-                # read data from the input report of the controller
-                inReport = self.device.read(self.input_report_length)
+                # read data from the input report of the controller, the timeout lets close() stop the loop
+                inReport = self.device.read(self.input_report_length, int(self.read_timeout * 1000))
+                if inReport is None:
+                    self.stats.read_timeouts += 1
+                    continue
                 if self.verbose:
                     logger.debug(inReport)
-                # decrypt the packet and bind the inputs
-                self.readInput(inReport)
+                # decrypt the packet and bind the inputs, coroutine handlers of the report are handed over together
+                begin_batch()
+                try:
+                    self.readInput(inReport)
+                finally:
+                    flush_batch()
+
+                # the output of group members is sent by the group
+                if self.output_group is not None:
+                    continue
 
                 # prepare new report for device
                 outReport = self.prepareReport()
 
-                # write the report to the device
-                self.writeReport(outReport)
-            except IOError:
+                # write the report to the device if it changed or the keepalive is due
+                if self.output_scheduler.submit(outReport, time.monotonic()):
+                    self.writeReport(outReport)
+            except OSError as error:
+                logger.warning("lost connection to the controller: %s", error)
+                self._lost_at = time.monotonic()
                 self.connected = False
+                self.stats.disconnects += 1
+                self.connection_changed(False)
                 break
-                
+
             except AttributeError:
                 self.connected = False
                 break
@@ -281,12 +605,33 @@ class pydualsense:  # noqa: N801
             inReport (bytearray): read bytearray containing the state of the whole controller
         """
 
-        # the reports for BT and USB are structured the same,
-        # but there is one more byte at the start of the bluetooth report.
-        # We drop that byte, so that the format matches up again.
-        states: List[int] = list(inReport)[1:] if self.conType == ConnectionType.BT else list(inReport)
+        states: List[int]
+        if self.conType == ConnectionType.BT:
+            if len(inReport) == self.INPUT_REPORT_BT_SHORT_LENGTH:
+                # simple report mode, only sticks, triggers and buttons are available
+                self.stats.short_reports += 1
+                if not self._extended_requested:
+                    self.requestExtendedReports()
+                states = self.expandShortReport(inReport)
+            else:
+                # drop corrupted frames instead of decoding garbage
+                if not check_input(inReport):
+                    self.stats.crc_errors += 1
+                    return
+                # the reports for BT and USB are structured the same,
+                # but there is one more byte at the start of the bluetooth report.
+                # We drop that byte, so that the format matches up again.
+                states = list(inReport)[1:]
+        else:
+            states = list(inReport)
+        self.stats.reports_received += 1
+
+        # remap before decoding, the state and all events use the remapped layout
+        remap = self.remap
+        if remap is not None:
+            remap.apply(states)
 
-        self.states: List[int] = states # type: ignore[assigment]
+        self.states = states
         # states 0 is always 1
         self.state.LX = states[1] - 128
         self.state.LY = states[2] - 128
@@ -299,6 +644,9 @@ class pydualsense:  # noqa: N801
         self.state.L2_value = states[5]
         self.state.R2_value = states[6]
 
+        # deadzones and response curves, identity unless configured
+        self.input_shaping.apply(states, self.state)
+
         # state 7 always increments -> not used anywhere
 
         buttonState = states[8]
@@ -331,131 +679,101 @@ class pydualsense:  # noqa: N801
             self.state.L5 = (misc2 & 0x40) != 0
             self.state.R5 = (misc2 & 0x80) != 0
 
-        # trackpad touch
-        self.state.trackPadTouch0.ID = inReport[33] & 0x7F
-        self.state.trackPadTouch0.isActive = (inReport[33] & 0x80) == 0
-        self.state.trackPadTouch0.X = ((inReport[35] & 0x0F) << 8) | (inReport[34])
-        self.state.trackPadTouch0.Y = ((inReport[36]) << 4) | (
-            (inReport[35] & 0xF0) >> 4
+        # all buttons as Button bits, the button bytes already match the bit layout except for the dpad
+        buttons = (
+            DPAD_BITS[buttonState & 0x0F]
+            | (buttonState & 0xF0)
+            | (misc << 8)
+            | ((misc2 & (0xF7 if self.is_edge else 0x07)) << 16)
         )
+        toggled = buttons ^ self._prev_buttons
+        self._prev_buttons = buttons
+        self.state.buttons = buttons
+        self.state.pressed = toggled & buttons
+        self.state.released = toggled & ~buttons
+        if self.combos.active:
+            self.combos.update(buttons, self.state.pressed, time.monotonic())
 
         # trackpad touch
-        self.state.trackPadTouch1.ID = inReport[37] & 0x7F
-        self.state.trackPadTouch1.isActive = (inReport[37] & 0x80) == 0
-        self.state.trackPadTouch1.X = ((inReport[39] & 0x0F) << 8) | (inReport[38])
-        self.state.trackPadTouch1.Y = ((inReport[40]) << 4) | (
-            (inReport[39] & 0xF0) >> 4
+        self.state.trackPadTouch0.ID = states[33] & 0x7F
+        self.state.trackPadTouch0.isActive = (states[33] & 0x80) == 0
+        self.state.trackPadTouch0.X = ((states[35] & 0x0F) << 8) | (states[34])
+        self.state.trackPadTouch0.Y = ((states[36]) << 4) | (
+            (states[35] & 0xF0) >> 4
         )
 
-        # accelerometer
-        self.state.accelerometer.X = int.from_bytes(
-            ([inReport[16], inReport[17]]), byteorder="little", signed=True
-        )
-        self.state.accelerometer.Y = int.from_bytes(
-            ([inReport[18], inReport[19]]), byteorder="little", signed=True
-        )
-        self.state.accelerometer.Z = int.from_bytes(
-            ([inReport[20], inReport[21]]), byteorder="little", signed=True
+        # trackpad touch
+        self.state.trackPadTouch1.ID = states[37] & 0x7F
+        self.state.trackPadTouch1.isActive = (states[37] & 0x80) == 0
+        self.state.trackPadTouch1.X = ((states[39] & 0x0F) << 8) | (states[38])
+        self.state.trackPadTouch1.Y = ((states[40]) << 4) | (
+            (states[39] & 0xF0) >> 4
         )
 
-        # gyrometer
+        # trackpad gestures, events only fire when a gesture is recognized
+        self.gestures.update(self.state.trackPadTouch0, self.state.trackPadTouch1, time.monotonic())
+
+        # gyrometer, about 16 per degree/s
         self.state.gyro.Pitch = int.from_bytes(
-            ([inReport[22], inReport[23]]), byteorder="little", signed=True
+            ([states[16], states[17]]), byteorder="little", signed=True
         )
         self.state.gyro.Yaw = int.from_bytes(
-            ([inReport[24], inReport[25]]), byteorder="little", signed=True
+            ([states[18], states[19]]), byteorder="little", signed=True
         )
         self.state.gyro.Roll = int.from_bytes(
-            ([inReport[26], inReport[27]]), byteorder="little", signed=True
+            ([states[20], states[21]]), byteorder="little", signed=True
         )
 
+        # accelerometer, 8192 per g
+        self.state.accelerometer.X = int.from_bytes(
+            ([states[22], states[23]]), byteorder="little", signed=True
+        )
+        self.state.accelerometer.Y = int.from_bytes(
+            ([states[24], states[25]]), byteorder="little", signed=True
+        )
+        self.state.accelerometer.Z = int.from_bytes(
+            ([states[26], states[27]]), byteorder="little", signed=True
+        )
+
+        # sensor timestamp in units of 1/3 microseconds, wraps around at 32 bit
+        self.state.sensorTimestamp = int.from_bytes(states[28:32], byteorder="little")
+
         # from kit-nya
         battery = states[53]
         self.battery.State = BatteryState((battery & 0xF0) >> 4)
         self.battery.Level = min((battery & 0x0F) * 10 + 5, 100)
 
+        for hook in self.report_hooks:
+            hook(self)
+
+        if self.state_changed.subscribed and self._prev_states is not None:
+            self._fireStateChanged(states)
+        self._prev_states = states
+
         # first call we dont have a "last state" so we create if with the first occurence
         if self.last_states is None:
-            self.last_states: DSState = deepcopy(self.state) # type: ignore[assignment]
+            self.last_states = deepcopy(self.state)
             return
 
         # send all events if neede
-        if self.state.circle != self.last_states.circle:
-            self.circle_pressed(self.state.circle)
+        if toggled:
+            for mask, event in BUTTON_EVENTS:
+                if toggled & mask:
+                    getattr(self, event)((buttons & mask) != 0)
 
-        if self.state.cross != self.last_states.cross:
-            self.cross_pressed(self.state.cross)
+        # stick and trigger events only fire when the shaped value changes
+        if self.state.LX_shaped != self.last_states.LX_shaped or self.state.LY_shaped != self.last_states.LY_shaped:
+            self.left_joystick_changed(self.state.LX_shaped, self.state.LY_shaped)
 
-        if self.state.triangle != self.last_states.triangle:
-            self.triangle_pressed(self.state.triangle)
-
-        if self.state.square != self.last_states.square:
-            self.square_pressed(self.state.square)
-
-        if self.state.DpadDown != self.last_states.DpadDown:
-            self.dpad_down(self.state.DpadDown)
-
-        if self.state.DpadLeft != self.last_states.DpadLeft:
-            self.dpad_left(self.state.DpadLeft)
-
-        if self.state.DpadRight != self.last_states.DpadRight:
-            self.dpad_right(self.state.DpadRight)
-
-        if self.state.DpadUp != self.last_states.DpadUp:
-            self.dpad_up(self.state.DpadUp)
-
-        if self.state.LX != self.last_states.LX or self.state.LY != self.last_states.LY:
-            self.left_joystick_changed(self.state.LX, self.state.LY)
-
-        if self.state.RX != self.last_states.RX or self.state.RY != self.last_states.RY:
-            self.right_joystick_changed(self.state.RX, self.state.RY)
-
-        if self.state.R1 != self.last_states.R1:
-            self.r1_changed(self.state.R1)
+        if self.state.RX_shaped != self.last_states.RX_shaped or self.state.RY_shaped != self.last_states.RY_shaped:
+            self.right_joystick_changed(self.state.RX_shaped, self.state.RY_shaped)
 
         if self.state.R2 != self.last_states.R2:
             self.r2_changed(self.state.R2)
 
-        if self.state.L1 != self.last_states.L1:
-            self.l1_changed(self.state.L1)
-
         if self.state.L2 != self.last_states.L2:
             self.l2_changed(self.state.L2)
 
-        if self.state.R3 != self.last_states.R3:
-            self.r3_changed(self.state.R3)
-
-        if self.state.L3 != self.last_states.L3:
-            self.l3_changed(self.state.L3)
-
-        if self.is_edge:
-            if self.state.R4 != self.last_states.R4:
-                self.r4_changed(self.state.R4)
-
-            if self.state.R5 != self.last_states.R5:
-                self.r5_changed(self.state.R5)
-
-            if self.state.L4 != self.last_states.L4:
-                self.l4_changed(self.state.L4)
-
-            if self.state.L5 != self.last_states.L5:
-                self.l5_changed(self.state.L5)
-
-        if self.state.ps != self.last_states.ps:
-            self.ps_pressed(self.state.ps)
-
-        if self.state.touchBtn != self.last_states.touchBtn:
-            self.touch_pressed(self.state.touchBtn)
-
-        if self.state.micBtn != self.last_states.micBtn:
-            self.microphone_pressed(self.state.micBtn)
-
-        if self.state.share != self.last_states.share:
-            self.share_pressed(self.state.share)
-
-        if self.state.options != self.last_states.options:
-            self.option_pressed(self.state.options)
-
         if (
             self.state.accelerometer.X != self.last_states.accelerometer.X
             or self.state.accelerometer.Y != self.last_states.accelerometer.Y
@@ -476,11 +794,11 @@ class pydualsense:  # noqa: N801
                 self.state.gyro.Pitch, self.state.gyro.Yaw, self.state.gyro.Roll
             )
 
-        if self.state.L2_value != self.last_states.L2_value:
-            self.l2_value_changed(self.state.L2_value)
+        if self.state.L2_shaped != self.last_states.L2_shaped:
+            self.l2_value_changed(self.state.L2_shaped)
 
-        if self.state.R2_value != self.last_states.R2_value:
-            self.r2_value_changed(self.state.R2_value)
+        if self.state.R2_shaped != self.last_states.R2_shaped:
+            self.r2_value_changed(self.state.R2_shaped)
 
         """
         copy current state into temp object to check next cycle if a change occuret
@@ -492,6 +810,53 @@ class pydualsense:  # noqa: N801
 
         # TODO: control mouse with touchpad for fun as DS4Windows
 
+    def _fireStateChanged(self, states: List[int]) -> None:
+        """
+        compare the raw fields of the report with the previous report and fire :attr:`state_changed` once.
+        The masks are passed as plain ints of :class:`StateField <pydualsense.enums.StateField>`
+        and :class:`Button <pydualsense.enums.Button>` bits
+
+        Args:
+            states (list): current normalized input report
+        """
+        prev = self._prev_states
+        if prev is None:
+            return
+        changed = 0
+        for start, end, field in STATE_FIELD_SLICES:
+            if states[start:end] != prev[start:end]:
+                changed |= field
+        state = self.state
+        if state.pressed or state.released:
+            changed |= BUTTONS_FIELD
+
+        if changed:
+            self.state_changed(state, changed, state.pressed, state.released)
+
+    def expandShortReport(self, in_report: List[int]) -> List[int]:
+        """
+        convert the short bluetooth input report into the layout of the full report.
+        Motion and touch data are not part of the short report, the battery keeps its last value.
+
+        Args:
+            in_report (bytearray): 10 byte short input report
+
+        Returns:
+            list: states in the layout of the USB input report
+        """
+        states = [0] * 64
+        states[0] = 1
+        states[1:5] = in_report[1:5]  # sticks
+        states[5] = in_report[8]  # L2
+        states[6] = in_report[9]  # R2
+        states[8] = in_report[5]
+        states[9] = in_report[6]
+        states[10] = in_report[7] & 0x03  # the upper bits are a report counter
+        states[33] = states[37] = 0x80  # no touch
+        if self.states is not None:
+            states[53] = self.states[53]
+        return states
+
     def writeReport(self, outReport : List[int]) -> None:  # noqa: N803
         """
         write the report to the device
@@ -574,6 +939,9 @@ class pydualsense:  # noqa: N801
             outReport[46] = self.light.TouchpadColor[1]
             outReport[47] = self.light.TouchpadColor[2]
 
+            # overlay running effects
+            self.effects.render(outReport, 0, time.monotonic())
+
         elif self.conType == ConnectionType.BT:
             # packet type
             outReport[0] = self.OUTPUT_REPORT_BT  # bt type
@@ -638,6 +1006,9 @@ class pydualsense:  # noqa: N801
             outReport[47] = self.light.TouchpadColor[1]
             outReport[48] = self.light.TouchpadColor[2]
 
+            # overlay running effects, the BT report is shifted by one byte
+            self.effects.render(outReport, 1, time.monotonic())
+
             crcChecksum = compute(outReport)
 
             outReport[74] = crcChecksum & 0x000000FF
@@ -651,6 +1022,22 @@ class pydualsense:  # noqa: N801
         return outReport
 
 
+class DSStats:
+    """
+    Counters of the report loop
+    """
+
+    def __init__(self) -> None:
+        self.reports_received = 0  # decoded input reports
+        self.crc_errors = 0  # dropped bluetooth reports with a wrong checksum
+        self.short_reports = 0  # bluetooth reports in the short simple format
+        self.read_timeouts = 0  # reads that returned without a report
+        self.time_to_stop = 0.0  # seconds the last close() took
+        self.disconnects = 0  # connections lost while reading
+        self.reconnects = 0  # successful reconnects
+        self.reconnect_latency = 0.0  # seconds from the last lost connection to the reconnect
+
+
 class DSTouchpad:
     """
     Dualsense Touchpad class. Contains X and Y position of touch and if the touch isActive
@@ -699,7 +1086,10 @@ class DSState:
             self.touchLeft,
         ) = False, False, False, False, False, False, False, False
         # Set to None to allow regular controllers to have these values unset
-        self.L4, self.L5, self.R4, self.R5 = None, None, None, None
+        self.L4: Optional[bool] = None
+        self.L5: Optional[bool] = None
+        self.R4: Optional[bool] = None
+        self.R5: Optional[bool] = None
         self.touchFinger1, self.touchFinger2 = False, False
         self.micBtn = False
         self.RX, self.RY, self.LX, self.LY = 128, 128, 128, 128
@@ -708,6 +1098,49 @@ class DSState:
         self.accelerometer = DSAccelerometer()
         self.L2_value = 0 # trigger analog value from 0 to 255
         self.R2_value = 0 # trigger analog value from 0 to 255
+        # values after the deadzones and response curves of pydualsense.input_shaping
+        self.LX_shaped, self.LY_shaped, self.RX_shaped, self.RY_shaped = 0, 0, 0, 0
+        self.L2_shaped, self.R2_shaped = 0, 0
+        self.sensorTimestamp = 0 # timestamp of the motion data in 1/3 microseconds
+        self.buttons = 0 # all held buttons as Button bits
+        self.pressed = 0 # Button bits pressed since the previous report
+        self.released = 0 # Button bits released since the previous report
+
+    def is_down(self, button: int) -> bool:
+        """
+        check if a button is held
+
+        Args:
+            button (int): Button mask, e.g. ``Button.Cross`` or ``Button.L1 | Button.R1``
+
+        Returns:
+            bool: True if all buttons of the mask are held
+        """
+        return self.buttons & button == button
+
+    def just_pressed(self, button: int) -> bool:
+        """
+        check if a button was pressed with the last report
+
+        Args:
+            button (int): Button mask
+
+        Returns:
+            bool: True if any button of the mask was pressed since the previous report
+        """
+        return self.pressed & button != 0
+
+    def just_released(self, button: int) -> bool:
+        """
+        check if a button was released with the last report
+
+        Args:
+            button (int): Button mask
+
+        Returns:
+            bool: True if any button of the mask was released since the previous report
+        """
+        return self.released & button != 0
 
     def setDPadState(self, dpad_state: int) -> None:
         """
@@ -918,7 +1351,7 @@ class DSTrigger:
     """
     Dualsense trigger class. Allowes for multiple :class:`TriggerModes <pydualsense.enums.TriggerModes>` and multiple forces
 
-    # TODO: make this interface more userfriendly so a developer knows what he is doing
+    Use :func:`setEffect` with the effects of :mod:`pydualsense.trigger_effects` instead of raw forces
     """
 
     def __init__(self) -> None:
@@ -963,6 +1396,22 @@ class DSTrigger:
 
         self.mode = mode
 
+    def setEffect(self, effect: TriggerEffect) -> None:
+        """
+        Set mode and forces of the trigger from an encoded effect
+
+        Args:
+            effect (TriggerEffect): effect from :mod:`pydualsense.trigger_effects`
+
+        Raises:
+            TypeError: false effect type
+        """
+        if not isinstance(effect, TriggerEffect):
+            raise TypeError("effect needs to be of type `TriggerEffect`")
+
+        self.mode = effect.mode
+        self.forces = list(effect.forces)
+
 
 class DSGyro:
     """
@@ -0,0 +1,144 @@
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .enums import Button
+
+# index of the raw byte of an axis in the normalized input report
+AXIS_BYTES = {"LX": 1, "LY": 2, "RX": 3, "RY": 4, "L2": 5, "R2": 6}
+STICK_AXES = ("LX", "LY", "RX", "RY")
+
+# index of the button bytes in the normalized input report
+BUTTON_BYTES = (8, 9, 10)
+
+_UP, _RIGHT, _DOWN, _LEFT = (int(bit) for bit in (Button.DpadUp, Button.DpadRight, Button.DpadDown, Button.DpadLeft))
+_HAT_DIRECTIONS = (_UP, _UP | _RIGHT, _RIGHT, _DOWN | _RIGHT, _DOWN, _DOWN | _LEFT, _LEFT, _UP | _LEFT)
+
+
+def _dpadBits(hat: int) -> int:
+    """
+    Button bits of a dpad hat value, 8 and above is released
+    """
+    return _HAT_DIRECTIONS[hat] if hat < 8 else 0
+
+
+def _hatValue(bits: int) -> int:
+    """
+    dpad hat value of Button bits, opposite directions cancel each other
+    """
+    if bits & (_UP | _DOWN) == _UP | _DOWN:
+        bits &= ~(_UP | _DOWN)
+    if bits & (_LEFT | _RIGHT) == _LEFT | _RIGHT:
+        bits &= ~(_LEFT | _RIGHT)
+    bits &= 0x0F
+    return _HAT_DIRECTIONS.index(bits) if bits else 8
+
+
+class RemapProfile:
+    """
+    Button and axis remapping applied by the decoder to the raw input report, before anything is decoded.
+    :class:`DSState <pydualsense.pydualsense.DSState>`, the events and everything reading the state see
+    the remapped layout.
+
+    The profile is compiled once: every button byte is translated with a 256 entry lookup table and every
+    remapped axis byte with one table lookup. Profiles are not changed after they are created, so switching
+    with :func:`setRemapProfile() <pydualsense.pydualsense.setRemapProfile>` takes effect atomically with
+    the next report.
+    """
+
+    def __init__(
+        self,
+        buttons: Optional[Mapping[int, int]] = None,
+        axes: Optional[Mapping[str, str]] = None,
+        invert: Sequence[str] = (),
+        name: str = "",
+    ) -> None:
+        """
+        compile the profile
+
+        Args:
+            buttons (dict, optional): source Button -> target Button bits, 0 disables the button. Buttons that
+                are not listed keep their place. The paddles L4/L5/R4/R5 only exist on the DualSense Edge.
+                Defaults to None.
+            axes (dict, optional): target axis -> source axis, e.g. ``{"LX": "RX", "RX": "LX"}``. Sticks and
+                triggers can only be swapped with each other. Defaults to None.
+            invert (list, optional): target axes that are inverted after the swap. A raw axis byte is inverted
+                to ``255 - value``, the mirror around 127.5: the full range maps onto itself and inverting twice
+                gives the original value. A centered stick (128) reads 127 afterwards, one step off center and
+                inside any deadzone. Defaults to ().
+            name (str, optional): name of the profile. Defaults to "".
+
+        Raises:
+            TypeError: a button is not an int
+            Exception: a source button is not a single Button, or an unknown or mismatched axis
+        """
+        self.name = name
+        self.buttons: Dict[int, int] = {}
+        for source, target in (buttons or {}).items():
+            if not isinstance(source, int) or not isinstance(target, int):
+                raise TypeError("buttons need to be Button values")
+            if source <= 0 or source & (source - 1) or source not in Button._value2member_map_:
+                raise Exception(f"source {source!r} needs to be a single Button")
+            self.buttons[int(source)] = int(target)
+
+        self.axes: Dict[str, str] = dict(axes or {})
+        self.invert = tuple(invert)
+        for target_axis, source_axis in self.axes.items():
+            if target_axis not in AXIS_BYTES or source_axis not in AXIS_BYTES:
+                raise Exception(f"unknown axis in {target_axis} <- {source_axis}")
+            if (target_axis in STICK_AXES) != (source_axis in STICK_AXES):
+                raise Exception(f"stick and trigger axes can't be swapped: {target_axis} <- {source_axis}")
+        for axis in self.invert:
+            if axis not in AXIS_BYTES:
+                raise Exception(f"unknown axis {axis}")
+
+        self._compileButtons()
+        self._compileAxes()
+
+    def _compileButtons(self) -> None:
+        # target bits of every source bit
+        targets = [self.buttons.get(1 << bit, 1 << bit) for bit in range(24)]
+
+        def translate(bits: int) -> int:
+            result = 0
+            for bit in range(24):
+                if bits & (1 << bit):
+                    result |= targets[bit]
+            return result
+
+        # remapped Button bits of every value of the three button bytes, the first one includes the dpad hat
+        self.tables: Tuple[Tuple[int, ...], ...] = (
+            tuple(translate(_dpadBits(value & 0x0F) | (value & 0xF0)) for value in range(256)),
+            tuple(translate(value << 8) for value in range(256)),
+            tuple(translate(value << 16) for value in range(256)),
+        )
+        # first button byte of the low 8 Button bits, dpad bits back to the hat value
+        self.first_byte = tuple(_hatValue(bits) | (bits & 0xF0) for bits in range(256))
+        self.remaps_buttons = bool(self.buttons)
+
+    def _compileAxes(self) -> None:
+        invert = tuple(255 - value for value in range(256))
+        axes: List[Tuple[int, int, Optional[Tuple[int, ...]]]] = []
+        for target, index in AXIS_BYTES.items():
+            source = self.axes.get(target, target)
+            table = invert if target in self.invert else None
+            if source != target or table is not None:
+                axes.append((index, AXIS_BYTES[source], table))
+        # (target byte, source byte, lookup table or None)
+        self.axis_moves = tuple(axes)
+
+    def apply(self, states: List[int]) -> None:
+        """
+        remap a normalized input report in place
+
+        Args:
+            states (list): input report without the bluetooth header byte
+        """
+        if self.axis_moves:
+            values = [states[source] for _, source, _ in self.axis_moves]
+            for (target, _, table), value in zip(self.axis_moves, values):
+                states[target] = table[value] if table is not None else value
+        if self.remaps_buttons:
+            tables = self.tables
+            bits = tables[0][states[8]] | tables[1][states[9]] | tables[2][states[10]]
+            states[8] = self.first_byte[bits & 0xFF]
+            states[9] = (bits >> 8) & 0xFF
+            states[10] = (bits >> 16) & 0xFF
@@ -0,0 +1,182 @@
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Optional
+
+from .pydualsense import DSBattery, DSState
+from .snapshot import SNAPSHOT, pack_state, unpack_state
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+# segment layout: header, snapshot, raw input report
+HEADER = struct.Struct(
+    "<I"  # sequence counter of the seqlock
+    "I"  # reserved, always 0. Keeps the following fields 8 byte aligned
+    "Q"  # report counter
+    "d"  # host timestamp
+)
+SEQUENCE_OFFSET = 0
+SNAPSHOT_OFFSET = HEADER.size
+RAW_OFFSET = SNAPSHOT_OFFSET + SNAPSHOT.size
+RAW_SIZE = 64  # input report in the USB layout
+SEGMENT_SIZE = RAW_OFFSET + RAW_SIZE
+
+_SEQUENCE = struct.Struct("<I")
+
+
+class SharedStatePublisher:
+    """
+    Publishes every decoded report of a controller into a shared memory segment so other processes on the
+    same host can read the live state without owning the HID device.
+
+    The segment is protected by a seqlock: the sequence counter is odd while a report is written, readers
+    retry until they copied the data between two equal even counter values.
+    """
+
+    def __init__(self, ds: "pydualsense", name: Optional[str] = None) -> None:
+        """
+        create the segment and start publishing
+
+        Args:
+            ds (pydualsense): initialized controller
+            name (str, optional): name of the shared memory segment. Defaults to None (random name).
+        """
+        self.ds = ds
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=SEGMENT_SIZE)
+        self.name = self.shm.name
+        assert self.shm.buf is not None
+        self._buffer: memoryview = self.shm.buf
+        self._sequence = 0
+        self._count = 0
+        ds.addReportHook(self.update)
+
+    def update(self, ds: "pydualsense") -> None:
+        """
+        report hook, writes the current report into the segment
+
+        Args:
+            ds (pydualsense): controller that received the report
+        """
+        buffer = self._buffer
+        sequence = self._sequence + 1
+        self._count += 1
+        # odd sequence, write in progress
+        HEADER.pack_into(buffer, 0, sequence & 0xFFFFFFFF, 0, self._count, time.time())
+        pack_state(ds, buffer, SNAPSHOT_OFFSET)
+        if ds.states is not None:
+            buffer[RAW_OFFSET:RAW_OFFSET + RAW_SIZE] = bytes(ds.states[:RAW_SIZE])
+
+        self._sequence = sequence + 1
+        # even sequence, consistent again
+        _SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, self._sequence & 0xFFFFFFFF)
+
+    def close(self) -> None:
+        """
+        stop publishing and remove the segment
+        """
+        self.ds.removeReportHook(self.update)
+        self._buffer.release()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedStateReader:
+    """
+    Reads the state published by a :class:`SharedStatePublisher`, possibly in another process
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        attach to a published segment
+
+        Args:
+            name (str): name of the segment, see :attr:`SharedStatePublisher.name`
+        """
+        # only the publisher owns the segment, readers must not unlink it on exit
+        if sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            try:
+                from multiprocessing import resource_tracker
+
+                resource_tracker.unregister(self.shm._name, "shared_memory")  # type: ignore[attr-defined]
+            except (ImportError, AttributeError, KeyError):
+                pass
+        assert self.shm.buf is not None
+        self._buffer: memoryview = self.shm.buf
+        self._local = bytearray(SEGMENT_SIZE)
+        self.state = DSState()
+        self.battery = DSBattery()
+        self.count = 0  # report counter of the last read
+        self.timestamp = 0.0  # host time of the last read report
+        self.raw = b""  # raw input report of the last read
+
+    @property
+    def published(self) -> int:
+        """number of reports published so far"""
+        return HEADER.unpack_from(self._buffer)[2]  # type: ignore[no-any-return]
+
+    def read(self, timeout: float = 1.0) -> DSState:
+        """
+        copy a consistent version of the latest report
+
+        Args:
+            timeout (float, optional): maximum time in seconds to wait for a write in progress. Defaults to 1.0.
+
+        Raises:
+            TimeoutError: the publisher did not finish its write in time, e.g. it died in the middle of it
+
+        Returns:
+            DSState: the state, also available as :attr:`state`
+        """
+        buffer, local = self._buffer, self._local
+        deadline = None
+        while True:
+            before = _SEQUENCE.unpack_from(buffer, SEQUENCE_OFFSET)[0]
+            if not before & 1:
+                local[:] = buffer[:SEGMENT_SIZE]
+                if _SEQUENCE.unpack_from(buffer, SEQUENCE_OFFSET)[0] == before:
+                    break
+            # a write takes microseconds, give the publisher the cpu instead of spinning
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() >= deadline:
+                raise TimeoutError("shared state is still being written, the publisher may have died")
+            time.sleep(0)
+
+        _, _, self.count, self.timestamp = HEADER.unpack_from(local)
+        _, self.battery = unpack_state(local, SNAPSHOT_OFFSET, self.state)
+        self.raw = bytes(local[RAW_OFFSET:RAW_OFFSET + RAW_SIZE])
+        return self.state
+
+    def wait(self, timeout: Optional[float] = None, poll_interval: float = 0.0005) -> bool:
+        """
+        wait until a report newer than the last read one is published and read it
+
+        Args:
+            timeout (float, optional): maximum wait in seconds. Defaults to None (wait forever).
+            poll_interval (float, optional): sleep between two checks in seconds. Defaults to 0.0005.
+
+        Raises:
+            TimeoutError: the publisher stopped in the middle of a write, see :meth:`read`
+
+        Returns:
+            bool: True if a new report was read, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.published == self.count:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        self.read()
+        return True
+
+    def close(self) -> None:
+        """
+        detach from the segment
+        """
+        self._buffer.release()
+        self.shm.close()
@@ -0,0 +1,338 @@
+import random
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .checksum import INPUT_SEED, OUTPUT_SEED
+from .constants import ACCEL_RES_PER_G, TIMESTAMP_RES
+from .enums import Button, ConnectionType
+
+USB_REPORT_LENGTH = 64
+BT_REPORT_LENGTH = 78
+
+# hat value of the dpad Button bits, 8 is released
+_HAT = {
+    0: 8,
+    int(Button.DpadUp): 0,
+    int(Button.DpadUp | Button.DpadRight): 1,
+    int(Button.DpadRight): 2,
+    int(Button.DpadDown | Button.DpadRight): 3,
+    int(Button.DpadDown): 4,
+    int(Button.DpadDown | Button.DpadLeft): 5,
+    int(Button.DpadLeft): 6,
+    int(Button.DpadUp | Button.DpadLeft): 7,
+}
+
+# raw gravity on the accelerometer Y axis of a controller lying flat
+GRAVITY = ACCEL_RES_PER_G
+
+
+class SimulatedOutput:
+    """
+    Decoded state of the last output report written to a :class:`SimulatedDualSense`
+    """
+
+    def __init__(self) -> None:
+        self.rightMotor = 0
+        self.leftMotor = 0
+        self.microphone_led = 0
+        self.microphone_mute = False
+        self.triggerR: Tuple[int, Tuple[int, ...]] = (0, (0,) * 7)  # mode, forces
+        self.triggerL: Tuple[int, Tuple[int, ...]] = (0, (0,) * 7)
+        self.ledOption = 0
+        self.pulseOptions = 0
+        self.brightness = 0
+        self.playerNumber = 0
+        self.color = (0, 0, 0)
+
+
+class SimulatedDualSense:
+    """
+    Simulated controller with the interface of ``hidapi.Device``, pass it to
+    :func:`init() <pydualsense.pydualsense.init>` to test without hardware.
+
+    Input reports are generated at a fixed rate with noisy motion data, the sticks, triggers, buttons and
+    touch points can be set directly or played from a script. Output reports are decoded into
+    :attr:`output`, bluetooth reports carry valid checksums in both directions.
+    """
+
+    def __init__(
+        self,
+        connection: ConnectionType = ConnectionType.USB,
+        rate: float = 250.0,
+        realtime: bool = True,
+        imu_noise: float = 2.0,
+        serial: str = "00:00:00:00:00:01",
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        create the simulated controller
+
+        Args:
+            connection (ConnectionType, optional): USB or BT report format. Defaults to ConnectionType.USB.
+            rate (float, optional): input reports per second. Defaults to 250.0.
+            realtime (bool, optional): pace the reports at ``rate``, False returns them as fast as they are read. Defaults to True.
+            imu_noise (float, optional): standard deviation of the motion noise in raw units. Defaults to 2.0.
+            serial (str, optional): serial number (MAC address). Defaults to "00:00:00:00:00:01".
+            seed (int, optional): seed of the noise. Defaults to None.
+
+        Raises:
+            Exception: connection type is not USB or BT
+        """
+        if connection not in (ConnectionType.USB, ConnectionType.BT):
+            raise Exception("connection needs to be ConnectionType.USB or ConnectionType.BT")
+        self.connection = connection
+        self.rate = rate
+        self.realtime = realtime
+        self.imu_noise = imu_noise
+        self.serial = serial
+        self.closed = False
+
+        # simulated inputs
+        self.buttons = 0  # Button bits
+        self.LX = self.LY = self.RX = self.RY = 0  # -128..127
+        self.L2 = self.R2 = 0  # 0..255
+        self.gyro = (0, 0, 0)  # pitch, yaw, roll without noise
+        self.accelerometer = (0, GRAVITY, 0)
+        self.touch: List[Optional[Tuple[int, int]]] = [None, None]
+        self.battery = 0x08  # discharging, level 85 %
+
+        self.output = SimulatedOutput()
+        self.reports_sent = 0
+        self.writes = 0
+        self.crc_errors = 0
+
+        self._random = random.Random(seed)
+        self._touch_ids = [0, 0]
+        self._script: Sequence[Tuple[float, Dict[str, Any]]] = ()
+        self._script_loop = False
+        self._script_start = 0.0
+        self._script_index = 0
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+
+    # input simulation
+
+    def setTouch(self, slot: int, x: int, y: int) -> None:
+        """
+        put a finger on the touchpad
+
+        Args:
+            slot (int): touch slot 0 or 1
+            x (int): x position 0..1919
+            y (int): y position 0..1079
+        """
+        if self.touch[slot] is None:
+            # every new touch gets a new id
+            self._touch_ids[slot] = (max(self._touch_ids) + 1) & 0x7F
+        self.touch[slot] = (x, y)
+
+    def releaseTouch(self, slot: int) -> None:
+        """
+        lift the finger of a touch slot
+
+        Args:
+            slot (int): touch slot 0 or 1
+        """
+        self.touch[slot] = None
+
+    def playScript(self, steps: Sequence[Tuple[float, Dict[str, Any]]], loop: bool = False) -> None:
+        """
+        play a script of input changes, relative to the simulated time of the next report
+
+        Args:
+            steps (list): (seconds, {attribute: value}) pairs sorted by time. The attributes are the inputs of
+                this class, ``touch0``/``touch1`` take an (x, y) tuple or None.
+            loop (bool, optional): restart the script after the last step. Defaults to False.
+        """
+        with self._lock:
+            self._script = tuple(steps)
+            self._script_loop = loop
+            self._script_start = self.reports_sent / self.rate
+            self._script_index = 0
+
+    def _runScript(self, now: float) -> None:
+        script = self._script
+        while script:
+            if self._script_index >= len(script):
+                if not self._script_loop:
+                    self._script = ()
+                    return
+                self._script_start += script[-1][0]
+                self._script_index = 0
+            at, changes = script[self._script_index]
+            if now - self._script_start < at:
+                return
+            for name, value in changes.items():
+                if name in ("touch0", "touch1"):
+                    slot = int(name[-1])
+                    if value is None:
+                        self.releaseTouch(slot)
+                    else:
+                        self.setTouch(slot, *value)
+                else:
+                    setattr(self, name, value)
+            self._script_index += 1
+
+    def _inputReport(self) -> bytes:
+        """
+        build the next input report
+        """
+        with self._lock:
+            now = self.reports_sent / self.rate
+            self._runScript(now)
+
+            offset = 0 if self.connection == ConnectionType.USB else 1
+            report = bytearray(BT_REPORT_LENGTH if offset else USB_REPORT_LENGTH)
+            if offset:
+                report[0] = 0x31
+                report[1] = (self.reports_sent & 0x0F) << 4
+            else:
+                report[0] = 0x01
+            states = memoryview(report)[offset:]
+
+            states[1] = self.LX + 128
+            states[2] = self.LY + 128
+            states[3] = self.RX + 128
+            states[4] = self.RY + 128
+            states[5] = self.L2
+            states[6] = self.R2
+            states[7] = self.reports_sent & 0xFF
+
+            buttons = int(self.buttons)
+            states[8] = _HAT.get(buttons & 0x0F, 8) | (buttons & 0xF0)
+            states[9] = (buttons >> 8) & 0xFF
+            states[10] = ((buttons >> 16) & 0x07) | ((buttons >> 16) & 0xF0)
+
+            noise = self.imu_noise
+            gauss = self._random.gauss
+            for index, value in enumerate(self.gyro + self.accelerometer):
+                if noise:
+                    value = round(value + gauss(0.0, noise))
+                value = max(-32768, min(32767, value))
+                states[16 + 2 * index:18 + 2 * index] = value.to_bytes(2, "little", signed=True)
+            states[28:32] = (int(now * TIMESTAMP_RES) & 0xFFFFFFFF).to_bytes(4, "little")
+
+            for slot, base in ((0, 33), (1, 37)):
+                point = self.touch[slot]
+                if point is None:
+                    states[base] = 0x80 | self._touch_ids[slot]
+                    continue
+                x, y = point
+                states[base] = self._touch_ids[slot]
+                states[base + 1] = x & 0xFF
+                states[base + 2] = ((x >> 8) & 0x0F) | ((y & 0x0F) << 4)
+                states[base + 3] = (y >> 4) & 0xFF
+
+            states[53] = self.battery
+            states.release()
+
+            if offset:
+                report[74:78] = zlib.crc32(bytes(report[:74]), INPUT_SEED).to_bytes(4, "little")
+            self.reports_sent += 1
+            return bytes(report)
+
+    # hidapi.Device interface
+
+    def read(self, length: int, timeout_ms: int = 0, blocking: bool = False) -> Optional[bytes]:
+        """
+        next input report, paced at the report rate in realtime mode
+
+        Args:
+            length (int): maximum length of the report
+            timeout_ms (int, optional): longest wait in milliseconds, 0 waits until the next report. Defaults to 0.
+            blocking (bool, optional): ignored. Defaults to False.
+
+        Raises:
+            OSError: the device was closed
+
+        Returns:
+            bytes: the report, None on timeout
+        """
+        if self.closed:
+            raise OSError("simulated device is closed")
+        if self.realtime:
+            wait = self._start + self.reports_sent / self.rate - time.monotonic()
+            if timeout_ms and wait > timeout_ms / 1000:
+                time.sleep(timeout_ms / 1000)
+                return None
+            if wait > 0:
+                time.sleep(wait)
+        return self._inputReport()[:length]
+
+    def write(self, data: bytes) -> int:
+        """
+        decode an output report into :attr:`output`
+
+        Args:
+            data (bytes): USB or BT output report
+
+        Raises:
+            OSError: the device was closed
+
+        Returns:
+            int: number of written bytes
+        """
+        if self.closed:
+            raise OSError("simulated device is closed")
+        self.writes += 1
+        if data[0] == 0x31:
+            if zlib.crc32(bytes(data[:74]), OUTPUT_SEED) != int.from_bytes(data[74:78], "little"):
+                self.crc_errors += 1
+                return len(data)
+            offset = 1
+        else:
+            offset = 0
+        report = data[offset:]
+        output = self.output
+        output.rightMotor = report[3]
+        output.leftMotor = report[4]
+        output.microphone_led = report[9]
+        output.microphone_mute = report[10] == 0x10
+        output.triggerR = (report[11], (*report[12:18], report[20]))
+        output.triggerL = (report[22], (*report[23:29], report[31]))
+        output.ledOption = report[39]
+        output.pulseOptions = report[42]
+        output.brightness = report[43]
+        output.playerNumber = report[44]
+        output.color = (report[45], report[46], report[47])
+        return len(data)
+
+    def get_feature_report(self, report_id: int, length: int) -> bytes:
+        """
+        feature reports, without the report id
+
+        Args:
+            report_id (int): report id
+            length (int): length including the report id
+
+        Returns:
+            bytes: report data
+        """
+        data = bytearray(length - 1)
+        if report_id == 0x05:
+            # motion calibration: gyro biases, gyro ranges, gyro speed, accelerometer ranges
+            values = (0, 0, 0, 8800, -8800, 8800, -8800, 8800, -8800, 540, 540, 8192, -8192, 8192, -8192, 8192, -8192)
+            for index, value in enumerate(values):
+                data[2 * index:2 * index + 2] = value.to_bytes(2, "little", signed=True)
+        elif report_id == 0x09:
+            # pairing info, MAC address in reverse byte order
+            mac = bytes(int(part, 16) for part in self.serial.split(":"))
+            data[0:6] = mac[::-1]
+        elif report_id == 0x20:
+            # firmware info: build date and time, hardware and firmware version
+            data[0:11] = b"Jan  1 2024"
+            data[11:19] = b"00:00:00"
+            data[23:27] = (0x00000400).to_bytes(4, "little")
+            data[27:31] = (0x00010000).to_bytes(4, "little")
+        return bytes(data)
+
+    def send_feature_report(self, data: bytes, report_id: int = 0) -> int:
+        return len(data)
+
+    def get_serial_number_string(self) -> str:
+        return self.serial
+
+    def close(self) -> None:
+        self.closed = True
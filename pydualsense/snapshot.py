@@ -0,0 +1,206 @@
+import struct
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from .enums import BatteryState
+from .pydualsense import DSBattery, DSState
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+# DSState attributes of the Button bits in the packed snapshot
+BUTTON_FIELDS = (
+    "DpadUp", "DpadRight", "DpadDown", "DpadLeft",
+    "square", "cross", "circle", "triangle",
+    "L1", "R1", "L2Btn", "R2Btn", "share", "options", "L3", "R3",
+    "ps", "touchBtn", "micBtn", None, "L4", "R4", "L5", "R5",
+)
+
+# fixed layout of the decoded state
+SNAPSHOT = struct.Struct(
+    "<I"  # buttons, see Button
+    "bbbb"  # LX, LY, RX, RY
+    "BB"  # L2_value, R2_value
+    "BB"  # battery state, battery level
+    "hhh"  # gyro pitch, yaw, roll
+    "hhh"  # accelerometer x, y, z
+    "I"  # sensor timestamp
+    "BBHH"  # first touch: active, id, x, y
+    "BBHH"  # second touch
+)
+
+
+def _layout(*fields: Tuple[str, str]) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    name, offset and size of consecutive fields of the snapshot
+    """
+    layout = []
+    offset = 0
+    for name, field_format in fields:
+        size = struct.calcsize("<" + field_format)
+        layout.append((name, offset, size))
+        offset += size
+    if offset != SNAPSHOT.size:
+        raise Exception("snapshot fields don't match the snapshot layout")
+    return tuple(layout)
+
+
+# fields of the snapshot for delta frames: name, offset, size
+SNAPSHOT_FIELDS = _layout(
+    ("buttons", "I"),
+    ("sticks", "bbbb"),
+    ("triggers", "BB"),
+    ("battery", "BB"),
+    ("gyro", "hhh"),
+    ("accelerometer", "hhh"),
+    ("timestamp", "I"),
+    ("touch0", "BBHH"),
+    ("touch1", "BBHH"),
+)
+
+# frames of the wire format: header, then the whole snapshot (full frame) or the fields in the mask (delta frame)
+FRAME_VERSION = 1
+FRAME_FULL = 0
+FRAME_DELTA = 1
+FRAME_HEADER = struct.Struct(
+    "<H"  # payload length
+    "B"  # version
+    "B"  # kind, FRAME_FULL or FRAME_DELTA
+    "H"  # mask of the fields in a delta frame, bit n is SNAPSHOT_FIELDS[n]
+    "I"  # sequence number
+)
+
+
+def pack_state(ds: "pydualsense", buffer: Union[bytearray, memoryview], offset: int = 0) -> None:
+    """
+    pack the current state and battery of a controller into a buffer
+
+    Args:
+        ds (pydualsense): controller
+        buffer (bytearray): writable buffer (or memoryview) with at least ``SNAPSHOT.size`` bytes after offset
+        offset (int, optional): position in the buffer. Defaults to 0.
+    """
+    state = ds.state
+    touch0, touch1 = state.trackPadTouch0, state.trackPadTouch1
+    gyro, accel = state.gyro, state.accelerometer
+    SNAPSHOT.pack_into(
+        buffer, offset,
+        state.buttons,
+        state.LX, state.LY, state.RX, state.RY,
+        state.L2_value, state.R2_value,
+        ds.battery.State, ds.battery.Level,
+        gyro.Pitch, gyro.Yaw, gyro.Roll,
+        accel.X, accel.Y, accel.Z,
+        state.sensorTimestamp,
+        touch0.isActive, touch0.ID, touch0.X, touch0.Y,
+        touch1.isActive, touch1.ID, touch1.X, touch1.Y,
+    )
+
+
+def unpack_state(
+    buffer: Union[bytes, bytearray, memoryview], offset: int = 0, state: Optional[DSState] = None
+) -> Tuple[DSState, DSBattery]:
+    """
+    unpack a snapshot into DSState and DSBattery objects
+
+    Args:
+        buffer (bytes): buffer holding the snapshot
+        offset (int, optional): position in the buffer. Defaults to 0.
+        state (DSState, optional): state object to update instead of creating a new one. Defaults to None.
+
+    Returns:
+        tuple: the state and the battery
+    """
+    (
+        buttons,
+        lx, ly, rx, ry,
+        l2, r2,
+        battery_state, battery_level,
+        pitch, yaw, roll,
+        ax, ay, az,
+        timestamp,
+        active0, id0, x0, y0,
+        active1, id1, x1, y1,
+    ) = SNAPSHOT.unpack_from(buffer, offset)
+
+    if state is None:
+        state = DSState()
+    state.buttons = buttons
+    for bit, name in enumerate(BUTTON_FIELDS):
+        if name is not None:
+            setattr(state, name, bool(buttons & (1 << bit)))
+    state.LX, state.LY, state.RX, state.RY = lx, ly, rx, ry
+    state.L2_value, state.R2_value = l2, r2
+    state.L2, state.R2 = bool(l2), bool(r2)
+    state.gyro.Pitch, state.gyro.Yaw, state.gyro.Roll = pitch, yaw, roll
+    state.accelerometer.X, state.accelerometer.Y, state.accelerometer.Z = ax, ay, az
+    state.sensorTimestamp = timestamp
+    touch0, touch1 = state.trackPadTouch0, state.trackPadTouch1
+    touch0.isActive, touch0.ID, touch0.X, touch0.Y = bool(active0), id0, x0, y0
+    touch1.isActive, touch1.ID, touch1.X, touch1.Y = bool(active1), id1, x1, y1
+
+    battery = DSBattery()
+    battery.State = BatteryState(battery_state)
+    battery.Level = battery_level
+    return state, battery
+
+
+def encode_frame(snapshot: bytes, previous: Optional[bytes] = None, sequence: int = 0) -> bytes:
+    """
+    encode a packed snapshot as a frame of the wire format
+
+    Args:
+        snapshot (bytes): snapshot packed with :func:`pack_state`
+        previous (bytes, optional): snapshot the receiver has, only the changed fields are sent.
+            Defaults to None (full frame).
+        sequence (int, optional): sequence number of the frame. Defaults to 0.
+
+    Returns:
+        bytes: the frame
+    """
+    if previous is None:
+        return FRAME_HEADER.pack(len(snapshot), FRAME_VERSION, FRAME_FULL, 0, sequence & 0xFFFFFFFF) + snapshot
+    mask = 0
+    parts = []
+    for bit, (_, offset, size) in enumerate(SNAPSHOT_FIELDS):
+        if snapshot[offset:offset + size] != previous[offset:offset + size]:
+            mask |= 1 << bit
+            parts.append(snapshot[offset:offset + size])
+    payload = b"".join(parts)
+    return FRAME_HEADER.pack(len(payload), FRAME_VERSION, FRAME_DELTA, mask, sequence & 0xFFFFFFFF) + payload
+
+
+def decode_frame(header: bytes, payload: bytes, snapshot: bytearray) -> int:
+    """
+    apply a frame to the snapshot of the receiver
+
+    Args:
+        header (bytes): ``FRAME_HEADER.size`` bytes of the frame
+        payload (bytes): the payload, as long as given in the header
+        snapshot (bytearray): ``SNAPSHOT.size`` bytes, updated in place
+
+    Raises:
+        Exception: unsupported version, unknown kind or wrong payload length
+
+    Returns:
+        int: sequence number of the frame
+    """
+    length, version, kind, mask, sequence = FRAME_HEADER.unpack(header)
+    if version != FRAME_VERSION:
+        raise Exception(f"unsupported frame version {version}")
+    if len(payload) != length:
+        raise Exception("frame payload is truncated")
+    if kind == FRAME_FULL:
+        if length != SNAPSHOT.size:
+            raise Exception("full frame has the wrong size")
+        snapshot[:] = payload
+        return sequence  # type: ignore[no-any-return]
+    if kind != FRAME_DELTA:
+        raise Exception(f"unknown frame kind {kind}")
+    position = 0
+    for bit, (_, offset, size) in enumerate(SNAPSHOT_FIELDS):
+        if mask & (1 << bit):
+            snapshot[offset:offset + size] = payload[position:position + size]
+            position += size
+    if position != length:
+        raise Exception("delta frame has the wrong size")
+    return sequence  # type: ignore[no-any-return]
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import struct
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from .pydualsense import DSBattery, DSState
+from .snapshot import FRAME_HEADER, SNAPSHOT, decode_frame, encode_frame, pack_state, unpack_state
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+logger = logging.getLogger(__name__)
+
+# clients may send a rate request at any time: reports per second as float, 0 is the server rate
+RATE_REQUEST = struct.Struct("<f")
+
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter, interval: float) -> None:
+        self.writer = writer
+        self.interval = interval
+        self.due = 0.0
+        self.previous: Optional[bytes] = None  # snapshot the client has
+
+
+class StateStreamServer:
+    """
+    Streams the state of a controller to TCP clients in the binary frame format of :mod:`pydualsense.snapshot`.
+
+    Every client first gets a full frame and then delta frames with the changed fields, at most at its own
+    rate. Clients with the same previous snapshot share the encoded frame. Frames are written without waiting
+    for the client, a client whose unsent data grows above ``max_buffer`` is disconnected instead of slowing
+    down the others.
+    """
+
+    def __init__(
+        self,
+        ds: "pydualsense",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate: float = 60.0,
+        max_buffer: int = 65536,
+    ) -> None:
+        """
+        Args:
+            ds (pydualsense): initialized controller
+            host (str, optional): address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): port to listen on, 0 picks a free one. Defaults to 0.
+            rate (float, optional): highest frames per second and client. Defaults to 60.0.
+            max_buffer (int, optional): unsent bytes after which a client is dropped. Defaults to 65536.
+
+        Raises:
+            Exception: rate is not positive
+        """
+        if rate <= 0:
+            raise Exception("rate needs to be positive")
+        self.ds = ds
+        self.host = host
+        self.port = port
+        self.interval = 1.0 / rate
+        self.max_buffer = max_buffer
+
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.dropped_clients = 0
+
+        self._clients: Dict[asyncio.StreamWriter, _Client] = {}
+        self._packed = bytearray(SNAPSHOT.size)
+        # newest snapshot, replaced as a whole by the report thread
+        self._latest: Optional[Tuple[int, bytes]] = None
+        self._sequence = 0
+        self._server: Optional[asyncio.Server] = None
+        self._broadcaster: Optional[asyncio.Task[None]] = None
+        self._handlers: Set[asyncio.Task[Any]] = set()
+
+    @property
+    def clients(self) -> int:
+        """connected clients"""
+        return len(self._clients)
+
+    def update(self, ds: "pydualsense") -> None:
+        """
+        report hook, packs the current state
+
+        Args:
+            ds (pydualsense): controller that received the report
+        """
+        pack_state(ds, self._packed)
+        self._sequence += 1
+        self._latest = (self._sequence, bytes(self._packed))
+
+    async def start(self) -> None:
+        """
+        start listening and streaming, :attr:`port` is the bound port afterwards
+        """
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.ds.addReportHook(self.update)
+        self._broadcaster = asyncio.get_running_loop().create_task(self._broadcast())
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = self._clients[writer] = _Client(writer, self.interval)
+        task = asyncio.current_task()
+        assert task is not None
+        self._handlers.add(task)
+        try:
+            while True:
+                (rate,) = RATE_REQUEST.unpack(await reader.readexactly(RATE_REQUEST.size))
+                client.interval = max(1.0 / rate, self.interval) if rate > 0 else self.interval
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._drop(writer)
+            self._handlers.discard(task)
+
+    def _drop(self, writer: asyncio.StreamWriter) -> None:
+        if self._clients.pop(writer, None) is not None:
+            writer.close()
+
+    async def _broadcast(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            latest = self._latest
+            if latest is None or not self._clients:
+                continue
+            sequence, snapshot = latest
+            now = time.monotonic()
+            # encoded frames by the snapshot the clients have
+            frames: Dict[Optional[int], bytes] = {}
+            slow: List[asyncio.StreamWriter] = []
+            for writer, client in self._clients.items():
+                if now < client.due:
+                    continue
+                if snapshot == client.previous:
+                    # nothing changed, frames are shared by the identity of the previous snapshot
+                    client.previous = snapshot
+                    continue
+                key = None if client.previous is None else id(client.previous)
+                frame = frames.get(key)
+                if frame is None:
+                    frame = frames[key] = encode_frame(snapshot, client.previous, sequence)
+                writer.write(frame)
+                client.previous = snapshot
+                client.due = max(client.due + client.interval, now)
+                self.frames_sent += 1
+                self.bytes_sent += len(frame)
+                if writer.transport.get_write_buffer_size() > self.max_buffer:
+                    slow.append(writer)
+            for writer in slow:
+                logger.info("dropping slow client %s", writer.get_extra_info("peername"))
+                self.dropped_clients += 1
+                self._drop(writer)
+
+    async def close(self) -> None:
+        """
+        stop streaming and disconnect all clients
+        """
+        self.ds.removeReportHook(self.update)
+        tasks = list(self._handlers)
+        if self._broadcaster is not None:
+            self._broadcaster.cancel()
+            tasks.append(self._broadcaster)
+        for writer in list(self._clients):
+            self._drop(writer)
+        # the connection handlers end with the closed connections
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class StateStreamClient:
+    """
+    Receives the state streamed by a :class:`StateStreamServer`
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.state = DSState()
+        self.battery = DSBattery()
+        self.sequence = 0  # sequence number of the last frame
+        self.frames = 0
+        self._snapshot = bytearray(SNAPSHOT.size)
+
+    @classmethod
+    async def connect(cls, host: str, port: int, rate: Optional[float] = None) -> "StateStreamClient":
+        """
+        connect to a server
+
+        Args:
+            host (str): server address
+            port (int): server port
+            rate (float, optional): frames per second to ask for. Defaults to None (server rate).
+
+        Returns:
+            StateStreamClient: the connected client
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        if rate is not None:
+            await client.setRate(rate)
+        return client
+
+    async def setRate(self, rate: float) -> None:
+        """
+        ask the server for another rate, capped at the server rate
+
+        Args:
+            rate (float): frames per second, 0 is the server rate
+        """
+        self.writer.write(RATE_REQUEST.pack(rate))
+        await self.writer.drain()
+
+    async def read(self) -> DSState:
+        """
+        wait for the next frame and apply it
+
+        Raises:
+            asyncio.IncompleteReadError: the server closed the connection
+
+        Returns:
+            DSState: the state, also available as :attr:`state`
+        """
+        header = await self.reader.readexactly(FRAME_HEADER.size)
+        payload = await self.reader.readexactly(FRAME_HEADER.unpack(header)[0])
+        self.sequence = decode_frame(header, payload, self._snapshot)
+        self.frames += 1
+        _, self.battery = unpack_state(self._snapshot, 0, self.state)
+        return self.state
+
+    async def close(self) -> None:
+        """
+        disconnect
+        """
+        self.writer.close()
+        await self.writer.wait_closed()
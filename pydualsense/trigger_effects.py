@@ -0,0 +1,314 @@
+"""
+Library of adaptive trigger effects.
+
+Every effect is encoded to a :class:`TriggerEffect` holding the mode byte and the 7 force parameters
+of :class:`DSTrigger <pydualsense.pydualsense.DSTrigger>`. The trigger has 10 zones from the
+resting position (0) to fully pressed (9); the multi zone effects pack per zone values into bitfields.
+
+Encodings are cached, applying the same parameterized effect again is a single lookup.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Sequence, Tuple
+
+from .enums import TriggerModes
+
+ZONES = 10
+
+# mode bytes of the multi zone effects. Some share their value with a TriggerModes member
+# (e.g. FEEDBACK is Rigid_A), they are kept here so the enum names stay unambiguous
+FEEDBACK = TriggerModes(0x21)
+BOW = TriggerModes(0x22)
+GALLOPING = TriggerModes(0x23)
+WEAPON = TriggerModes(0x25)
+VIBRATION = TriggerModes(0x26)
+MACHINE = TriggerModes(0x27)
+
+
+class TriggerEffect(NamedTuple):
+    """
+    encoded trigger effect, apply it with :func:`DSTrigger.setEffect <pydualsense.pydualsense.DSTrigger.setEffect>`
+    """
+
+    mode: TriggerModes
+    forces: Tuple[int, int, int, int, int, int, int]
+
+
+OFF = TriggerEffect(TriggerModes.Off, (0, 0, 0, 0, 0, 0, 0))
+
+
+def _encode(mode: TriggerModes, params: Sequence[int]) -> TriggerEffect:
+    """
+    map the 10 effect parameter bytes of the report to the 7 forces of :class:`DSTrigger`.
+    the forces 0..5 are the parameters 0..5 and force 6 is parameter 8, the others are never used
+    """
+    padded = [*params, *([0] * (ZONES - len(params)))]
+    return TriggerEffect(mode, (padded[0], padded[1], padded[2], padded[3], padded[4], padded[5], padded[8]))
+
+
+def _check_int(name: str, value: int, low: int, high: int) -> None:
+    if not isinstance(value, int):
+        raise TypeError(f"{name} needs to be type int")
+    if value < low or value > high:
+        raise Exception(f"{name} has to be in range {low}..{high}")
+
+
+def _zones(active: int, packed: int) -> Tuple[int, ...]:
+    """
+    parameter bytes of a 16 bit zone mask followed by 32 bits of packed 3 bit zone values
+    """
+    return (
+        active & 0xFF,
+        (active >> 8) & 0xFF,
+        packed & 0xFF,
+        (packed >> 8) & 0xFF,
+        (packed >> 16) & 0xFF,
+        (packed >> 24) & 0xFF,
+    )
+
+
+@lru_cache(maxsize=256, typed=True)
+def feedback(position: int, strength: int) -> TriggerEffect:
+    """
+    resistance of the same strength from the given zone to the end of the trigger
+
+    Args:
+        position (int): first zone with resistance 0..9
+        strength (int): resistance 0..8, 0 turns the effect off
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("position", position, 0, 9)
+    _check_int("strength", strength, 0, 8)
+    if strength == 0:
+        return OFF
+    return multiple_position_feedback((0,) * position + (strength,) * (ZONES - position))
+
+
+@lru_cache(maxsize=256, typed=True)
+def _multiple_position_feedback(strengths: Tuple[int, ...]) -> TriggerEffect:
+    if len(strengths) != ZONES:
+        raise Exception("10 zone strengths needed")
+    active = packed = 0
+    for zone, strength in enumerate(strengths):
+        _check_int("strength", strength, 0, 8)
+        if strength:
+            packed |= ((strength - 1) & 0x07) << (3 * zone)
+            active |= 1 << zone
+    if not active:
+        return OFF
+    return _encode(FEEDBACK, _zones(active, packed))
+
+
+def multiple_position_feedback(strengths: Sequence[int]) -> TriggerEffect:
+    """
+    resistance with an individual strength per zone
+
+    Args:
+        strengths (list): 10 resistance values 0..8, 0 leaves the zone free
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    return _multiple_position_feedback(tuple(strengths))
+
+
+@lru_cache(maxsize=256, typed=True)
+def slope_feedback(start: int, end: int, start_strength: int, end_strength: int) -> TriggerEffect:
+    """
+    resistance rising or falling linearly between two zones and holding the end strength afterwards
+
+    Args:
+        start (int): first zone with resistance 0..8
+        end (int): zone reaching the end strength, start+1..9
+        start_strength (int): resistance at the start zone 1..8
+        end_strength (int): resistance at the end zone 1..8
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("start", start, 0, 8)
+    _check_int("end", end, start + 1, 9)
+    _check_int("start_strength", start_strength, 1, 8)
+    _check_int("end_strength", end_strength, 1, 8)
+    slope = (end_strength - start_strength) / (end - start)
+    strengths = [0] * ZONES
+    for zone in range(start, ZONES):
+        if zone <= end:
+            strengths[zone] = round(start_strength + slope * (zone - start))
+        else:
+            strengths[zone] = end_strength
+    return _multiple_position_feedback(tuple(strengths))
+
+
+@lru_cache(maxsize=256, typed=True)
+def weapon(start: int, end: int, strength: int) -> TriggerEffect:
+    """
+    resistance between two zones that snaps free like a gun trigger
+
+    Args:
+        start (int): zone where the resistance starts 2..7
+        end (int): zone where the trigger snaps free, start+1..8
+        strength (int): resistance 0..8, 0 turns the effect off
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("start", start, 2, 7)
+    _check_int("end", end, start + 1, 8)
+    _check_int("strength", strength, 0, 8)
+    if strength == 0:
+        return OFF
+    zones = (1 << start) | (1 << end)
+    return _encode(WEAPON, (zones & 0xFF, (zones >> 8) & 0xFF, strength - 1))
+
+
+@lru_cache(maxsize=256, typed=True)
+def vibration(position: int, amplitude: int, frequency: int) -> TriggerEffect:
+    """
+    vibration of the same amplitude from the given zone to the end of the trigger
+
+    Args:
+        position (int): first vibrating zone 0..9
+        amplitude (int): vibration amplitude 0..8, 0 turns the effect off
+        frequency (int): vibration frequency in Hz 0..255, 0 turns the effect off
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("position", position, 0, 9)
+    _check_int("amplitude", amplitude, 0, 8)
+    _check_int("frequency", frequency, 0, 255)
+    if amplitude == 0 or frequency == 0:
+        return OFF
+    return _multiple_position_vibration(frequency, (0,) * position + (amplitude,) * (ZONES - position))
+
+
+@lru_cache(maxsize=256, typed=True)
+def _multiple_position_vibration(frequency: int, amplitudes: Tuple[int, ...]) -> TriggerEffect:
+    _check_int("frequency", frequency, 0, 255)
+    if len(amplitudes) != ZONES:
+        raise Exception("10 zone amplitudes needed")
+    active = packed = 0
+    for zone, amplitude in enumerate(amplitudes):
+        _check_int("amplitude", amplitude, 0, 8)
+        if amplitude:
+            packed |= ((amplitude - 1) & 0x07) << (3 * zone)
+            active |= 1 << zone
+    if not active or frequency == 0:
+        return OFF
+    return _encode(VIBRATION, (*_zones(active, packed), 0, 0, frequency))
+
+
+def multiple_position_vibration(frequency: int, amplitudes: Sequence[int]) -> TriggerEffect:
+    """
+    vibration with an individual amplitude per zone
+
+    Args:
+        frequency (int): vibration frequency in Hz 0..255, 0 turns the effect off
+        amplitudes (list): 10 amplitudes 0..8, 0 leaves the zone still
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    return _multiple_position_vibration(frequency, tuple(amplitudes))
+
+
+@lru_cache(maxsize=256, typed=True)
+def bow(start: int, end: int, strength: int, snap_force: int) -> TriggerEffect:
+    """
+    resistance between two zones that pushes the trigger back when released, like drawing a bow
+
+    Args:
+        start (int): zone where the resistance starts 0..8
+        end (int): zone where the resistance ends, start+1..8
+        strength (int): resistance 0..8, 0 turns the effect off
+        snap_force (int): force pushing the trigger back 0..8, 0 turns the effect off
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("start", start, 0, 8)
+    _check_int("end", end, start + 1, 8)
+    _check_int("strength", strength, 0, 8)
+    _check_int("snap_force", snap_force, 0, 8)
+    if strength == 0 or snap_force == 0:
+        return OFF
+    zones = (1 << start) | (1 << end)
+    force_pair = ((strength - 1) & 0x07) | (((snap_force - 1) & 0x07) << 3)
+    return _encode(BOW, (zones & 0xFF, (zones >> 8) & 0xFF, force_pair))
+
+
+@lru_cache(maxsize=256, typed=True)
+def galloping(start: int, end: int, first_foot: int, second_foot: int, frequency: int) -> TriggerEffect:
+    """
+    two short knocks per period between two zones, like a galloping horse
+
+    Args:
+        start (int): zone where the effect starts 0..8
+        end (int): zone where the effect ends, start+1..9
+        first_foot (int): timing of the first knock 0..6
+        second_foot (int): timing of the second knock, first_foot+1..7
+        frequency (int): repetitions per second 0..255, 0 turns the effect off
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("start", start, 0, 8)
+    _check_int("end", end, start + 1, 9)
+    _check_int("first_foot", first_foot, 0, 6)
+    _check_int("second_foot", second_foot, first_foot + 1, 7)
+    _check_int("frequency", frequency, 0, 255)
+    if frequency == 0:
+        return OFF
+    zones = (1 << start) | (1 << end)
+    time_and_ratio = (second_foot & 0x07) | ((first_foot & 0x07) << 3)
+    return _encode(GALLOPING, (zones & 0xFF, (zones >> 8) & 0xFF, time_and_ratio, frequency))
+
+
+@lru_cache(maxsize=256, typed=True)
+def machine(
+    start: int, end: int, amplitude_a: int, amplitude_b: int, frequency: int, period: int
+) -> TriggerEffect:
+    """
+    vibration between two zones alternating between two amplitudes, like a machine gun
+
+    Args:
+        start (int): zone where the effect starts 0..8
+        end (int): zone where the effect ends, start+1..9
+        amplitude_a (int): first amplitude 0..7
+        amplitude_b (int): second amplitude 0..7
+        frequency (int): vibration frequency in Hz 0..255, 0 turns the effect off
+        period (int): time between the amplitude switches in tenth of a second 0..255
+
+    Returns:
+        TriggerEffect: encoded effect
+    """
+    _check_int("start", start, 0, 8)
+    _check_int("end", end, start + 1, 9)
+    _check_int("amplitude_a", amplitude_a, 0, 7)
+    _check_int("amplitude_b", amplitude_b, 0, 7)
+    _check_int("frequency", frequency, 0, 255)
+    _check_int("period", period, 0, 255)
+    if frequency == 0:
+        return OFF
+    zones = (1 << start) | (1 << end)
+    strength_pair = (amplitude_a & 0x07) | ((amplitude_b & 0x07) << 3)
+    return _encode(MACHINE, (zones & 0xFF, (zones >> 8) & 0xFF, strength_pair, frequency, period))
+
+
+def decode(mode: int, forces: Sequence[int]) -> TriggerEffect:
+    """
+    build a :class:`TriggerEffect` from the mode and force bytes, e.g. as read back from an output report
+
+    Args:
+        mode (int): trigger mode byte
+        forces (list): the 7 force bytes
+
+    Returns:
+        TriggerEffect: the effect
+    """
+    if len(forces) != 7:
+        raise Exception("only 7 parameters available")
+    return TriggerEffect(TriggerModes(mode), tuple(forces))  # type: ignore[arg-type]
@@ -0,0 +1,225 @@
+import os
+import struct
+from operator import attrgetter
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .pydualsense import pydualsense
+
+# linux input event types and codes (linux/input-event-codes.h)
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+SYN_REPORT = 0
+
+BTN_SOUTH = 0x130
+BTN_EAST = 0x131
+BTN_NORTH = 0x133
+BTN_WEST = 0x134
+BTN_TL = 0x136
+BTN_TR = 0x137
+BTN_TL2 = 0x138
+BTN_TR2 = 0x139
+BTN_SELECT = 0x13A
+BTN_START = 0x13B
+BTN_MODE = 0x13C
+BTN_THUMBL = 0x13D
+BTN_THUMBR = 0x13E
+BTN_DPAD_UP = 0x220
+BTN_DPAD_DOWN = 0x221
+BTN_DPAD_LEFT = 0x222
+BTN_DPAD_RIGHT = 0x223
+BTN_TRIGGER_HAPPY1 = 0x2C0
+BTN_TRIGGER_HAPPY2 = 0x2C1
+BTN_TRIGGER_HAPPY3 = 0x2C2
+BTN_TRIGGER_HAPPY4 = 0x2C3
+
+ABS_X = 0x00
+ABS_Y = 0x01
+ABS_Z = 0x02
+ABS_RX = 0x03
+ABS_RY = 0x04
+ABS_RZ = 0x05
+
+# uinput ioctls (linux/uinput.h)
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+UI_SET_ABSBIT = 0x40045567
+
+BUS_VIRTUAL = 0x06
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+INPUT_EVENT = struct.Struct("llHHi")
+# struct uinput_user_dev: name, struct input_id, ff_effects_max, absmax, absmin, absfuzz, absflat
+UINPUT_USER_DEV = struct.Struct("80sHHHHi64i64i64i64i")
+
+# DSState attribute -> (event type, event code)
+DEFAULT_MAPPING: Dict[str, Tuple[int, int]] = {
+    "cross": (EV_KEY, BTN_SOUTH),
+    "circle": (EV_KEY, BTN_EAST),
+    "triangle": (EV_KEY, BTN_NORTH),
+    "square": (EV_KEY, BTN_WEST),
+    "L1": (EV_KEY, BTN_TL),
+    "R1": (EV_KEY, BTN_TR),
+    "L2Btn": (EV_KEY, BTN_TL2),
+    "R2Btn": (EV_KEY, BTN_TR2),
+    "share": (EV_KEY, BTN_SELECT),
+    "options": (EV_KEY, BTN_START),
+    "ps": (EV_KEY, BTN_MODE),
+    "L3": (EV_KEY, BTN_THUMBL),
+    "R3": (EV_KEY, BTN_THUMBR),
+    "DpadUp": (EV_KEY, BTN_DPAD_UP),
+    "DpadDown": (EV_KEY, BTN_DPAD_DOWN),
+    "DpadLeft": (EV_KEY, BTN_DPAD_LEFT),
+    "DpadRight": (EV_KEY, BTN_DPAD_RIGHT),
+    "LX": (EV_ABS, ABS_X),
+    "LY": (EV_ABS, ABS_Y),
+    "RX": (EV_ABS, ABS_RX),
+    "RY": (EV_ABS, ABS_RY),
+    "L2_value": (EV_ABS, ABS_Z),
+    "R2_value": (EV_ABS, ABS_RZ),
+}
+
+# mapping entries for the DualSense Edge back buttons
+EDGE_MAPPING: Dict[str, Tuple[int, int]] = {
+    "L4": (EV_KEY, BTN_TRIGGER_HAPPY1),
+    "R4": (EV_KEY, BTN_TRIGGER_HAPPY2),
+    "L5": (EV_KEY, BTN_TRIGGER_HAPPY3),
+    "R5": (EV_KEY, BTN_TRIGGER_HAPPY4),
+}
+
+# value range of the absolute axes, attributes not listed use the stick range
+ABS_RANGES: Dict[str, Tuple[int, int]] = {
+    "L2_value": (0, 255),
+    "R2_value": (0, 255),
+}
+STICK_RANGE = (-128, 127)
+
+
+class UInputBridge:
+    """
+    Re-emits the controller as a virtual Linux gamepad through uinput.
+
+    Each decoded report is compared against the previous one and all changed buttons and axes are
+    written with a single ``write()`` of input_event structs terminated by one SYN_REPORT. A frame the
+    device does not accept is dropped and counted, the next frame carries its changes.
+    """
+
+    def __init__(
+        self,
+        ds: "pydualsense",
+        mapping: Optional[Dict[str, Tuple[int, int]]] = None,
+        fd: Optional[int] = None,
+        name: str = "pydualsense virtual gamepad",
+    ) -> None:
+        """
+        create the virtual device and start forwarding reports of the controller
+
+        Args:
+            ds (pydualsense): initialized controller
+            mapping (dict, optional): DSState attribute to (event type, event code). Defaults to :data:`DEFAULT_MAPPING` (plus :data:`EDGE_MAPPING` for the Edge).
+            fd (int, optional): file descriptor the events are written to. If given no uinput device is created,
+                e.g. to write into a pipe for testing. Defaults to None (open ``/dev/uinput``).
+            name (str, optional): name of the virtual device. Defaults to "pydualsense virtual gamepad".
+        """
+        if mapping is None:
+            mapping = dict(DEFAULT_MAPPING)
+            if getattr(ds, "is_edge", False):
+                mapping.update(EDGE_MAPPING)
+
+        self.ds = ds
+        self.mapping = mapping
+        self.events_written = 0
+        self.writes = 0
+        self.dropped = 0  # frames the device did not accept
+
+        self._attrs = tuple(mapping)
+        self._types = tuple(mapping[attr][0] for attr in self._attrs)
+        self._codes = tuple(mapping[attr][1] for attr in self._attrs)
+        getter = attrgetter(*self._attrs)
+        # attrgetter returns a plain value instead of a tuple for a single attribute
+        self._getter = getter if len(self._attrs) > 1 else lambda state: (getter(state),)
+        self._last: Optional[Tuple[int, ...]] = None
+        # one event per mapped input and the SYN_REPORT, allocated once
+        self._buffer = bytearray(INPUT_EVENT.size * (len(self._attrs) + 1))
+        self._view = memoryview(self._buffer)
+
+        self._owns_fd = fd is None
+        self.fd = self._createDevice(name) if fd is None else fd
+
+        ds.addReportHook(self.update)
+
+    def _createDevice(self, name: str) -> int:
+        """
+        open /dev/uinput and register all mapped buttons and axes
+        """
+        import fcntl
+
+        fd = os.open("/dev/uinput", os.O_WRONLY | os.O_NONBLOCK)
+        absmax = [0] * 64
+        absmin = [0] * 64
+        for attr, (ev_type, code) in self.mapping.items():
+            if ev_type == EV_ABS:
+                absmin[code], absmax[code] = ABS_RANGES.get(attr, STICK_RANGE)
+        ev_types = set(self._types)
+        for ev_type in ev_types:
+            fcntl.ioctl(fd, UI_SET_EVBIT, ev_type)
+        for ev_type, code in self.mapping.values():
+            fcntl.ioctl(fd, UI_SET_KEYBIT if ev_type == EV_KEY else UI_SET_ABSBIT, code)
+
+        os.write(
+            fd,
+            UINPUT_USER_DEV.pack(
+                name.encode()[:79], BUS_VIRTUAL, 0x054C, 0x0CE6, 1, 0, *absmax, *absmin, *([0] * 64), *([0] * 64)
+            ),
+        )
+        fcntl.ioctl(fd, UI_DEV_CREATE)
+        return fd
+
+    def update(self, ds: "pydualsense") -> None:
+        """
+        report hook, writes the changes of the current report
+
+        Args:
+            ds (pydualsense): controller that received the report
+        """
+        values = self._getter(ds.state)
+        last = self._last
+        if values == last:
+            return
+
+        buffer = self._buffer
+        pack = INPUT_EVENT.pack_into
+        size = INPUT_EVENT.size
+        offset = 0
+        types, codes = self._types, self._codes
+        for i, value in enumerate(values):
+            if last is None or value != last[i]:
+                pack(buffer, offset, 0, 0, types[i], codes[i], int(value))
+                offset += size
+        pack(buffer, offset, 0, 0, EV_SYN, SYN_REPORT, 0)
+        offset += size
+
+        try:
+            os.write(self.fd, self._view[:offset])
+        except OSError:
+            # full event queue of the non blocking device. Raising here would look like a lost controller
+            # to the read loop, the changes are compared against the last written frame and sent again
+            self.dropped += 1
+            return
+        self._last = values
+        self.events_written += offset // size
+        self.writes += 1
+
+    def close(self) -> None:
+        """
+        stop forwarding and remove the virtual device
+        """
+        self.ds.removeReportHook(self.update)
+        if self._owns_fd:
+            import fcntl
+
+            fcntl.ioctl(self.fd, UI_DEV_DESTROY)
+            os.close(self.fd)
@@ -0,0 +1,336 @@
+import contextlib
+import multiprocessing
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional, Tuple
+
+# ring layout: header, then fixed size slots of (host timestamp, length, data)
+RING_HEADER = struct.Struct("<QQQ")  # pushed, popped, overruns
+SLOT_HEADER = struct.Struct("<dH")
+SLOT_DATA = 80  # longest report (bluetooth, 78 bytes) rounded up
+SLOT_SIZE = 96
+_INDEX = struct.Struct("<Q")
+_PUSHED, _POPPED, _OVERRUNS = 0, 8, 16
+
+# how long the child waits for an input report before it looks at the command ring and requests again
+CHILD_READ_TIMEOUT_MS = 2
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    attach to a segment of the parent. The spawned child shares the resource tracker of the parent, the
+    segment stays registered once and is unlinked by the parent
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class ReportRing:
+    """
+    Single producer, single consumer ring of reports in shared memory.
+
+    The producer only writes the pushed and overrun counters, the consumer only the popped counter, so no lock
+    is needed: a slot is filled before the pushed counter is published and read before the popped counter is.
+    A full ring drops the new report and counts an overrun.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int) -> None:
+        self.shm = shm
+        self.slots = slots
+        assert shm.buf is not None
+        self._buffer: memoryview = shm.buf
+
+    @staticmethod
+    def size(slots: int) -> int:
+        """bytes of a ring with this many slots"""
+        return RING_HEADER.size + slots * SLOT_SIZE
+
+    @property
+    def overruns(self) -> int:
+        """reports dropped because the ring was full"""
+        return _INDEX.unpack_from(self._buffer, _OVERRUNS)[0]  # type: ignore[no-any-return]
+
+    def __len__(self) -> int:
+        pushed, popped, _ = RING_HEADER.unpack_from(self._buffer)
+        return pushed - popped  # type: ignore[no-any-return]
+
+    def push(self, data: bytes, stamp: float) -> bool:
+        """
+        append a report, producer side
+
+        Args:
+            data (bytes): report, at most 80 bytes. Empty data marks the end of the stream.
+            stamp (float): host time (time.monotonic())
+
+        Returns:
+            bool: False if the ring was full and the report was dropped
+        """
+        buffer = self._buffer
+        pushed, popped, overruns = RING_HEADER.unpack_from(buffer)
+        if pushed - popped >= self.slots:
+            _INDEX.pack_into(buffer, _OVERRUNS, overruns + 1)
+            return False
+        offset = RING_HEADER.size + (pushed % self.slots) * SLOT_SIZE
+        SLOT_HEADER.pack_into(buffer, offset, stamp, len(data))
+        start = offset + SLOT_HEADER.size
+        buffer[start:start + len(data)] = data
+        _INDEX.pack_into(buffer, _PUSHED, pushed + 1)
+        return True
+
+    def pop(self) -> Optional[Tuple[float, bytes]]:
+        """
+        take the oldest report, consumer side
+
+        Returns:
+            tuple: host time and report, None if the ring is empty
+        """
+        buffer = self._buffer
+        pushed, popped, _ = RING_HEADER.unpack_from(buffer)
+        if pushed == popped:
+            return None
+        offset = RING_HEADER.size + (popped % self.slots) * SLOT_SIZE
+        stamp, length = SLOT_HEADER.unpack_from(buffer, offset)
+        start = offset + SLOT_HEADER.size
+        data = bytes(buffer[start:start + length])
+        _INDEX.pack_into(buffer, _POPPED, popped + 1)
+        return stamp, data
+
+    def clear(self) -> None:
+        """reset the counters, only before the other side uses the ring"""
+        self._buffer[:RING_HEADER.size] = bytes(RING_HEADER.size)
+
+    def release(self) -> None:
+        self._buffer.release()
+
+
+def _serve(
+    open_device: Callable[[], Any],
+    input_name: str,
+    output_name: str,
+    slots: int,
+    connection: Any,
+    wakeup: Any,
+) -> None:
+    """
+    child process: owns the device, moves input reports into the input ring and written reports from the output ring
+    """
+    input_shm, output_shm = _attach(input_name), _attach(output_name)
+    inputs, outputs = ReportRing(input_shm, slots), ReportRing(output_shm, slots)
+    try:
+        device = open_device()
+    except Exception as error:
+        connection.send(("error", str(error)))
+        return
+    connection.send(("ready", device.get_serial_number_string()))
+
+    running = True
+    try:
+        while running:
+            # feature reports and shutdown, rare and allowed to be slow
+            while connection.poll():
+                request = connection.recv()
+                if request[0] == "close":
+                    running = False
+                    break
+                try:
+                    if request[0] == "get_feature_report":
+                        connection.send(("ok", bytes(device.get_feature_report(request[1], request[2]))))
+                    else:
+                        connection.send(("ok", device.send_feature_report(request[1], request[2])))
+                except Exception as error:
+                    connection.send(("error", str(error)))
+
+            # every output report holds the complete output state, only the newest one is written
+            latest = None
+            report = outputs.pop()
+            while report is not None:
+                latest = report[1]
+                report = outputs.pop()
+            if latest is not None:
+                device.write(latest)
+            if not running:
+                break
+
+            data = device.read(SLOT_DATA, CHILD_READ_TIMEOUT_MS)
+            if data:
+                inputs.push(bytes(data), time.monotonic())
+                wakeup.set()
+    except OSError:
+        pass
+    finally:
+        # end of stream, the parent raises OSError like a lost device
+        inputs.push(b"", time.monotonic())
+        wakeup.set()
+        with contextlib.suppress(OSError):
+            device.close()
+        inputs.release()
+        outputs.release()
+        input_shm.close()
+        output_shm.close()
+
+
+class HIDWorker:
+    """
+    Device with the interface of ``hidapi.Device`` whose I/O runs in a child process.
+
+    The child reads the input reports as soon as they arrive, independent of the GIL of this process, and
+    queues them with their arrival time in a shared memory ring. Output reports go the other way through a
+    second ring and are written by the child, feature reports are forwarded over a pipe. Pass it to
+    :func:`init() <pydualsense.pydualsense.init>` or use ``pydualsense(out_of_process=True)``, decoding,
+    events and report hooks stay in this process and work as before.
+    """
+
+    def __init__(self, open_device: Callable[[], Any], slots: int = 256, timeout: float = 5.0) -> None:
+        """
+        start the child process and open the device in it
+
+        Args:
+            open_device (callable): picklable function opening the device in the child, e.g.
+                ``functools.partial(hidapi.Device, vendor_id=0x054C, product_id=0x0CE6)``
+            slots (int, optional): reports each ring holds. Defaults to 256.
+            timeout (float, optional): longest wait for the child to open the device in seconds. Defaults to 5.0.
+
+        Raises:
+            OSError: the device could not be opened or the child did not start
+        """
+        self.slots = slots
+        self.reports = 0  # input reports taken from the ring
+        self.latency = 0.0  # seconds the last input report spent in the ring
+        self.closed = False
+        self._released = False
+
+        size = ReportRing.size(slots)
+        self._input_shm = shared_memory.SharedMemory(create=True, size=size)
+        self._output_shm = shared_memory.SharedMemory(create=True, size=size)
+        self._inputs = ReportRing(self._input_shm, slots)
+        self._outputs = ReportRing(self._output_shm, slots)
+        self._inputs.clear()
+        self._outputs.clear()
+
+        context = multiprocessing.get_context("spawn")
+        self._connection, child_connection = context.Pipe()
+        # one request and its answer at a time, feature reports come from several threads
+        self._request_lock = threading.Lock()
+        self._wakeup = context.Event()
+        self._process = context.Process(
+            target=_serve,
+            args=(open_device, self._input_shm.name, self._output_shm.name, slots, child_connection, self._wakeup),
+            daemon=True,
+        )
+        self._process.start()
+
+        status, value = ("error", "worker did not start")
+        if self._connection.poll(timeout):
+            status, value = self._connection.recv()
+        if status != "ready":
+            self._shutdown()
+            raise OSError(f"worker could not open the device: {value}")
+        self.serial: Optional[str] = value
+
+    @property
+    def overruns(self) -> int:
+        """input reports the child dropped because this process did not keep up"""
+        return self._inputs.overruns
+
+    def read(self, length: int, timeout_ms: int = 0, blocking: bool = False) -> Optional[bytes]:
+        """
+        next input report from the child
+
+        Args:
+            length (int): maximum length of the report
+            timeout_ms (int, optional): longest wait in milliseconds, 0 waits until a report arrives. Defaults to 0.
+            blocking (bool, optional): ignored. Defaults to False.
+
+        Raises:
+            OSError: the device was lost or the child stopped
+
+        Returns:
+            bytes: the report, None on timeout
+        """
+        deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms else None
+        while True:
+            entry = self._inputs.pop()
+            if entry is None:
+                # clear before checking again, a report pushed in between sets it again
+                self._wakeup.clear()
+                entry = self._inputs.pop()
+            if entry is not None:
+                stamp, report = entry
+                if not report:
+                    self.closed = True
+                    raise OSError("worker lost the device")
+                self.reports += 1
+                self.latency = time.monotonic() - stamp
+                return report[:length]
+            if self.closed or not self._process.is_alive():
+                raise OSError("worker stopped")
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                return None
+            self._wakeup.wait(wait)
+
+    def write(self, data: bytes) -> int:
+        """
+        queue an output report for the child
+
+        Args:
+            data (bytes): output report
+
+        Raises:
+            OSError: the worker was closed
+
+        Returns:
+            int: number of queued bytes, -1 if the ring was full
+        """
+        if self.closed:
+            raise OSError("worker is closed")
+        return len(data) if self._outputs.push(bytes(data), time.monotonic()) else -1
+
+    def _request(self, *request: Any) -> Any:
+        with self._request_lock:
+            if self.closed:
+                raise OSError("worker is closed")
+            self._connection.send(request)
+            if not self._connection.poll(1.0):
+                raise OSError("worker did not answer")
+            status, value = self._connection.recv()
+        if status != "ok":
+            raise OSError(value)
+        return value
+
+    def get_feature_report(self, report_id: int, length: int) -> bytes:
+        return self._request("get_feature_report", report_id, length)  # type: ignore[no-any-return]
+
+    def send_feature_report(self, data: bytes, report_id: int = 0) -> int:
+        return self._request("send_feature_report", bytes(data), report_id)  # type: ignore[no-any-return]
+
+    def get_serial_number_string(self) -> Optional[str]:
+        return self.serial
+
+    def _shutdown(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._process.join(1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._inputs.release()
+        self._outputs.release()
+        for shm in (self._input_shm, self._output_shm):
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        """
+        write the queued output reports, close the device and stop the child
+        """
+        if self._process.is_alive():
+            with self._request_lock, contextlib.suppress(OSError):
+                self._connection.send(("close",))
+        self.closed = True
+        self._shutdown()
@@ -0,0 +1,37 @@
+import sys
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from pydualsense.simulator import SimulatedDualSense
+
+
+class FakeHID:
+    """
+    stands in for the hidapi module, opens the queued simulated controllers one after another
+    """
+
+    def __init__(self) -> None:
+        self.devices: List[SimulatedDualSense] = []
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0) -> List[Any]:
+        return [
+            SimpleNamespace(
+                vendor_id=0x054C, product_id=0x0CE6, serial_number=device.serial, path=b"/dev/hidraw-sim"
+            )
+            for device in self.devices[:1]
+        ]
+
+    def Device(self, **kwargs: Any) -> SimulatedDualSense:
+        if not self.devices:
+            raise OSError("device is gone")
+        return self.devices.pop(0)
+
+
+@pytest.fixture
+def hid(monkeypatch: pytest.MonkeyPatch) -> FakeHID:
+    fake = FakeHID()
+    # the package exports the pydualsense class under the name of its module
+    monkeypatch.setattr(sys.modules["pydualsense.pydualsense"], "hidapi", fake)
+    return fake
@@ -0,0 +1,114 @@
+import socket
+import struct
+import zlib
+from typing import Iterator, Tuple
+
+import pytest
+
+from pydualsense.dsu import (
+    CONTROLLER_INFO,
+    HEADER,
+    MSG_PAD_DATA,
+    MSG_PORTS,
+    MSG_VERSION,
+    PAD_DATA,
+    PAD_PACKET_SIZE,
+    PROTOCOL_VERSION,
+    SLOT_CONNECTED,
+    DSUServer,
+)
+from pydualsense.pydualsense import pydualsense
+from pydualsense.simulator import SimulatedDualSense
+
+# raw motion values of the simulator: 16 units per degree/s, 8192 units per g
+GYRO = (160, -320, 16)
+ACCELEROMETER = (4096, 8192, -2048)
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterator[Tuple[DSUServer, SimulatedDualSense]]:
+    device = SimulatedDualSense(imu_noise=0.0)
+    device.gyro = GYRO
+    device.accelerometer = ACCELEROMETER
+    controller = pydualsense()
+    controller.init(device=device)
+    dsu = DSUServer(port=0)
+    dsu.addController(controller)
+    yield dsu, device
+    dsu.close()
+    controller.close()
+
+
+@pytest.fixture
+def client() -> Iterator[socket.socket]:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(2.0)
+    yield sock
+    sock.close()
+
+
+def _request(message: int, payload: bytes = b"") -> bytes:
+    body = struct.pack("<I", message) + payload
+    packet = bytearray(HEADER.pack(b"DSUC", PROTOCOL_VERSION, len(body), 0, 1) + body)
+    struct.pack_into("<I", packet, 8, zlib.crc32(packet))
+    return bytes(packet)
+
+
+def _receive(sock: socket.socket, server_id: int) -> Tuple[int, bytes]:
+    packet = sock.recv(1024)
+    magic, version, length, crc, sender = HEADER.unpack_from(packet)
+    assert (magic, version, sender) == (b"DSUS", PROTOCOL_VERSION, server_id)
+    assert length == len(packet) - HEADER.size
+    unchecked = bytearray(packet)
+    unchecked[8:12] = bytes(4)
+    assert zlib.crc32(unchecked) == crc
+    (message,) = struct.unpack_from("<I", packet, HEADER.size)
+    return message, packet
+
+
+def test_version(server: Tuple[DSUServer, SimulatedDualSense], client: socket.socket) -> None:
+    dsu, _ = server
+    client.sendto(_request(MSG_VERSION), dsu.address)
+    message, packet = _receive(client, dsu.server_id)
+    assert message == MSG_VERSION
+    assert struct.unpack_from("<H", packet, HEADER.size + 4) == (PROTOCOL_VERSION,)
+
+
+def test_ports(server: Tuple[DSUServer, SimulatedDualSense], client: socket.socket) -> None:
+    dsu, _ = server
+    client.sendto(_request(MSG_PORTS, struct.pack("<iBB", 2, 0, 1)), dsu.address)
+    states = {}
+    for _ in range(2):
+        message, packet = _receive(client, dsu.server_id)
+        assert message == MSG_PORTS
+        _, slot, state, *_ = CONTROLLER_INFO.unpack_from(packet, HEADER.size)
+        states[slot] = state
+    assert states == {0: SLOT_CONNECTED, 1: 0}
+
+
+def test_pad_data(server: Tuple[DSUServer, SimulatedDualSense], client: socket.socket) -> None:
+    dsu, _ = server
+    client.sendto(_request(MSG_PAD_DATA, struct.pack("<BB6s", 0, 0, bytes(6))), dsu.address)
+    message, packet = _receive(client, dsu.server_id)
+    assert message == MSG_PAD_DATA
+    assert len(packet) == PAD_PACKET_SIZE
+
+    data = PAD_DATA.unpack_from(packet, HEADER.size + CONTROLLER_INFO.size)
+    assert data[0] == 1
+    accel, gyro = data[-6:-3], data[-3:]
+    assert accel == pytest.approx((0.5, 1.0, -0.25))
+    assert gyro == pytest.approx((10.0, -20.0, 1.0))
+
+    # packets of the subscription keep coming with increasing numbers
+    _, following = _receive(client, dsu.server_id)
+    assert PAD_DATA.unpack_from(following, HEADER.size + CONTROLLER_INFO.size)[1] > data[1]
+
+
+def test_bad_crc_is_ignored(server: Tuple[DSUServer, SimulatedDualSense], client: socket.socket) -> None:
+    dsu, _ = server
+    packet = bytearray(_request(MSG_VERSION))
+    packet[8] ^= 0xFF
+    client.sendto(bytes(packet), dsu.address)
+    client.settimeout(0.2)
+    with pytest.raises(socket.timeout):
+        client.recv(1024)
@@ -0,0 +1,91 @@
+import time
+from typing import Callable
+
+from conftest import FakeHID
+
+from pydualsense.hotplug import HotplugWatcher
+from pydualsense.pydualsense import pydualsense
+from pydualsense.simulator import SimulatedDualSense
+
+
+class FakeSource:
+    """
+    hot-plug event source reporting the controllers queued in the fake hidapi
+    """
+
+    def __init__(self, hid: FakeHID) -> None:
+        self.hid = hid
+        self.waits = 0
+        self.closed = False
+
+    def wait(self, timeout: float) -> bool:
+        self.waits += 1
+        deadline = time.monotonic() + timeout
+        while not self.hid.devices:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_reconnect_on_first_attempt(hid: FakeHID) -> None:
+    first = SimulatedDualSense()
+    hid.devices.append(first)
+    ds = pydualsense()
+    ds.init()
+    source = FakeSource(hid)
+    watcher = HotplugWatcher(ds, source=source, retry_interval=1.0)
+
+    def slow_handler(connected: bool) -> None:
+        # keeps the report thread alive after the watcher was woken up
+        if not connected:
+            time.sleep(0.05)
+
+    ds.connection_changed += slow_handler
+    try:
+        _wait_for(lambda: first.reports_sent > 3)
+        hid.devices.append(SimulatedDualSense())
+        first.close()
+        _wait_for(lambda: ds.stats.reconnects == 1)
+    finally:
+        watcher.close()
+        ds.close()
+
+    assert ds.stats.disconnects == 1
+    # no failed attempt and no retry interval in between
+    assert ds.stats.reconnect_latency < 0.5
+    assert source.waits == 0
+    assert source.closed
+
+
+def test_reconnect_after_device_event(hid: FakeHID) -> None:
+    first = SimulatedDualSense()
+    hid.devices.append(first)
+    ds = pydualsense()
+    ds.init()
+    source = FakeSource(hid)
+    watcher = HotplugWatcher(ds, source=source, retry_interval=0.05, attempts=2)
+    try:
+        _wait_for(lambda: first.reports_sent > 3)
+        first.close()
+        # the attempts fail while no controller is connected, the watcher waits for the source
+        _wait_for(lambda: source.waits > 0)
+        assert ds.stats.reconnects == 0
+        second = SimulatedDualSense()
+        hid.devices.append(second)
+        _wait_for(lambda: ds.stats.reconnects == 1)
+        _wait_for(lambda: second.reports_sent > 3)
+        assert ds.connected
+    finally:
+        watcher.close()
+        ds.close()
@@ -0,0 +1,79 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pydualsense.info import (
+    FEATURE_REPORT_CALIBRATION,
+    FEATURE_REPORT_FIRMWARE_INFO,
+    FEATURE_REPORT_LENGTHS,
+    FEATURE_REPORT_PAIRING_INFO,
+    DSInfo,
+)
+from pydualsense.simulator import SimulatedDualSense
+
+SERIAL = "12:34:56:78:9a:bc"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the reports are cached for the whole process
+    monkeypatch.setattr("pydualsense.info._cache", {})
+
+
+def _report(device: SimulatedDualSense, report_id: int) -> bytes:
+    return device.get_feature_report(report_id, FEATURE_REPORT_LENGTHS[report_id])
+
+
+def test_reports_are_read_once() -> None:
+    device = SimulatedDualSense(serial=SERIAL)
+    info = DSInfo(device, SERIAL)
+    assert info.mac == SERIAL
+    assert info.firmware["firmware_version"] == 0x00010000
+    assert info.mac == SERIAL
+    assert info.reads == 2
+
+    # a reconnect creates a new DSInfo for the same controller
+    again = DSInfo(device, SERIAL)
+    assert again.mac == SERIAL
+    assert again.reads == 0
+
+
+def test_cache_file_round_trip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache_file = str(tmp_path / "info.json")
+    info = DSInfo(SimulatedDualSense(serial=SERIAL), SERIAL, cache_file=cache_file)
+    assert info.calibration["acc_x_plus"] == 8192
+    assert info.reads == 1
+
+    # next run
+    monkeypatch.setattr("pydualsense.info._cache", {})
+    info = DSInfo(SimulatedDualSense(serial=SERIAL), SERIAL, cache_file=cache_file)
+    assert info.calibration["acc_x_plus"] == 8192
+    assert info.reads == 0
+
+
+def test_store_keeps_reports_of_cache_file(tmp_path: Path) -> None:
+    device = SimulatedDualSense(serial=SERIAL)
+    cache_file = tmp_path / "info.json"
+    cache_file.write_text(
+        json.dumps(
+            {
+                SERIAL: {
+                    f"{report_id:02x}": _report(device, report_id).hex()
+                    for report_id in (FEATURE_REPORT_PAIRING_INFO, FEATURE_REPORT_FIRMWARE_INFO)
+                },
+                "other": {"09": "00"},
+            }
+        )
+    )
+
+    # the calibration is read over bluetooth before anything else asks for the info
+    info = DSInfo(device, SERIAL, cache_file=str(cache_file))
+    info.store(FEATURE_REPORT_CALIBRATION, _report(device, FEATURE_REPORT_CALIBRATION))
+    assert info.mac == SERIAL
+    assert info.firmware_version == 0x00010000
+    assert info.reads == 0
+
+    entries = json.loads(cache_file.read_text())
+    assert sorted(entries[SERIAL]) == ["05", "09", "20"]
+    assert entries["other"] == {"09": "00"}
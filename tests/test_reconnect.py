@@ -0,0 +1,72 @@
+import threading
+import time
+from typing import Callable, List
+
+from conftest import FakeHID
+
+from pydualsense.enums import Button
+from pydualsense.pydualsense import pydualsense
+from pydualsense.simulator import SimulatedDualSense
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_held_button_is_not_pressed_again(hid: FakeHID) -> None:
+    first, second = SimulatedDualSense(), SimulatedDualSense()
+    first.buttons = second.buttons = Button.Cross
+    hid.devices += [first, second]
+
+    ds = pydualsense()
+    pressed: List[int] = []
+    presses: List[bool] = []
+    ds.addReportHook(lambda controller: pressed.append(controller.state.pressed))
+    ds.cross_pressed += presses.append
+    lost = threading.Event()
+
+    def connection_changed(connected: bool) -> None:
+        if not connected:
+            lost.set()
+
+    ds.connection_changed += connection_changed
+    ds.init()
+    try:
+        _wait_for(lambda: len(pressed) > 3)
+        first.close()
+        assert lost.wait(2.0)
+        ds.report_thread.join(2.0)
+        ds.reconnect()
+        _wait_for(lambda: second.reports_sent > 5)
+    finally:
+        ds.close()
+
+    assert ds.stats.reconnects == 1
+    # the first report after init shows the held button as pressed, the reconnect does not
+    assert [mask for mask in pressed if mask] == [Button.Cross]
+    assert presses == []
+
+
+def test_release_during_disconnect_is_reported(hid: FakeHID) -> None:
+    first, second = SimulatedDualSense(), SimulatedDualSense()
+    first.buttons = Button.Cross
+    hid.devices += [first, second]
+
+    ds = pydualsense()
+    presses: List[bool] = []
+    ds.cross_pressed += presses.append
+    ds.init()
+    try:
+        _wait_for(lambda: first.reports_sent > 3)
+        first.close()
+        _wait_for(lambda: not ds.connected)
+        ds.report_thread.join(2.0)
+        ds.reconnect()
+        _wait_for(lambda: second.reports_sent > 5)
+    finally:
+        ds.close()
+
+    assert presses == [False]
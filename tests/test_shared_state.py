@@ -0,0 +1,46 @@
+from typing import Iterator, Tuple
+
+import pytest
+
+from pydualsense.enums import Button
+from pydualsense.pydualsense import pydualsense
+from pydualsense.shared_state import _SEQUENCE, SEQUENCE_OFFSET, SharedStatePublisher, SharedStateReader
+from pydualsense.simulator import SimulatedDualSense
+
+
+@pytest.fixture
+def segment() -> Iterator[Tuple[pydualsense, SharedStatePublisher, SharedStateReader]]:
+    # the report thread is stopped, the tests publish the reports themselves
+    controller = pydualsense()
+    controller.init(device=SimulatedDualSense(realtime=False))
+    controller.close()
+    publisher = SharedStatePublisher(controller)
+    reader = SharedStateReader(publisher.name)
+    yield controller, publisher, reader
+    reader.close()
+    publisher.close()
+
+
+def test_read(segment: Tuple[pydualsense, SharedStatePublisher, SharedStateReader]) -> None:
+    ds, publisher, reader = segment
+    ds.state.buttons = Button.Cross
+    ds.state.LX = -42
+    publisher.update(ds)
+
+    assert reader.wait(timeout=1.0)
+    assert reader.count == 1
+    assert reader.state.cross
+    assert reader.state.LX == -42
+    assert not reader.wait(timeout=0.01)
+
+
+def test_read_times_out_on_unfinished_write(
+    segment: Tuple[pydualsense, SharedStatePublisher, SharedStateReader],
+) -> None:
+    ds, publisher, reader = segment
+    publisher.update(ds)
+    # a publisher that died during a write leaves an odd sequence behind
+    _SEQUENCE.pack_into(publisher._buffer, SEQUENCE_OFFSET, 3)
+
+    with pytest.raises(TimeoutError):
+        reader.read(timeout=0.05)
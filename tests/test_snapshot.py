@@ -0,0 +1,86 @@
+import pytest
+
+from pydualsense.snapshot import (
+    FRAME_DELTA,
+    FRAME_FULL,
+    FRAME_HEADER,
+    FRAME_VERSION,
+    SNAPSHOT,
+    SNAPSHOT_FIELDS,
+    decode_frame,
+    encode_frame,
+)
+
+# values of the packed snapshot in SNAPSHOT order
+BASE = {
+    "buttons": 0,
+    "LX": 0, "LY": 0, "RX": 0, "RY": 0,
+    "L2": 0, "R2": 0,
+    "battery_state": 0, "battery_level": 85,
+    "pitch": 0, "yaw": 0, "roll": 0,
+    "ax": 0, "ay": 8192, "az": 0,
+    "timestamp": 1000,
+    "active0": 0, "id0": 0, "x0": 0, "y0": 0,
+    "active1": 0, "id1": 0, "x1": 0, "y1": 0,
+}
+FIELD_BITS = {name: 1 << bit for bit, (name, _, _) in enumerate(SNAPSHOT_FIELDS)}
+
+
+def _snapshot(**values: int) -> bytes:
+    return SNAPSHOT.pack(*{**BASE, **values}.values())
+
+
+def _decode(frame: bytes, snapshot: bytearray) -> int:
+    return decode_frame(frame[:FRAME_HEADER.size], frame[FRAME_HEADER.size:], snapshot)
+
+
+def test_full_frame() -> None:
+    snapshot = _snapshot(buttons=0x20, LX=-5, timestamp=123456)
+    frame = encode_frame(snapshot, None, 7)
+    assert FRAME_HEADER.unpack_from(frame) == (SNAPSHOT.size, FRAME_VERSION, FRAME_FULL, 0, 7)
+
+    received = bytearray(SNAPSHOT.size)
+    assert _decode(frame, received) == 7
+    assert received == snapshot
+
+
+def test_delta_frame_has_changed_fields() -> None:
+    previous = _snapshot()
+    snapshot = _snapshot(LX=42, active0=1, x0=1000)
+    frame = encode_frame(snapshot, previous, 8)
+    length, _, kind, mask, sequence = FRAME_HEADER.unpack_from(frame)
+    assert (kind, mask, sequence) == (FRAME_DELTA, FIELD_BITS["sticks"] | FIELD_BITS["touch0"], 8)
+    assert length == 4 + 6
+
+    received = bytearray(previous)
+    assert _decode(frame, received) == 8
+    assert received == snapshot
+
+
+def test_identical_snapshot_is_empty_delta() -> None:
+    snapshot = _snapshot(buttons=1)
+    frame = encode_frame(snapshot, bytes(snapshot), 9)
+    assert FRAME_HEADER.unpack_from(frame) == (0, FRAME_VERSION, FRAME_DELTA, 0, 9)
+    assert len(frame) == FRAME_HEADER.size
+
+
+def test_sequence_wraps() -> None:
+    frame = encode_frame(_snapshot(), None, 2**32 + 3)
+    assert FRAME_HEADER.unpack_from(frame)[4] == 3
+
+
+def test_invalid_frames() -> None:
+    snapshot = _snapshot()
+    received = bytearray(SNAPSHOT.size)
+    frame = bytearray(encode_frame(snapshot))
+    frame[2] = FRAME_VERSION + 1
+    with pytest.raises(Exception, match="unsupported frame version"):
+        _decode(bytes(frame), received)
+    with pytest.raises(Exception, match="frame payload is truncated"):
+        _decode(encode_frame(snapshot)[:-1], received)
+    with pytest.raises(Exception, match="unknown frame kind"):
+        _decode(FRAME_HEADER.pack(0, FRAME_VERSION, 5, 0, 0), received)
+    with pytest.raises(Exception, match="full frame has the wrong size"):
+        _decode(FRAME_HEADER.pack(2, FRAME_VERSION, FRAME_FULL, 0, 0) + b"\0\0", received)
+    with pytest.raises(Exception, match="delta frame has the wrong size"):
+        _decode(FRAME_HEADER.pack(1, FRAME_VERSION, FRAME_DELTA, FIELD_BITS["buttons"], 0) + b"\0", received)
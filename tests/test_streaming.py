@@ -0,0 +1,158 @@
+import asyncio
+import socket
+import time
+from typing import Iterator, Tuple
+
+import pytest
+
+from pydualsense.enums import Button
+from pydualsense.pydualsense import pydualsense
+from pydualsense.simulator import SimulatedDualSense
+from pydualsense.snapshot import FRAME_DELTA, FRAME_FULL, FRAME_HEADER, SNAPSHOT_FIELDS
+from pydualsense.streaming import StateStreamClient, StateStreamServer
+
+STICKS = 1 << [name for name, _, _ in SNAPSHOT_FIELDS].index("sticks")
+
+
+@pytest.fixture
+def live() -> Iterator[Tuple[pydualsense, SimulatedDualSense]]:
+    device = SimulatedDualSense()
+    controller = pydualsense()
+    controller.init(device=device)
+    yield controller, device
+    controller.close()
+
+
+@pytest.fixture
+def stopped() -> pydualsense:
+    # the report thread is stopped, the tests push the reports to the server themselves
+    controller = pydualsense()
+    controller.init(device=SimulatedDualSense(realtime=False))
+    controller.close()
+    return controller
+
+
+async def _count(client: StateStreamClient, duration: float) -> None:
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        await asyncio.wait_for(client.read(), 1.0)
+
+
+async def _read_until(client: StateStreamClient, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        await asyncio.wait_for(client.read(), 1.0)
+
+
+async def _frame(reader: asyncio.StreamReader) -> Tuple[int, int, int]:
+    header = await asyncio.wait_for(reader.readexactly(FRAME_HEADER.size), 1.0)
+    length, _, kind, mask, sequence = FRAME_HEADER.unpack(header)
+    await reader.readexactly(length)
+    return kind, mask, sequence
+
+
+def test_client_follows_controller(live: Tuple[pydualsense, SimulatedDualSense]) -> None:
+    ds, device = live
+
+    async def run() -> None:
+        server = StateStreamServer(ds, rate=250)
+        await server.start()
+        client = await StateStreamClient.connect("127.0.0.1", server.port)
+        try:
+            device.buttons = Button.Cross
+            device.LX = 42
+            for _ in range(250):
+                state = await asyncio.wait_for(client.read(), 1.0)
+                if state.cross and state.LX == 42:
+                    break
+            else:
+                pytest.fail("the change was not streamed")
+            assert client.battery.Level == ds.battery.Level
+            assert server.clients == 1
+        finally:
+            await client.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_full_then_delta_frames(stopped: pydualsense) -> None:
+    ds = stopped
+
+    async def run() -> None:
+        server = StateStreamServer(ds, rate=100)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            server.update(ds)
+            kind, _, sequence = await _frame(reader)
+            assert (kind, sequence) == (FRAME_FULL, 1)
+
+            # an unchanged report is not sent again
+            server.update(ds)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(reader.read(1), 0.1)
+
+            ds.state.LX = 42
+            server.update(ds)
+            assert await _frame(reader) == (FRAME_DELTA, STICKS, 3)
+            assert server.frames_sent == 2
+        finally:
+            writer.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_client_rate(live: Tuple[pydualsense, SimulatedDualSense]) -> None:
+    ds, _ = live
+
+    async def run() -> None:
+        server = StateStreamServer(ds, rate=200)
+        await server.start()
+        fast = await StateStreamClient.connect("127.0.0.1", server.port)
+        slow = await StateStreamClient.connect("127.0.0.1", server.port, rate=20)
+        try:
+            await asyncio.gather(_count(fast, 0.5), _count(slow, 0.5))
+        finally:
+            await fast.close()
+            await slow.close()
+            await server.close()
+        # the timestamp changes with every report, each client gets a frame per interval
+        assert slow.frames <= 15
+        assert fast.frames > 3 * slow.frames
+
+    asyncio.run(run())
+
+
+def test_slow_client_is_dropped(live: Tuple[pydualsense, SimulatedDualSense]) -> None:
+    ds, _ = live
+
+    async def run() -> None:
+        server = StateStreamServer(ds, rate=250, max_buffer=1024)
+        await server.start()
+        # small socket buffers on both ends, the unsent frames pile up in the transport quickly
+        assert server._server is not None
+        server._server.sockets[0].setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1024)
+        stuck = socket.socket()
+        stuck.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+        stuck.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(stuck, ("127.0.0.1", server.port))
+        client = await StateStreamClient.connect("127.0.0.1", server.port)
+        stop = asyncio.Event()
+        reading = asyncio.ensure_future(_read_until(client, stop))
+        try:
+            for _ in range(200):
+                if server.dropped_clients:
+                    break
+                await asyncio.sleep(0.01)
+            assert server.dropped_clients == 1
+            assert server.clients == 1
+            assert not reading.done()
+        finally:
+            stop.set()
+            await asyncio.gather(reading, return_exceptions=True)
+            await client.close()
+            stuck.close()
+            await server.close()
+
+    asyncio.run(run())
@@ -0,0 +1,112 @@
+from typing import Iterator, List
+
+import pytest
+
+from pydualsense.enums import ConnectionType
+from pydualsense.pydualsense import pydualsense
+from pydualsense.simulator import SimulatedDualSense
+from pydualsense.trigger_effects import (
+    OFF,
+    TriggerEffect,
+    bow,
+    decode,
+    feedback,
+    galloping,
+    machine,
+    multiple_position_feedback,
+    multiple_position_vibration,
+    slope_feedback,
+    vibration,
+    weapon,
+)
+
+EFFECTS = [
+    OFF,
+    feedback(0, 8),
+    feedback(4, 3),
+    feedback(9, 1),
+    multiple_position_feedback([1, 2, 3, 4, 5, 6, 7, 8, 0, 8]),
+    slope_feedback(0, 9, 1, 8),
+    slope_feedback(2, 5, 8, 2),
+    weapon(2, 8, 8),
+    weapon(4, 5, 1),
+    vibration(0, 8, 255),
+    vibration(3, 2, 40),
+    multiple_position_vibration(30, [8, 0, 1, 2, 3, 4, 5, 6, 7, 8]),
+    bow(0, 8, 8, 8),
+    bow(1, 4, 3, 6),
+    galloping(0, 9, 0, 7, 255),
+    galloping(3, 6, 2, 4, 10),
+    machine(0, 9, 7, 7, 255, 255),
+    machine(1, 8, 3, 5, 20, 6),
+]
+
+# USB report offsets of the mode byte and the 7 forces, bluetooth is shifted by one
+TRIGGERS = {"triggerR": (11, (12, 13, 14, 15, 16, 17, 20)), "triggerL": (22, (23, 24, 25, 26, 27, 28, 31))}
+# parameter bytes of the trigger blocks that are never written
+UNUSED = (18, 19, 21, 29, 30, 32)
+
+
+@pytest.fixture(scope="module", params=[ConnectionType.USB, ConnectionType.BT], ids=["usb", "bt"])
+def ds(request: pytest.FixtureRequest) -> Iterator[pydualsense]:
+    controller = pydualsense()
+    controller.init(device=SimulatedDualSense(request.param))
+    yield controller
+    controller.close()
+
+
+def _read_back(report: List[int], trigger: str, shift: int) -> TriggerEffect:
+    mode, forces = TRIGGERS[trigger]
+    return decode(report[mode + shift], [report[i + shift] for i in forces])
+
+
+@pytest.mark.parametrize("effect", EFFECTS)
+@pytest.mark.parametrize("trigger", TRIGGERS)
+def test_report_round_trip(ds: pydualsense, trigger: str, effect: TriggerEffect) -> None:
+    getattr(ds, trigger).setEffect(effect)
+    report = ds.prepareReport()
+    shift = 1 if ds.conType == ConnectionType.BT else 0
+
+    assert _read_back(report, trigger, shift) == effect
+    assert all(report[i + shift] == 0 for i in UNUSED)
+    getattr(ds, trigger).setEffect(OFF)
+
+
+def test_both_triggers(ds: pydualsense) -> None:
+    ds.triggerL.setEffect(EFFECTS[5])
+    ds.triggerR.setEffect(EFFECTS[-1])
+    report = ds.prepareReport()
+    shift = 1 if ds.conType == ConnectionType.BT else 0
+
+    assert _read_back(report, "triggerL", shift) == EFFECTS[5]
+    assert _read_back(report, "triggerR", shift) == EFFECTS[-1]
+    ds.triggerL.setEffect(OFF)
+    ds.triggerR.setEffect(OFF)
+
+
+def test_mode_bytes() -> None:
+    assert feedback(0, 1).mode == 0x21
+    assert weapon(2, 3, 1).mode == 0x25
+    assert vibration(0, 1, 1).mode == 0x26
+    assert bow(0, 1, 1, 1).mode == 0x22
+    assert galloping(0, 1, 0, 1, 1).mode == 0x23
+    assert machine(0, 1, 1, 1, 1, 1).mode == 0x27
+
+
+def test_zone_packing() -> None:
+    # zone mask 0b1111110000 and strength 3 (stored as 2) in the zones 4..9
+    effect = feedback(4, 3)
+    assert effect.forces[:2] == (0xF0, 0x03)
+    packed = int.from_bytes(bytes(effect.forces[2:6]), "little")
+    assert [(packed >> (3 * zone)) & 0x07 for zone in range(10)] == [0] * 4 + [2] * 6
+
+
+def test_invalid_parameters() -> None:
+    with pytest.raises(Exception, match="position has to be in range"):
+        feedback(10, 1)
+    with pytest.raises(TypeError):
+        weapon(2, 3, 1.0)
+    with pytest.raises(Exception, match="10 zone strengths needed"):
+        multiple_position_feedback([1, 2, 3])
+    with pytest.raises(Exception, match="only 7 parameters available"):
+        decode(0x21, [0, 0, 0])
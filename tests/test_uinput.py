@@ -0,0 +1,104 @@
+import os
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from pydualsense.pydualsense import pydualsense
+from pydualsense.simulator import SimulatedDualSense
+from pydualsense.uinput import (
+    ABS_X,
+    ABS_Z,
+    BTN_SOUTH,
+    DEFAULT_MAPPING,
+    EV_ABS,
+    EV_KEY,
+    EV_SYN,
+    INPUT_EVENT,
+    SYN_REPORT,
+    UInputBridge,
+)
+
+
+@pytest.fixture
+def ds() -> Iterator[pydualsense]:
+    # the report thread is stopped, the tests set the state and call the hook themselves
+    controller = pydualsense()
+    controller.init(device=SimulatedDualSense(realtime=False))
+    controller.close()
+    yield controller
+
+
+@pytest.fixture
+def pipe() -> Iterator[Tuple[int, int]]:
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def _events(data: bytes) -> List[Tuple[int, int, int]]:
+    assert len(data) % INPUT_EVENT.size == 0
+    return [event[2:] for event in INPUT_EVENT.iter_unpack(data)]
+
+
+def test_first_frame_has_every_input(ds: pydualsense, pipe: Tuple[int, int]) -> None:
+    bridge = UInputBridge(ds, fd=pipe[1])
+    bridge.update(ds)
+    events = _events(os.read(pipe[0], 65536))
+
+    assert len(events) == len(DEFAULT_MAPPING) + 1
+    assert [event[:2] for event in events[:-1]] == list(DEFAULT_MAPPING.values())
+    assert events[-1] == (EV_SYN, SYN_REPORT, 0)
+    assert bridge.writes == 1
+    assert bridge.events_written == len(events)
+
+
+def test_changes_are_batched(ds: pydualsense, pipe: Tuple[int, int]) -> None:
+    bridge = UInputBridge(ds, fd=pipe[1])
+    bridge.update(ds)
+    os.read(pipe[0], 65536)
+
+    ds.state.cross = True
+    ds.state.LX = -100
+    ds.state.L2_value = 255
+    bridge.update(ds)
+    assert _events(os.read(pipe[0], 65536)) == [
+        (EV_KEY, BTN_SOUTH, 1),
+        (EV_ABS, ABS_X, -100),
+        (EV_ABS, ABS_Z, 255),
+        (EV_SYN, SYN_REPORT, 0),
+    ]
+
+    # an unchanged report writes nothing
+    bridge.update(ds)
+    assert bridge.writes == 2
+
+
+def test_full_queue_drops_frame(ds: pydualsense, pipe: Tuple[int, int]) -> None:
+    bridge = UInputBridge(ds, fd=pipe[1])
+    bridge.update(ds)
+    os.read(pipe[0], 65536)
+    os.set_blocking(pipe[1], False)
+    filled = 0
+    with pytest.raises(BlockingIOError):
+        while True:
+            filled += os.write(pipe[1], bytes(4096))
+
+    ds.state.cross = True
+    bridge.update(ds)
+    assert bridge.dropped == 1
+    assert bridge.writes == 1
+
+    # the dropped change is sent with the next frame
+    data = b""
+    while len(data) < filled:
+        data += os.read(pipe[0], filled - len(data))
+    bridge.update(ds)
+    assert _events(os.read(pipe[0], 65536)) == [(EV_KEY, BTN_SOUTH, 1), (EV_SYN, SYN_REPORT, 0)]
+
+
+def test_close_removes_hook(ds: pydualsense, pipe: Tuple[int, int]) -> None:
+    bridge = UInputBridge(ds, fd=pipe[1])
+    assert bridge.update in ds.report_hooks
+    bridge.close()
+    assert bridge.update not in ds.report_hooks